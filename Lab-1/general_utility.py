@@ -1,8 +1,23 @@
+import hashlib
+import os
 import numpy as np
 import math
+import re
 import PyKDL as kdl
 import yaml
 
+# libyaml parser when PyYAML was built with it, about 8x faster than pure Python
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Column types of the known path schemas, x/y/z/color paths and j1..j6 joint paths
+PATH_COLUMN_DTYPES = {"x": np.float64, "y": np.float64, "z": np.float64, "color": np.int64,
+                      "j1": np.float64, "j2": np.float64, "j3": np.float64,
+                      "j4": np.float64, "j5": np.float64, "j6": np.float64}
+PATH_SCHEMAS = (("x", "y", "z", "color"), ("j1", "j2", "j3", "j4", "j5", "j6"))
+
+# A top level "key:" line opening a block sequence
+_COLUMN_HEADER = re.compile(r"^([A-Za-z_]\w*):[ \t]*$", re.MULTILINE)
+
 
 def check_proper_numpy_format(value: np.ndarray, shape: tuple) -> bool:
   """Send in a numpy array to make sure it is the right shape 
@@ -45,23 +60,188 @@ def np_frame_to_kdl(np_frame: np.ndarray) -> kdl.Frame:
 
   return kdl_frame
 
-def load_path_file(path_file: str) -> np.ndarray:
-  """Load the path file into a dictionary 6xn
+
+PATH_JOINT_KEYS = ("j1", "j2", "j3", "j4", "j5", "j6")
+PATH_CACHE_SUFFIX = ".npy"
+PATH_STAMP_SUFFIX = ".stamp"
+PATH_MMAP_BYTES = 1 << 20  # memory-map cached paths larger than 1 MB
+
+
+def _file_digest(filepath: str) -> str:
+  """Hash the contents of a file
+
+  Args:
+      filepath (str): full path to file
+
+  Returns:
+      str: hex sha1 digest of the file contents
+  """
+  digest = hashlib.sha1()
+  with open(filepath, 'rb') as file:
+    for chunk in iter(lambda: file.read(1 << 16), b''):
+      digest.update(chunk)
+  return digest.hexdigest()
+
+
+def _read_path_stamp(stamp_file: str) -> dict:
+  """Read the stamp written next to a cached path, empty if missing
+
+  Args:
+      stamp_file (str): full path to the stamp file
+
+  Returns:
+      dict: {"size": int, "mtime_ns": int, "sha1": str} or {}
+  """
+  try:
+    with open(stamp_file, 'r') as file:
+      size, mtime_ns, sha1 = file.read().split()
+    return {"size": int(size), "mtime_ns": int(mtime_ns), "sha1": sha1}
+  except (OSError, ValueError):
+    return {}
+
+
+def _write_path_stamp(stamp_file: str, yaml_stat: os.stat_result,
+                      sha1: str) -> None:
+  """Record the yaml size, mtime and hash the cached path was built from
+
+  Args:
+      stamp_file (str): full path to the stamp file
+      yaml_stat (os.stat_result): stat of the source yaml
+      sha1 (str): hex sha1 digest of the source yaml
+  """
+  with open(stamp_file, 'w') as file:
+    file.write(f"{yaml_stat.st_size} {yaml_stat.st_mtime_ns} {sha1}\n")
+
+
+def _parse_flat_columns(text: str) -> dict:
+  """Parse a mapping of block sequences of plain numbers without a yaml parser
+
+  Every column is located by its header first, so its length is known before
+  any value is converted. Returns None when the text is anything other than
+  "key:" lines each followed by "- number" lines.
+  """
+  headers = list(_COLUMN_HEADER.finditer(text))
+  if not headers or text[:headers[0].start()].strip():
+    return None
+
+  columns = {}
+  for header, next_header in zip(headers, headers[1:] + [None]):
+    end = len(text) if next_header is None else next_header.start()
+    tokens = text[header.end():end].split()
+    dashes, values = tokens[0::2], tokens[1::2]
+    if len(dashes) != len(values) or dashes.count("-") != len(dashes):
+      return None
+    try:
+      columns[header.group(1)] = np.array(
+          values, dtype=PATH_COLUMN_DTYPES.get(header.group(1), np.float64))
+    except ValueError:
+      return None
+  return columns
+
+
+def load_path_columns(filepath: str) -> dict:
+  """Load a path yaml straight into typed NumPy columns
+
+  Files laid out like the provided paths (top level keys each holding a list
+  of numbers) skip the yaml parser entirely. Anything else goes through
+  YAML_LOADER and the columns are converted afterwards.
+
+  Args:
+      filepath (str): full filepath to the location on your computer
+                      eg: "/home/lcfarrell/ME_498/Lab2/pahts/path_name.yaml"
+
+  Raises:
+      ValueError: if the columns of a known schema (x/y/z/color or j1..j6)
+                  have different lengths
+
+  Returns:
+      dict: column name to (N,) array, int64 for "color" and float64 otherwise
+  """
+  with open(filepath, "r") as yaml_file:
+    text = yaml_file.read()
+
+  columns = _parse_flat_columns(text)
+  if columns is None:
+    data = yaml.load(text, Loader=YAML_LOADER)
+    columns = {key: np.asarray(value, dtype=PATH_COLUMN_DTYPES.get(key, np.float64))
+               for key, value in data.items()}
+
+  for schema in PATH_SCHEMAS:
+    lengths = {len(columns[key]) for key in schema if key in columns}
+    if len(lengths) > 1:
+      raise ValueError(f"{filepath}: columns {', '.join(schema)} have different lengths")
+  return columns
+
+
+def _parse_path_yaml(path_file: str) -> np.ndarray:
+  """Parse the joint path yaml into an nx6 array
 
   Args:
       path_file (str): full path to file
 
   Returns:
-      np.ndarray: 6xn array of actuator angles
+      np.ndarray: nx6 array of actuator and gimbal angles
   """
-  with open(path_file, 'r') as file:
-    path_data = yaml.safe_load(file)
+  path_data = load_path_columns(path_file)
+  return np.column_stack([path_data[key] for key in PATH_JOINT_KEYS])
+
+
+def load_path_file(path_file: str, use_cache: bool = True) -> np.ndarray:
+  """Load the path file into an nx6 array
+
+  The parsed array is cached in a binary sidecar next to the yaml
+  (path.yaml.npy plus path.yaml.stamp). The sidecar is reused while the yaml's
+  size and mtime are unchanged, or its contents hash the same after a touch.
+  Large cached paths are returned memory-mapped and read-only.
 
-  path_array = []
-  for index, _ in enumerate(path_data["j1"]):
-    path_array.append([
-        path_data["j1"][index], path_data["j2"][index], path_data["j3"][index],
-        path_data["j4"][index], path_data["j5"][index], path_data["j6"][index]
-    ])
+  Args:
+      path_file (str): full path to file
+      use_cache (bool, optional): read/write the binary sidecar. Defaults to True.
+
+  Returns:
+      np.ndarray: nx6 array of actuator angles
+  """
+  if not use_cache:
+    return _parse_path_yaml(path_file)
+
+  cache_file = path_file + PATH_CACHE_SUFFIX
+  stamp_file = path_file + PATH_STAMP_SUFFIX
+  yaml_stat = os.stat(path_file)
+  stamp = _read_path_stamp(stamp_file)
+
+  sha1 = None
+  cache_valid = False
+  if stamp and os.path.exists(cache_file) and stamp["size"] == yaml_stat.st_size:
+    if stamp["mtime_ns"] == yaml_stat.st_mtime_ns:
+      cache_valid = True
+    else:
+      sha1 = _file_digest(path_file)
+      cache_valid = sha1 == stamp["sha1"]
+
+  if cache_valid:
+    try:
+      mmap_mode = 'r' if os.path.getsize(cache_file) > PATH_MMAP_BYTES else None
+      path_array = np.load(cache_file, mmap_mode=mmap_mode)
+    except (OSError, ValueError):
+      path_array = None
+    if path_array is not None:
+      if sha1 is not None:
+        try:
+          _write_path_stamp(stamp_file, yaml_stat, sha1)
+        except OSError:
+          pass
+      return path_array
+
+  path_array = _parse_path_yaml(path_file)
+  try:
+    tmp_file = cache_file + ".tmp"
+    with open(tmp_file, 'wb') as file:
+      np.save(file, path_array)
+    os.replace(tmp_file, cache_file)
+    _write_path_stamp(stamp_file, yaml_stat,
+                      sha1 if sha1 is not None else _file_digest(path_file))
+  except OSError:
+    pass  # read-only folder, fall back to parsing every run
+
+  return path_array
 
-  return np.array(path_array)
\ No newline at end of file
@@ -5,7 +5,6 @@ import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d import Axes3D
 import lab1 as student
 import general_utility as general_util
-import yaml
 import PyKDL as kdl
 
 
@@ -190,25 +189,129 @@ def draw_phantom(actuator_angles: np.ndarray,
 
 
 def load_path_file(path_file: str) -> np.ndarray:
-  """Load the path file into a dictionary 6xn
+  """Load the path file into an nx6 array
+
+  Uses the cached binary sidecar from general_utility.load_path_file.
 
   Args:
       path_file (str): full path to file
 
   Returns:
-      np.ndarray: 6xn array of actuator angles
+      np.ndarray: nx6 array of actuator angles
+  """
+  return general_util.load_path_file(path_file)
+
+
+def _dh_batch(a: float, alpha: float, d: float,
+              theta: np.ndarray) -> np.ndarray:
+  """Stack of DH transforms using the same convention as lab1.screw_dh
+
+  Args:
+      a (float): distance along X
+      alpha (float): rotation about X
+      d (float): distance along Z
+      theta (np.ndarray): (n,) rotations about Z
+
+  Returns:
+      np.ndarray: nx4x4 stack of transformation matrices
   """
-  with open(path_file, 'r') as file:
-    path_data = yaml.safe_load(file)
+  theta = np.asarray(theta, dtype=float)
+  c_t, s_t = np.cos(theta), np.sin(theta)
+  c_a, s_a = np.cos(alpha), np.sin(alpha)
+
+  T = np.zeros(theta.shape + (4, 4))
+  T[..., 0, 0] = c_t
+  T[..., 0, 1] = -s_t
+  T[..., 0, 3] = a
+  T[..., 1, 0] = c_a * s_t
+  T[..., 1, 1] = c_a * c_t
+  T[..., 1, 2] = -s_a
+  T[..., 1, 3] = -s_a * d
+  T[..., 2, 0] = s_a * s_t
+  T[..., 2, 1] = s_a * c_t
+  T[..., 2, 2] = c_a
+  T[..., 2, 3] = c_a * d
+  T[..., 3, 3] = 1.0
+  return T
+
+
+def phantom_tip_positions(path: np.ndarray) -> np.ndarray:
+  """Vectorized PHANToM tip positions for a whole path
+
+  Uses the same link lengths and DH table as lab1.phantom_fk. The gimbal does
+  not move the tip, so only the actuator angles are used.
+
+  Args:
+      path (np.ndarray): nx6 array of actuator and gimbal angles
+
+  Returns:
+      np.ndarray: nx3 array of tip positions in mm
+  """
+  len_1 = 110.0 + 55
+  len_2 = 205
+  len_3 = 170.0
+
+  joint_angles = student.actuator_to_joint(np.asarray(path, dtype=float)[:, 0:3].T)
+  zeros = np.zeros(joint_angles.shape[1])
+
+  T = (_dh_batch(0, 0, len_1, joint_angles[0])
+       @ _dh_batch(0, -np.pi / 2, 0, joint_angles[1])
+       @ _dh_batch(len_2, 0, 0, joint_angles[2])
+       @ _dh_batch(0, np.pi / 2, -len_3, zeros))
+  return T[:, 0:3, 3]
+
+
+def decimate_path(path: np.ndarray,
+                  spacing: float,
+                  metric: str = "tip",
+                  max_stride: int = None) -> np.ndarray:
+  """Pick the frames of a path to animate by how far the robot moves
+
+  A frame is kept each time the cumulative motion crosses another multiple of
+  spacing, so slow segments are thinned and fast motions keep every sample.
+  The first and last frames are always kept.
+
+  Args:
+      path (np.ndarray): nx6 array of actuator and gimbal angles
+      spacing (float): motion between kept frames (mm for "tip", rad for "joint")
+      metric (str, optional): "tip" for tip arc length or "joint" for joint
+                              space distance. Defaults to "tip".
+      max_stride (int, optional): never skip more than this many frames, so
+                                  pauses still take time. Defaults to None.
+
+  Raises:
+      ValueError: if spacing is not positive or the metric is unknown
+
+  Returns:
+      np.ndarray: sorted indices of the frames to keep
+  """
+  if spacing <= 0:
+    raise ValueError('Input argument "spacing" must be positive')
+
+  path = np.asarray(path, dtype=float)
+  n_frames = path.shape[0]
+  if n_frames < 2:
+    return np.arange(n_frames)
+
+  if metric == "tip":
+    samples = phantom_tip_positions(path)
+  elif metric == "joint":
+    samples = path
+  else:
+    raise ValueError('Input argument "metric" must be "tip" or "joint"')
+
+  step_length = np.linalg.norm(np.diff(samples, axis=0), axis=1)
+  arc_length = np.concatenate(([0.0], np.cumsum(step_length)))
+
+  # Index of the first sample that reaches each multiple of spacing
+  bucket = np.floor(arc_length / spacing)
+  keep = np.flatnonzero(np.diff(bucket)) + 1
+  keep = np.concatenate(([0], keep, [n_frames - 1]))
 
-  path_array = []
-  for index, _ in enumerate(path_data["j1"]):
-    path_array.append([
-        path_data["j1"][index], path_data["j2"][index], path_data["j3"][index],
-        path_data["j4"][index], path_data["j5"][index], path_data["j6"][index]
-    ])
+  if max_stride is not None:
+    keep = np.union1d(keep, np.arange(0, n_frames, max_stride))
 
-  return np.array(path_array)
+  return np.unique(keep)
 
 
 def move_phantom(path_file):
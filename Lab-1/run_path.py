@@ -5,30 +5,22 @@ MECH 498 Lab 1 Part 8c
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation, PillowWriter
-import yaml
 import lab1_utility as util
 import lab1
 
 def load_path(filename):
-    """Load joint angles from yaml file"""
-    with open(filename, 'r') as f:
-        data = yaml.safe_load(f)
-    
-    # Convert to array
-    path = []
-    for i in range(len(data["j1"])):
-        path.append([data["j1"][i], data["j2"][i], data["j3"][i],
-                     data["j4"][i], data["j5"][i], data["j6"][i]])
-    
-    return np.array(path).T  # Transpose so each column is a time step
+    """Load joint angles from yaml file (cached as a binary sidecar)"""
+    return util.load_path_file(filename).T  # Transpose so each column is a time step
 
 # Load the path
 path_data = load_path('path.yaml')
-n_frames = path_data.shape[1]
 
-# Only use every 5th frame to keep file size reasonable
-step = 5
-frames = list(range(0, n_frames, step))
+# Keep a frame every TIP_SPACING mm of tip travel to keep file size reasonable.
+# Slow segments are thinned, fast motions keep their detail, and MAX_STRIDE
+# stops pauses from collapsing to a single frame.
+TIP_SPACING = 3.0  # mm
+MAX_STRIDE = 20
+frames = util.decimate_path(path_data.T, TIP_SPACING, max_stride=MAX_STRIDE)
 
 # Setup figure
 fig = plt.figure(figsize=(10, 10))
@@ -1,5 +1,7 @@
 import numpy as np
 from mpl_toolkits.mplot3d import Axes3D
+from matplotlib.colors import is_color_like, to_rgba_array
+from mpl_toolkits.mplot3d.art3d import Line3DCollection
 
 import general_utility as general
 
@@ -217,3 +219,406 @@ class LinkDrawing(object):
     self._update_drawing()
     self._ax.draw_artist(self._line_artist)
     self._line_artist.set_animated(False)
+
+
+class PaintDrawing(object):
+  """One growable artist holding every paint spot of a single color
+
+  Spots are appended in place into a preallocated buffer that doubles when it
+  fills up, so painting N spots keeps a single artist on the axes instead of
+  creating N of them.
+  """
+  INITIAL_CAPACITY = 256  # spots stored before the first buffer growth
+
+  def __init__(self, ax: Axes3D, color=None, markersize: float = 10):
+    """Initialize the paint drawing
+
+    Args:
+        ax (Axes3D): The Axes3D to use for drawing
+        color (_type_, optional): The color of the spots. Defaults to None.
+        markersize (float, optional): size of each spot. Defaults to 10.
+    """
+    self._ax = ax
+    self._color = color
+    self._markersize = markersize
+    self._spot_artist = None
+
+    self._points = np.empty((self.INITIAL_CAPACITY, 3))
+    self._count = 0
+    self._scaled_count = 0
+
+  def __len__(self) -> int:
+    return self._count
+
+  @property
+  def color(self):
+    """Color of the spots"""
+    return 'b' if self._color is None else self._color
+
+  @property
+  def points(self) -> np.ndarray:
+    """(N,3) view of the painted spots"""
+    return self._points[:self._count]
+
+  def append(self, location: np.ndarray):
+    """Add a paint spot, growing the buffer when it is full
+
+    Args:
+        location (np.ndarray): (3,) location of the spot
+    """
+    if self._count == len(self._points):
+      grown = np.empty((2 * len(self._points), 3))
+      grown[:self._count] = self._points
+      self._points = grown
+    self._points[self._count] = location[:3]
+    self._count += 1
+
+  def draw(self):
+    """Create the artist holding every spot"""
+    points = self.points
+    (self._spot_artist, ) = self._ax.plot(
+        points[:, 0], points[:, 1], points[:, 2],
+        linestyle="none",
+        marker=".",
+        color=self.color,
+        markersize=self._markersize)
+    self._scaled_count = self._count
+
+  def _update_drawing(self):
+    """Point the artist at the current spots and grow the view to fit new ones"""
+    # Re-attach the artist if the axes have been cleared since the last draw
+    if self._spot_artist.axes is None:
+      self._ax.add_line(self._spot_artist)
+
+    points = self.points
+    self._spot_artist.set_data_3d(points[:, 0], points[:, 1], points[:, 2])
+    if self._scaled_count < self._count:
+      new_points = points[self._scaled_count:]
+      self._ax.auto_scale_xyz(new_points[:, 0], new_points[:, 1],
+                              new_points[:, 2], had_data=True)
+      self._scaled_count = self._count
+
+  def redraw(self):
+    """Redraw the existing artist """
+    self._spot_artist.set_animated(True)
+    self._update_drawing()
+    self._ax.draw_artist(self._spot_artist)
+    self._spot_artist.set_animated(False)
+
+
+class RobotDrawing(object):
+  """Every frame and link of a robot drawn as a single Line3DCollection
+
+  Each frame adds three axis segments and each link one segment. All of them
+  live in one (M,2,3) array that is rewritten in place and handed to the
+  collection with one set_segments call, instead of updating one Line3D
+  artist per axis and per link.
+  """
+  FRAME_LINEWIDTH = 1.5  # width of the frame axes
+  LINK_LINEWIDTH = 1.5   # width of the links
+
+  def __init__(self, ax: Axes3D, frame_colors: list, link_colors: list,
+               frame_size: float = None):
+    """Initialize the robot drawing
+
+    Args:
+        ax (Axes3D): The Axes3D to use for drawing
+        frame_colors (list): one entry per frame, None for red/green/blue axes
+            or a single color for all three axes
+        link_colors (list): one color per link, None for blue
+        frame_size (float, optional): length of frame axes. Defaults to FrameDrawing.LENGTH.
+    """
+    self._ax = ax
+    self._length = FrameDrawing.LENGTH if frame_size is None else frame_size
+    self._n_frames = len(frame_colors)
+    self._n_links = len(link_colors)
+    self._segments = np.zeros((3 * self._n_frames + self._n_links, 2, 3))
+    self._collection_artist = None
+
+    self._colors = []
+    for color in frame_colors:
+      self._colors += ["r", "g", "b"] if color is None else [color] * 3
+    self._colors += ['b' if color is None else color for color in link_colors]
+    self._linewidths = ([self.FRAME_LINEWIDTH] * 3 * self._n_frames +
+                        [self.LINK_LINEWIDTH] * self._n_links)
+
+  @property
+  def segments(self) -> np.ndarray:
+    """(M,2,3) start and end point of every segment, frame axes first"""
+    return self._segments
+
+  @property
+  def colors(self) -> list:
+    """Color of every segment"""
+    return self._colors
+
+  @property
+  def linewidths(self) -> list:
+    """Line width of every segment"""
+    return self._linewidths
+
+  def update_frames(self, frames: np.ndarray, link_frames: np.ndarray):
+    """Rebuild every segment from the robot frames
+
+    Args:
+        frames (np.ndarray): (F,4,4) frames drawn as axes
+        link_frames (np.ndarray): (L+1,4,4) chain frames, link i joins the
+            origins of link_frames[i] and link_frames[i + 1]
+    """
+    general.check_proper_numpy_format(frames, (self._n_frames, 4, 4))
+    general.check_proper_numpy_format(link_frames, (self._n_links + 1, 4, 4))
+
+    axes = self._segments[:3 * self._n_frames].reshape(self._n_frames, 3, 2, 3)
+    origins = frames[:, None, :3, 3]
+    axes[:, :, 0] = origins
+    axes[:, :, 1] = origins + self._length * np.swapaxes(frames[:, :3, :3], 1, 2)
+
+    link_origins = link_frames[:, :3, 3]
+    links = self._segments[3 * self._n_frames:]
+    links[:, 0] = link_origins[:-1]
+    links[:, 1] = link_origins[1:]
+
+  def update_segments(self, segments: np.ndarray):
+    """Overwrite every segment at once
+
+    Args:
+        segments (np.ndarray): (M,2,3) segments ordered like the segments property
+    """
+    general.check_proper_numpy_format(segments, self._segments.shape)
+    self._segments[...] = segments
+
+  def draw(self):
+    """Create the collection on the first call, then only update it"""
+    if self._collection_artist is not None:
+      self.redraw()
+      return
+    self._collection_artist = Line3DCollection(self._segments,
+                                               colors=self._colors,
+                                               linewidths=self._linewidths)
+    self._ax.add_collection3d(self._collection_artist)
+
+  def _update_drawing(self):
+    """Hand the segment array to the collection"""
+    self._collection_artist.set_segments(self._segments)
+
+  def redraw(self):
+    """Redraw the existing artist """
+    self._collection_artist.set_animated(True)
+    self._update_drawing()
+    self._ax.draw_artist(self._collection_artist)
+    self._collection_artist.set_animated(False)
+
+
+class RasterCanvas(object):
+  """Headless orthographic renderer writing straight into a NumPy RGB buffer
+
+  Points are projected with a fixed camera (elevation and azimuth as in
+  Axes3D.view_init) scaled so the given bounds fill the image. Lines are
+  sampled every half pixel and splatted with bilinear weights, which gives
+  anti-aliased edges without a per-line Python loop; spots are anti-aliased
+  discs. Everything drawn in one call is blended by coverage, so overlaps
+  inside a call average their colors while later calls paint over earlier
+  ones. No Matplotlib figure or GUI backend is involved.
+  """
+  SAMPLE_SPACING = 0.5  # pixels between line samples
+
+  def __init__(self, width: int, height: int, bounds: tuple,
+               elev: float = 30.0, azim: float = -60.0,
+               background=(1.0, 1.0, 1.0), margin: int = 10):
+    """Initialize the canvas and its camera
+
+    Args:
+        width (int): image width in pixels
+        height (int): image height in pixels
+        bounds (tuple): (x_min, x_max, y_min, y_max, z_min, z_max) box that
+            must fit inside the image
+        elev (float, optional): camera elevation in degrees. Defaults to 30.
+        azim (float, optional): camera azimuth in degrees. Defaults to -60.
+        background (tuple, optional): RGB background in [0, 1]. Defaults to white.
+        margin (int, optional): empty border in pixels. Defaults to 10.
+    """
+    self._width = int(width)
+    self._height = int(height)
+    self._bounds = np.asarray(bounds, dtype=float).reshape(3, 2)
+    self._buffer = np.empty((self._height, self._width, 3), dtype=np.float32)
+    self._backdrop = np.empty_like(self._buffer)
+    self._backdrop[...] = np.asarray(background, dtype=np.float32)
+    self.clear()
+
+    # Screen right and screen up of a camera orbiting the z axis
+    elev = np.radians(elev)
+    azim = np.radians(azim)
+    self._view = np.array([
+        [-np.sin(azim), np.cos(azim), 0.0],
+        [-np.sin(elev) * np.cos(azim), -np.sin(elev) * np.sin(azim), np.cos(elev)],
+    ])
+
+    # Scale and center the projected corners of the bounds in the image
+    corners = np.stack(np.meshgrid(*self._bounds, indexing="ij"), axis=-1).reshape(-1, 3)
+    projected = corners @ self._view.T
+    low = projected.min(axis=0)
+    span = np.maximum(projected.max(axis=0) - low, 1e-12)
+    self._scale = min((self._width - 2 * margin) / span[0],
+                      (self._height - 2 * margin) / span[1])
+    self._offset = (np.array([self._width, self._height]) -
+                    self._scale * span) / 2 - self._scale * low
+
+  @property
+  def shape(self) -> tuple:
+    """(height, width, 3) of the image"""
+    return self._buffer.shape
+
+  def project(self, points: np.ndarray) -> np.ndarray:
+    """Pixel coordinates of 3D points
+
+    Args:
+        points (np.ndarray): (...,3) points in space
+
+    Returns:
+        np.ndarray: (...,2) column and row, row 0 at the top of the image
+    """
+    pixels = np.asarray(points, dtype=float) @ self._view.T * self._scale + self._offset
+    pixels[..., 1] = self._height - pixels[..., 1]
+    return pixels
+
+  def clear(self):
+    """Reset the image to the background, see also keep_as_background"""
+    self._buffer[...] = self._backdrop
+
+  def keep_as_background(self):
+    """Make the current image the one clear() restores
+
+    Draw static content such as draw_bounds once, call this, and every later
+    frame starts from it instead of redrawing it.
+    """
+    self._backdrop[...] = self._buffer
+
+  def image(self) -> np.ndarray:
+    """The current image as (height, width, 3) uint8 RGB"""
+    return (np.clip(self._buffer, 0.0, 1.0) * 255 + 0.5).astype(np.uint8)
+
+  def _rgb(self, colors, count: int) -> np.ndarray:
+    """One RGB row per item from any Matplotlib color or list of colors"""
+    if is_color_like(colors):
+      colors = [colors]
+    rgb = to_rgba_array(colors)[:, :3]
+    return np.broadcast_to(rgb, (count, 3)) if len(rgb) == 1 else rgb
+
+  def _composite(self, flat: np.ndarray, coverage: np.ndarray, colors: np.ndarray):
+    """Blend coverage weighted colors into the buffer
+
+    Args:
+        flat (np.ndarray): (P,) flat pixel indices
+        coverage (np.ndarray): (P,) coverage of each contribution
+        colors (np.ndarray): (P,3) color of each contribution
+    """
+    if len(flat) == 0:
+      return
+    # Sum per touched pixel only, never over the whole image
+    hit, slot = np.unique(flat, return_inverse=True)
+    total = np.bincount(slot, coverage, len(hit))
+    keep = total > 0
+    rgb = np.stack([np.bincount(slot, coverage * colors[:, channel], len(hit))
+                    for channel in range(3)], axis=1)[keep] / total[keep, None]
+    hit = hit[keep]
+    alpha = np.minimum(total[keep], 1.0)[:, None]
+    buffer = self._buffer.reshape(-1, 3)
+    buffer[hit] = buffer[hit] * (1 - alpha) + rgb * alpha
+
+  def draw_segments(self, segments: np.ndarray, colors, width: float = 1.0):
+    """Draw anti-aliased 3D line segments
+
+    Args:
+        segments (np.ndarray): (M,2,3) start and end point of every segment
+        colors: one color for all segments or one per segment
+        width (float, optional): line width in pixels. Defaults to 1.
+    """
+    segments = np.asarray(segments, dtype=float).reshape(-1, 2, 3)
+    if len(segments) == 0:
+      return
+    colors = self._rgb(colors, len(segments))
+    ends = self.project(segments)
+    start = ends[:, 0]
+    delta = ends[:, 1] - start
+    length = np.hypot(delta[:, 0], delta[:, 1])
+
+    # Evenly spaced samples along every segment, all segments at once
+    n_samples = np.ceil(length / self.SAMPLE_SPACING).astype(int) + 1
+    owner = np.repeat(np.arange(len(segments)), n_samples)
+    first = np.cumsum(n_samples) - n_samples
+    steps = np.maximum(n_samples - 1, 1)
+    t = (np.arange(len(owner)) - first[owner]) / steps[owner]
+    samples = start[owner] + t[:, None] * delta[owner]
+    spacing = np.where(n_samples > 1, length / steps, 1.0)[owner]
+
+    # Wide lines are several parallel strands, each covering its share
+    strands = max(1, int(np.ceil(width)))
+    normal = np.stack([-delta[:, 1], delta[:, 0]], axis=1) / np.maximum(length, 1e-12)[:, None]
+    shifts = (np.arange(strands) - (strands - 1) / 2) * (width / strands)
+    samples = (samples[None] + shifts[:, None, None] * normal[owner][None]).reshape(-1, 2)
+    weights = np.tile(spacing * width / strands, strands)
+    self._splat(samples, weights, np.tile(colors[owner], (strands, 1)))
+
+  def _splat(self, points: np.ndarray, weights: np.ndarray, colors: np.ndarray):
+    """Spread weighted 2D samples over their four nearest pixels"""
+    points = points - 0.5  # pixel centers sit at +0.5
+    base = np.floor(points).astype(int)
+    frac = points - base
+    flats, coverages, spread_colors = [], [], []
+    for dx, dy in ((0, 0), (1, 0), (0, 1), (1, 1)):
+      column = base[:, 0] + dx
+      row = base[:, 1] + dy
+      inside = (column >= 0) & (column < self._width) & (row >= 0) & (row < self._height)
+      weight = (weights * np.abs(1 - dx - frac[:, 0]) * np.abs(1 - dy - frac[:, 1]))
+      flats.append((row * self._width + column)[inside])
+      coverages.append(weight[inside])
+      spread_colors.append(colors[inside])
+    self._composite(np.concatenate(flats), np.concatenate(coverages),
+                    np.concatenate(spread_colors))
+
+  def draw_points(self, points: np.ndarray, colors, radius: float = 2.0):
+    """Draw anti-aliased round spots, e.g. paint spots
+
+    Args:
+        points (np.ndarray): (N,3) spot centers
+        colors: one color for all spots or one per spot
+        radius (float, optional): spot radius in pixels. Defaults to 2.
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
+    if len(points) == 0:
+      return
+    colors = self._rgb(colors, len(points))
+    centers = self.project(points)
+
+    reach = int(np.ceil(radius)) + 1
+    grid = np.stack(np.meshgrid(np.arange(-reach, reach + 1),
+                                np.arange(-reach, reach + 1)), axis=-1).reshape(-1, 2)
+    pixels = np.floor(centers).astype(int)[:, None] + grid[None]
+    distance = np.linalg.norm(pixels + 0.5 - centers[:, None], axis=2)
+    coverage = np.clip(radius + 0.5 - distance, 0.0, 1.0)
+    inside = ((coverage > 0) & (pixels[..., 0] >= 0) & (pixels[..., 0] < self._width) &
+              (pixels[..., 1] >= 0) & (pixels[..., 1] < self._height))
+    owner = np.nonzero(inside)[0]
+    flat = pixels[..., 1] * self._width + pixels[..., 0]
+    self._composite(flat[inside], coverage[inside], colors[owner])
+
+  def draw_robot(self, robot_drawing: "RobotDrawing"):
+    """Draw the current segments of a RobotDrawing with its colors and widths
+
+    Args:
+        robot_drawing (RobotDrawing): robot whose update_frames was called;
+            it may have been created without axes
+    """
+    linewidths = np.asarray(robot_drawing.linewidths)
+    colors = self._rgb(robot_drawing.colors, len(linewidths))
+    for width in np.unique(linewidths):
+      group = linewidths == width
+      self.draw_segments(robot_drawing.segments[group], colors[group], width)
+
+  def draw_bounds(self, color=(0.75, 0.75, 0.75)):
+    """Draw the twelve edges of the bounds box"""
+    (x_0, x_1), (y_0, y_1), (z_0, z_1) = self._bounds
+    corners = np.array([[x, y, z] for x in (x_0, x_1) for y in (y_0, y_1) for z in (z_0, z_1)])
+    edges = [(a, b) for a in range(8) for b in range(a + 1, 8)
+             if bin(a ^ b).count("1") == 1]
+    self.draw_segments(corners[np.array(edges)], color)
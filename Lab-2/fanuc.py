@@ -1,3 +1,5 @@
+import hashlib
+import os
 import numpy as np
 import math
 import matplotlib.pyplot as plt
@@ -6,7 +8,9 @@ from typing import Tuple, List
 from copy import deepcopy
 
 import general_utility as general
-from robot_components import Brush, Link, Joint
+import se3
+from robot_components import Brush, Link, Joint, FrameChain
+from drawing_helper import RobotDrawing
 
 
 def make_frame(rotation: np.ndarray, translation: np.ndarray) -> np.ndarray:
@@ -19,12 +23,7 @@ def make_frame(rotation: np.ndarray, translation: np.ndarray) -> np.ndarray:
   Returns:
       np.ndarray: 4x4 numpy transformation array
   """
-  frame = np.eye(4)
-  frame = frame @ general.yawT(rotation[2])
-  frame = frame @ general.pitchT(rotation[1])
-  frame = frame @ general.rollT(rotation[0])
-  frame[:3, 3] = translation
-  return frame
+  return general.zyxT(rotation, translation)
 
 
 class Workspace(object):
@@ -48,6 +47,112 @@ class Workspace(object):
     self.z_max = z_max
 
 
+class ReachabilityGrid(object):
+  """Occupancy grid of the wrist centers the first three joints can reach
+
+  The wrist center only depends on q1 through the azimuth, so reachability is
+  stored on a 2D grid in the arm plane: x is the radial distance of the wrist
+  center from joint 2 (r_eff - a_1) and z its height. Cells are marked by
+  sampling q2/q3 over their limits finer than half a cell and then growing the
+  marked set by one cell, so a reachable wrist center is never rejected.
+
+  The grid is cached next to this file and rebuilt whenever the link lengths,
+  the joint limits or the cell size change.
+  """
+  CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            "fanuc.reach.npz")
+
+  def __init__(self, a_2: float, a_3: float, d_4: float, q2_limits: Tuple[float, float],
+               q3_limits: Tuple[float, float], cell_size: float = 10.0,
+               cache_file: str = CACHE_FILE):
+    """Load the grid from cache_file, or build and save it
+
+    Args:
+        a_2 (float): DH a of joint 3 in mm
+        a_3 (float): DH a of joint 4 in mm
+        d_4 (float): DH d of joint 4 in mm
+        q2_limits (Tuple[float, float]): (low, high) of joint 2 in radians
+        q3_limits (Tuple[float, float]): (low, high) of joint 3 in radians
+        cell_size (float, optional): grid resolution in mm. Defaults to 10.0.
+        cache_file (str, optional): .npz cache, None disables caching.
+                                    Defaults to CACHE_FILE.
+    """
+    self.cell_size = float(cell_size)
+    self.extent = a_2 + math.hypot(a_3, d_4) + self.cell_size
+
+    params = np.array([a_2, a_3, d_4, *q2_limits, *q3_limits, self.cell_size],
+                      dtype=float)
+    key = hashlib.sha1(params.tobytes()).hexdigest()
+
+    self.grid = None
+    if cache_file is not None and os.path.isfile(cache_file):
+      try:
+        with np.load(cache_file) as cached:
+          if str(cached["key"]) == key:
+            self.grid = cached["grid"]
+      except (OSError, ValueError, KeyError):
+        self.grid = None
+
+    if self.grid is None:
+      self.grid = self._build(a_2, a_3, d_4, q2_limits, q3_limits)
+      if cache_file is not None:
+        try:
+          tmp_file = cache_file + ".tmp"
+          with open(tmp_file, 'wb') as file:
+            np.savez(file, key=key, grid=self.grid)
+          os.replace(tmp_file, cache_file)
+        except OSError:
+          pass  # read-only checkout, keep the grid in memory only
+
+  def _build(self, a_2: float, a_3: float, d_4: float,
+             q2_limits: Tuple[float, float],
+             q3_limits: Tuple[float, float]) -> np.ndarray:
+    """Sample the arm plane workspace into a dilated occupancy grid
+
+    Returns:
+        np.ndarray: (M,M) bool grid indexed by [x cell, z cell]
+    """
+    n_cells = int(math.ceil(2.0 * self.extent / self.cell_size))
+    grid = np.zeros((n_cells, n_cells), dtype=bool)
+
+    # Keep the arc between neighbouring samples below half a cell
+    step = 0.5 * self.cell_size / self.extent
+    q2 = np.linspace(*q2_limits, int(math.ceil((q2_limits[1] - q2_limits[0]) / step)) + 1)
+    q3 = np.linspace(*q3_limits, int(math.ceil((q3_limits[1] - q3_limits[0]) / step)) + 1)
+    s2, c2 = np.sin(q2), np.cos(q2)
+    for angle in q3:
+      P = a_3 * math.cos(angle) - d_4 * math.sin(angle) + a_2
+      Q = a_3 * math.sin(angle) + d_4 * math.cos(angle)
+      grid[self._cells(P * s2 + Q * c2), self._cells(P * c2 - Q * s2)] = True
+
+    # Grow by one cell in every direction so points between samples are kept
+    padded = np.pad(grid, 1)
+    for dx in range(3):
+      for dz in range(3):
+        grid |= padded[dx:dx + n_cells, dz:dz + n_cells]
+    return grid
+
+  def _cells(self, values: np.ndarray) -> np.ndarray:
+    """Grid index of arm plane coordinates in mm"""
+    return np.floor((np.asarray(values) + self.extent) / self.cell_size).astype(int)
+
+  def contains(self, x: np.ndarray, z: np.ndarray) -> np.ndarray:
+    """O(1) lookup of whether wrist centers may be reachable
+
+    Args:
+        x (np.ndarray): radial distance of the wrist center from joint 2 in mm
+        z (np.ndarray): height of the wrist center in mm
+
+    Returns:
+        np.ndarray: bool array, False only where the arm cannot reach
+    """
+    ix = self._cells(x)
+    iz = self._cells(z)
+    n_cells = len(self.grid)
+    inside = (ix >= 0) & (ix < n_cells) & (iz >= 0) & (iz < n_cells)
+    return inside & self.grid[np.clip(ix, 0, n_cells - 1), np.clip(iz, 0, n_cells - 1)]
+
+
 class Fanuc(object):
   """Fanuc class to hold the information about the Fanuc Arm """
   @property
@@ -61,24 +166,29 @@ class Fanuc(object):
   def ee_frame(self) -> np.ndarray:
     """Returns the position of the end effector given the joint transforms 
 
-    Note, this is an inefficient call as it recalculates each time. If you want to 
-    be fancy and make your code run faster, you can re-write this. 
+    The chain of joint transforms is cached and only multiplied out again
+    after one of the joints changes (see robot_components.FrameChain).
 
     Returns:
         np.ndarray: (4,4) of the final location of the end effector. 
     """
-    ee_frame_temp = (self._joint_1.dh_transform @ self._joint_2.dh_transform @
-                     self._joint_3.dh_transform @ self._joint_4.dh_transform @
-                     self._joint_5.dh_transform @ self._joint_6.dh_transform)
-    return ee_frame_temp
+    return self._chain.ee_frame.copy()
+
 
+  def __init__(self, drawing_enabled: bool = True,
+               collection_drawing: bool = False):
+    """Initialize the class 
 
-  def __init__(self, drawing_enabled: bool = True):
-    """Initialize the class """
+    Args:
+        drawing_enabled (bool, optional): draw the robot. Defaults to True.
+        collection_drawing (bool, optional): draw every frame and link as one
+            RobotDrawing collection instead of one artist each. Defaults to False.
+    """
 
     self._joints = []
     self._drawn_once = False
     self._drawing_enabled = drawing_enabled
+    self._collection_drawing = drawing_enabled and collection_drawing
     self._ee_frame = np.eye(4)
 
 
@@ -102,6 +212,10 @@ class Fanuc(object):
     self.workspace = Workspace(-3238,3238,-3238,3238,-3238,3238)
     """^^^^^^^^^TODO^^^^^^^^^^^"""
 
+    # Pedestal below joint 1 (l_1_z of the provided model). The base frame
+    # here sits at joint 1, so the pedestal is only used for collisions.
+    self.pedestal_height = 1000  #[mm]
+
 
     # Initialzie the colors for drawing links. Feel free to change if you'd like.
     self.colors = [
@@ -144,9 +258,30 @@ class Fanuc(object):
     self._joint_6: Joint = None
 
     self._setup_joints()
+    self._chain = FrameChain(self.joints)
+    self._loaded_thetas = [None] * 6
+    self._loaded_revisions = [None] * 6
+
+    # Link capsules for self-collision checks, sized from the link dimensions
+    self.capsule_radii = np.array([0.5 * self.a_1, 0.4 * self.a_1, 0.08 * self.a_2,
+                                   0.4 * self.a_3, 0.4 * self.a_3, 0.25 * self.l_6_z])
+    self.collision_pairs = np.array([(first, second) for first in range(6)
+                                     for second in range(first + 2, 6)])
+
+    # Wrist center reachability, used to reject targets before solving IK
+    self.reach = ReachabilityGrid(
+        self.a_2, self.a_3, self.l_4_z,
+        (self._joint_2.low_limit, self._joint_2.high_limit),
+        (self._joint_3.low_limit, self._joint_3.high_limit))
 
     self._links = [Link(self.ax, self.colors[index]) for index in range(6)]
 
+    # Base frame, zero frame and six joint frames, plus the six links
+    self._robot_drawing: RobotDrawing = None
+    if self._collection_drawing:
+      self._robot_drawing = RobotDrawing(self.ax, [None, None] + [self.colors[0]] * 6,
+                                         self.colors[:6])
+
   def _setup_joints(self):
     """Use this area to initialize the joints.
     I have provided the start of the first joint. You need to
@@ -194,7 +329,7 @@ class Fanuc(object):
     # Note -- math.radians(value) will convert the degree input "value" into radians
     ... # next do joints 2 thru 6
 
-    if self._drawing_enabled:
+    if self._drawing_enabled and not self._collection_drawing:
       for joint in self.joints:
         joint.draw()
 
@@ -221,19 +356,443 @@ class Fanuc(object):
         if not joint.is_inside_joint_limit(float(theta)):
             raise ValueError(f"Joint {i} angle {theta} is out of range")
       
-    # Load the joint angles into the joints
-    self._joint_1.set_theta(joint_angles[0])
-    self._joint_2.set_theta(joint_angles[1] - (np.pi/2))
-    self._joint_3.set_theta(joint_angles[2])
-    self._joint_4.set_theta(joint_angles[3])
-    self._joint_5.set_theta(joint_angles[4])
-    self._joint_6.set_theta(joint_angles[5])
+    # Load the joint angles into the joints. Only joints whose angle or
+    # revision (set_dh_parameters) changed are reloaded, so the cached prefix
+    # frames before the first changed joint are reused (e.g. wrist-only moves
+    # recompute T_34 onward).
+    thetas = [joint_angles[0], joint_angles[1] - (np.pi/2), joint_angles[2],
+              joint_angles[3], joint_angles[4], joint_angles[5]]
+    for index, (joint, theta) in enumerate(zip(self.joints, thetas)):
+      if (self._loaded_thetas[index] != theta or
+          self._loaded_revisions[index] != joint.revision):
+        joint.set_theta(theta)
+        self._loaded_thetas[index] = theta
+        self._loaded_revisions[index] = joint.revision
 
     return self.ee_frame
-    
+
+  def calculate_fk_batch(self, joint_angles: np.ndarray,
+                         return_all: bool = False) -> np.ndarray:
+    """Calculate the forward kinematics for many joint configurations at once
+
+    Uses the DH parameters loaded in _setup_joints with broadcast trig and
+    stacked matrix products. The joints of the robot are not modified, so
+    this can score whole paths without disturbing the drawn configuration.
+
+    Args:
+        joint_angles (np.ndarray): (N,6) array of joint angles, one row per sample
+        return_all (bool, optional): return every link frame instead of only
+                                     the end effector. Defaults to False.
+
+    Raises:
+        ValueError: if the input is not (N,6) or any angle is out of range
+
+    Returns:
+        np.ndarray: (N,4,4) end effector frames, or (N,7,4,4) frames
+                    [T_00, T_01, ... T_06] when return_all is True
+    """
+    q = np.asarray(joint_angles, dtype=float)
+    if q.ndim != 2 or q.shape[1] != 6:
+      raise ValueError("joint_angles must be an (N,6) array")
+
+    low = np.array([joint.low_limit for joint in self.joints])
+    high = np.array([joint.high_limit for joint in self.joints])
+    outside = (q < low) | (q > high)
+    if outside.any():
+      row, col = np.argwhere(outside)[0]
+      raise ValueError(
+          f"Joint {col + 1} angle {q[row, col]} is out of range (sample {row})")
+
+    thetas = q - np.array([0, np.pi / 2, 0, 0, 0, 0])
+
+    current = np.broadcast_to(np.eye(4), (len(q), 4, 4))
+    frames = [current]
+    for index, joint in enumerate(self.joints):
+      current = current @ Joint.dh_tf_batch(joint._alpha, joint._a, joint._d,
+                                            thetas[:, index])
+      frames.append(current)
+
+    if return_all:
+      return np.stack(frames, axis=1)
+    return current
+
+  def capsule_segments(self, joint_angles: np.ndarray) -> np.ndarray:
+    """End points of the link capsules for many joint configurations
+
+    Capsules, in order: base pedestal, shoulder (a_1), upper arm (a_2), elbow
+    offset (a_3), forearm (l_4_z), wrist to flange (l_6_z).
+
+    Args:
+        joint_angles (np.ndarray): (N,6) array of joint angles, one row per sample
+
+    Returns:
+        np.ndarray: (N,6,2,3) start and end point of every capsule in mm
+    """
+    frames = self.calculate_fk_batch(joint_angles, return_all=True)
+    origins = frames[:, :, :3, 3]
+    elbow = origins[:, 3] + self.a_3 * frames[:, 3, :3, 0]
+
+    segments = np.empty((len(frames), 6, 2, 3))
+    # The turret carrying joint 2 is covered by the shoulder capsule, so the
+    # pedestal stops a_1 below joint 2
+    segments[:, 0, 0] = [0, 0, -self.pedestal_height]
+    segments[:, 0, 1] = [0, 0, -self.a_1]
+    segments[:, 1] = np.stack([origins[:, 1], origins[:, 2]], axis=1)
+    segments[:, 2] = np.stack([origins[:, 2], origins[:, 3]], axis=1)
+    segments[:, 3] = np.stack([origins[:, 3], elbow], axis=1)
+    segments[:, 4] = np.stack([elbow, origins[:, 4]], axis=1)
+    segments[:, 5] = np.stack([origins[:, 5], origins[:, 6]], axis=1)
+    return segments
+
+  def self_collision_batch(self, joint_angles: np.ndarray,
+                           margin: float = 0.0) -> Tuple[np.ndarray, np.ndarray]:
+    """Check many joint configurations for the arm folding through itself
+
+    Every non-adjacent capsule pair is tested with one vectorized
+    segment-segment distance (general.segment_distance).
+
+    Args:
+        joint_angles (np.ndarray): (N,6) array of joint angles, one row per sample
+        margin (float, optional): extra clearance in mm required between
+                                  capsules. Defaults to 0.0.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (N,) bool True where a pair collides,
+                                       and the (N,) smallest clearance in mm
+    """
+    segments = self.capsule_segments(joint_angles)
+    first, second = self.collision_pairs.T
+    distance = general.segment_distance(segments[:, first, 0], segments[:, first, 1],
+                                        segments[:, second, 0], segments[:, second, 1])
+    clearance = (distance - self.capsule_radii[first] - self.capsule_radii[second]).min(axis=1)
+    return clearance < margin, clearance
+
+  def calculate_jacobian_batch(self, joint_angles: np.ndarray) -> np.ndarray:
+    """Calculate the geometric Jacobian for many joint configurations at once
+
+    Every joint is revolute about the z axis of its DH frame, so column i is
+    [z_i x (p_ee - o_i); z_i] with all frames taken from calculate_fk_batch.
+    The joints of the robot are not modified.
+
+    Args:
+        joint_angles (np.ndarray): (N,6) array of joint angles, one row per sample
+
+    Raises:
+        ValueError: if the input is not (N,6) or any angle is out of range
+
+    Returns:
+        np.ndarray: (N,6,6) Jacobians in the base frame. Rows 0-2 map joint
+                    rates to linear velocity (mm/s), rows 3-5 to angular
+                    velocity (rad/s).
+    """
+    frames = self.calculate_fk_batch(joint_angles, return_all=True)
+    axes = frames[:, 1:, :3, 2]
+    origins = frames[:, 1:, :3, 3]
+    p_ee = frames[:, -1:, :3, 3]
+
+    jacobian = np.empty((len(frames), 6, 6))
+    jacobian[:, :3, :] = np.swapaxes(np.cross(axes, p_ee - origins), 1, 2)
+    jacobian[:, 3:, :] = np.swapaxes(axes, 1, 2)
+    return jacobian
+
+  def manipulability_batch(
+      self, joint_angles: np.ndarray,
+      length_scale: float = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Singularity metrics for many joint configurations at once
+
+    The linear rows of the Jacobian are divided by length_scale so that they
+    are unitless like the angular rows before taking singular values.
+
+    Args:
+        joint_angles (np.ndarray): (N,6) array of joint angles, one row per sample
+        length_scale (float, optional): characteristic length in mm. Defaults
+                                        to the arm reach from joint 2.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]:
+            (N,) Yoshikawa manipulability (product of singular values),
+            (N,) condition number (inf at a singularity),
+            (N,) smallest singular value, the distance to singularity
+    """
+    if length_scale is None:
+      length_scale = self.a_2 + math.hypot(self.a_3, self.l_4_z)
+    jacobian = self.calculate_jacobian_batch(joint_angles)
+    jacobian[:, :3, :] /= length_scale
+
+    sigma = np.linalg.svd(jacobian, compute_uv=False)
+    sigma_min = sigma[:, -1]
+    manipulability = np.prod(sigma, axis=1)
+    with np.errstate(divide='ignore'):
+      condition = np.where(sigma_min > 0, sigma[:, 0] / sigma_min, np.inf)
+    return manipulability, condition, sigma_min
+
+  def arm_frame(self, q1, q2, q3) -> np.ndarray:
+    """Calculate T_03 for the first three joints without touching the joints
+
+    Args:
+        q1 (float or np.ndarray): joint 1 angle(s) in radians
+        q2 (float or np.ndarray): joint 2 angle(s) in radians
+        q3 (float or np.ndarray): joint 3 angle(s) in radians
+
+    Returns:
+        np.ndarray: (4,4) transform from the base to frame 3, or (...,4,4)
+                    when array angles are given
+    """
+    T_03 = np.eye(4)
+    for theta, joint in zip([q1, np.subtract(q2, np.pi / 2), q3], self.joints[:3]):
+      T_03 = T_03 @ Joint.dh_tf_batch(joint._alpha, joint._a, joint._d, theta)
+    return T_03
+
+  def verify_wrist_candidates(self, T_03: np.ndarray, wrist_angles: np.ndarray,
+                              ee_frame: np.ndarray,
+                              tolerance: float = 1e-3) -> np.ndarray:
+    """Check wrist candidates against a target frame
+
+    The T_03 prefix is shared, so only the wrist transforms are built
+    (batched) and one stacked product gives every T_06. T_03 and ee_frame
+    are either a single (4,4) shared by every candidate or one (K,4,4) per
+    candidate. The joints of the robot are not modified.
+
+    Args:
+        T_03 (np.ndarray): (4,4) or (K,4,4) arm frame(s) from arm_frame()
+        wrist_angles (np.ndarray): (K,3) candidate [q4, q5, q6] rows
+        ee_frame (np.ndarray): (4,4) or (K,4,4) desired end effector frame(s)
+        tolerance (float, optional): max position (mm) and rotation (rad)
+                                     error. Defaults to 1e-3.
+
+    Returns:
+        np.ndarray: (K,) bool mask of the candidates that reach ee_frame
+                    inside the wrist joint limits
+    """
+    wrist_angles = np.asarray(wrist_angles, dtype=float).reshape(-1, 3)
+
+    T_36 = np.broadcast_to(np.eye(4), (len(wrist_angles), 4, 4))
+    in_limits = np.ones(len(wrist_angles), dtype=bool)
+    for column, joint in enumerate(self.joints[3:]):
+      theta = wrist_angles[:, column]
+      in_limits &= (joint.low_limit <= theta) & (theta <= joint.high_limit)
+      T_36 = T_36 @ Joint.dh_tf_batch(joint._alpha, joint._a, joint._d, theta)
+    T_06 = T_03 @ T_36
+
+    # The true rotation angle, so a candidate flipped by 180 deg (whose skew
+    # part vanishes) is rejected too
+    pos_err, rot_err = se3.pose_distance(ee_frame, T_06)
+
+    return in_limits & (pos_err <= tolerance) & (rot_err <= tolerance)
+
+  def _inside_limits(self, index: int, angles: np.ndarray) -> np.ndarray:
+    """Elementwise joint limit check for one joint
+
+    Args:
+        index (int): zero based joint index
+        angles (np.ndarray): array of candidate angles
+
+    Returns:
+        np.ndarray: bool array, True where the angle is inside the limits
+    """
+    joint = self.joints[index]
+    return (joint.low_limit <= angles) & (angles <= joint.high_limit)
+
+  def _turn_offsets(self, index: int) -> np.ndarray:
+    """Multiples of 2*pi worth adding to an atan2 result for one joint
+
+    Args:
+        index (int): zero based joint index
+
+    Returns:
+        np.ndarray: offsets 2*pi*k for every k that can land a (-pi, pi]
+                    angle inside the joint limits
+    """
+    joint = self.joints[index]
+    k_low = math.ceil((joint.low_limit - math.pi) / (2.0 * math.pi))
+    k_high = math.floor((joint.high_limit + math.pi) / (2.0 * math.pi))
+    return np.arange(k_low, k_high + 1) * 2.0 * math.pi
+
+  def calculate_ik_all_batch(
+      self, ee_frames: np.ndarray, prev_joint_angles: np.ndarray = None,
+      reject_collisions: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+    """Every valid analytic IK solution for a batch of end effector frames
+
+    Stateless: the joints of the robot are not modified. All q1 / elbow / q5
+    branches and the 2*pi multiples of q4 and q6 inside the joint limits are
+    enumerated with array math over every frame, and all candidates are
+    verified together with one batched FK product. Frames whose wrist center
+    falls outside the reachability grid are dropped before any of that.
+
+    Args:
+        ee_frames (np.ndarray): (N,4,4) desired end effector frames
+        prev_joint_angles (np.ndarray, optional): (6,) or (N,6) previous joint
+            angles. Only q4 is used, to pick q4 at a wrist singularity.
+            Defaults to q4 = 0.
+        reject_collisions (bool, optional): drop solutions that fold the arm
+            through itself (self_collision_batch). Defaults to False.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (N,Kmax,6) solutions padded with zeros,
+                                       and the (N,Kmax) bool mask of real rows
+    """
+    frames = np.asarray(ee_frames, dtype=float).reshape(-1, 4, 4)
+    n_frames = len(frames)
+    if prev_joint_angles is None:
+      prev_q4 = np.zeros(n_frames)
+    else:
+      prev_q4 = np.broadcast_to(
+          np.asarray(prev_joint_angles, dtype=float)[..., 3], (n_frames,))
+
+    R_target = frames[:, :3, :3]
+    p_ee     = frames[:, :3, 3]
+
+    # DH parameters
+    a1, a2, a3, d4, d6 = self.a_1, self.a_2, self.a_3, self.l_4_z, self.l_6_z
+
+    # Check if the desired end effector frames are within the workspace
+    in_box = ((self.workspace.x_min <= p_ee[:, 0]) & (p_ee[:, 0] <= self.workspace.x_max) &
+              (self.workspace.y_min <= p_ee[:, 1]) & (p_ee[:, 1] <= self.workspace.y_max) &
+              (self.workspace.z_min <= p_ee[:, 2]) & (p_ee[:, 2] <= self.workspace.z_max))
+
+    p_wc = p_ee - d6 * R_target[:, :, 2]
+    r = np.sqrt(p_wc[:, 0]**2 + p_wc[:, 1]**2)
+
+    # Drop frames whose wrist center the arm cannot reach before enumerating any branch
+    reachable = in_box & (self.reach.contains(r - a1, p_wc[:, 2]) |
+                          self.reach.contains(-r - a1, p_wc[:, 2]))
+    live = np.flatnonzero(reachable)
+    n_live = len(live)
+    if n_live == 0:
+      return np.zeros((n_frames, 0, 6)), np.zeros((n_frames, 0), dtype=bool)
+    R_target, p_wc, r, prev_q4 = R_target[live], p_wc[live], r[live], prev_q4[live]
+    wx, wy, wz = p_wc[:, 0], p_wc[:, 1], p_wc[:, 2]
+
+    # There are two possible q1 values due to the nature of atan2, so we calculate both and consider them as candidates
+    q1_base = np.arctan2(wy, wx)
+    q1_flip = q1_base + math.pi
+    q1_flip = np.where(q1_flip > math.pi, q1_flip - 2.0 * math.pi, q1_flip)
+
+    # Branch axes: q1 candidate, elbow sign, q5 sign -> (N, n_q1, 2, 2)
+    q1_turns = self._turn_offsets(0)
+    q1 = (np.stack([q1_base, q1_flip], axis=1)[:, None, :] +
+          q1_turns[None, :, None]).reshape(n_live, -1)
+    r_eff = np.broadcast_to(np.stack([r, -r], axis=1)[:, None, :],
+                            (n_live, len(q1_turns), 2)).reshape(n_live, -1)
+    valid = self._inside_limits(0, q1)
+
+    # Solve q3 using the cosine law for both elbow configurations
+    A_c = 2.0 * a2 * a3
+    B_c = -2.0 * a2 * d4
+    K   = (r_eff - a1)**2 + wz[:, None]**2 - (a2**2 + a3**2 + d4**2)
+    cos_arg = K / math.sqrt(A_c**2 + B_c**2)
+    valid &= np.abs(cos_arg) <= 1.0 + 1e-9
+    cos_arg = np.clip(cos_arg, -1.0, 1.0)
+
+    phi = math.atan2(B_c, A_c)
+    elbow_sign = np.array([1.0, -1.0])
+    q3 = (phi + elbow_sign * np.arccos(cos_arg)[..., None] + math.pi) % (2.0 * math.pi) - math.pi
+    valid = valid[..., None] & self._inside_limits(2, q3)
+
+    # Solve q2 from q3
+    c3 = np.cos(q3)
+    s3 = np.sin(q3)
+    P = a3 * c3 - d4 * s3 + a2
+    Q = a3 * s3 + d4 * c3
+    denom = P**2 + Q**2
+    valid &= denom >= 1e-10
+    denom = np.where(valid, denom, 1.0)
+    x_arm = (r_eff - a1)[..., None]
+    z_arm = wz[:, None, None]
+    s2 = (P * x_arm - Q * z_arm) / denom
+    c2 = (P * z_arm + Q * x_arm) / denom
+    valid &= np.abs(s2**2 + c2**2 - 1.0) <= 1e-4
+    q2 = np.arctan2(s2, c2)
+    valid &= self._inside_limits(1, q2)
+
+    # Build T_03 for every arm branch, and then compute R_36. From R_36, we can compute q4, q5, and q6.
+    q1 = np.broadcast_to(q1[..., None], q3.shape)
+    T_03 = self.arm_frame(q1, q2, q3)
+    R36 = np.swapaxes(T_03[..., :3, :3], -1, -2) @ R_target[:, None, None]
+
+    s5_abs = np.sqrt(R36[..., 0, 2]**2 + R36[..., 2, 2]**2)[..., None]
+    c5     = R36[..., 1, 2][..., None]
+
+    # Two possible q5 values due to the nature of atan2, so we calculate both and consider them as candidates
+    s5 = s5_abs * np.array([1.0, -1.0])
+    q5 = np.arctan2(s5, c5)
+    valid = valid[..., None] & self._inside_limits(4, q5)
+
+    singular = s5_abs < 1e-6
+    s5 = np.where(singular, 1.0, s5)
+    R36 = R36[..., None, :, :]
+    q4_base = np.arctan2(R36[..., 2, 2] / s5, -R36[..., 0, 2] / s5)
+    q6_base = np.arctan2(-R36[..., 1, 1] / s5, R36[..., 1, 0] / s5)
+
+    # At the wrist singularity only q4 + q6 (or q6 - q4) is defined, so keep the previous q4
+    q4_prev = np.broadcast_to(prev_q4[:, None, None, None], q5.shape)
+    q6_prev = np.where(c5 > 0,
+                       np.arctan2(-R36[..., 1, 1], R36[..., 1, 0]) - q4_prev,
+                       np.arctan2(R36[..., 1, 1], -R36[..., 1, 0]) + q4_prev)
+    q4_base = np.where(singular, q4_prev, q4_base)
+    q6_base = np.where(singular, q6_prev, q6_base)
+
+    # Keep only the arm/q5 branches that survived, then add integer multiples of 2*pi to q4 and q6
+    frame_idx, *branch_idx = np.nonzero(valid)
+    branch = (frame_idx, *branch_idx)
+    arm_branch = branch[:-1]
+    turns = np.arange(-3, 4) * 2.0 * math.pi
+    q4 = q4_base[branch][:, None, None] + turns[None, :, None]
+    q6 = q6_base[branch][:, None, None] + turns[None, None, :]
+    combos = self._inside_limits(3, q4) & self._inside_limits(5, q6)
+    cand_idx, q4_idx, q6_idx = np.nonzero(combos)
+
+    wrist = np.column_stack([q4[cand_idx, q4_idx, 0],
+                             q5[branch][cand_idx],
+                             q6[cand_idx, 0, q6_idx]])
+    arm = np.column_stack([q1[arm_branch][cand_idx],
+                           q2[arm_branch][cand_idx],
+                           q3[arm_branch][cand_idx]])
+    owner = live[frame_idx[cand_idx]]
+
+    # Verify all candidates at once against their shared T_03 prefixes
+    verified = self.verify_wrist_candidates(T_03[arm_branch][cand_idx], wrist,
+                                            frames[owner])
+    solutions = np.column_stack([arm, wrist])[verified]
+    owner = owner[verified]
+    if reject_collisions and len(solutions):
+      collides, _ = self.self_collision_batch(solutions)
+      solutions, owner = solutions[~collides], owner[~collides]
+
+    # Pack per-frame solutions (already in branch order) into a padded array
+    counts = np.bincount(owner, minlength=n_frames)
+    k_max = int(counts.max()) if n_frames else 0
+    slot = np.arange(len(owner)) - np.repeat(np.cumsum(counts) - counts, counts)
+    padded = np.zeros((n_frames, k_max, 6))
+    mask = np.zeros((n_frames, k_max), dtype=bool)
+    padded[owner, slot] = solutions
+    mask[owner, slot] = True
+    return padded, mask
+
+  def calculate_ik_all(self, ee_frame: np.ndarray,
+                       prev_joint_angles: np.ndarray = None,
+                       reject_collisions: bool = False) -> np.ndarray:
+    """Every valid analytic IK solution for one end effector frame
+
+    Stateless: the joints of the robot are not modified.
+
+    Args:
+        ee_frame (np.ndarray): The desired location of the end effector in space as a 4x4 frame
+        prev_joint_angles (np.ndarray, optional): previous joint angles, only used
+            to pick q4 at a wrist singularity. Defaults to q4 = 0.
+        reject_collisions (bool, optional): drop self-colliding solutions.
+            Defaults to False.
+
+    Returns:
+        np.ndarray: (K,6) array of solutions, K = 0 if the frame is unreachable
+    """
+    padded, mask = self.calculate_ik_all_batch(
+        np.asarray(ee_frame, dtype=float)[None], prev_joint_angles, reject_collisions)
+    return padded[0][mask[0]]
 
   def calculate_ik(self, ee_frame: np.ndarray,
-                    prev_joint_angles: np.ndarray) -> Tuple[bool, np.ndarray]:
+                    prev_joint_angles: np.ndarray,
+                    refine: bool = False) -> Tuple[bool, np.ndarray]:
     """calculate the inverse kinematics of the fanuc
     This is the hard part of the whole thing. If you get this working, it's all downhill.
     Be careful, the devil is in the details. Be sure to include all solution cases. 
@@ -244,163 +803,169 @@ class Fanuc(object):
     Args:
         ee_frame (np.ndarray): The desired location of the end effector in space as a 4x4 frame
         prev_joint_angles (np.ndarray): The previous joint angles (hint minimize the difference)
+        refine (bool, optional): if no analytic solution passes verification, try
+                                 refine_ik_batch warm-started from prev_joint_angles.
+                                 Defaults to False.
 
     Returns:
         Tuple[bool, np.ndarray]: bool -- whether or not a solutio exists
                                  np.ndarray -- the 6x1 array of that solution if it exists 
     """
-    # Check if the desired end effector frame is within the workspace
-    if not (self.workspace.x_min <= ee_frame[0,3] <= self.workspace.x_max and
-          self.workspace.y_min <= ee_frame[1,3] <= self.workspace.y_max and
-          self.workspace.z_min <= ee_frame[2,3] <= self.workspace.z_max):
+    solutions = self.calculate_ik_all(ee_frame, prev_joint_angles)
+    if len(solutions) == 0:
+      if refine:
+        converged, joint_angles = self.refine_ik_batch(
+            np.asarray(ee_frame, dtype=float)[None], prev_joint_angles)
+        if converged[0]:
+          return True, joint_angles[0]
       return False, []
 
-    R_target = ee_frame[:3, :3]
-    p_ee     = ee_frame[:3, 3]
+    # Pick the solution closest to the previous joint angles
+    dists = np.linalg.norm(solutions - np.asarray(prev_joint_angles, dtype=float), axis=1)
+    return True, solutions[int(np.argmin(dists))]
 
-    # DH parameters
-    a1, a2, a3, d4, d6 = self.a_1, self.a_2, self.a_3, self.l_4_z, self.l_6_z
 
-    p_wc = p_ee - d6 * R_target[:, 2]
-    wx, wy, wz = p_wc
+  def refine_ik_batch(self, ee_frames: np.ndarray, seeds: np.ndarray,
+                      iterations: int = 20, damping: float = 0.05,
+                      tolerance: float = 1e-3) -> Tuple[np.ndarray, np.ndarray]:
+    """Refine IK numerically with damped least squares, warm-started from seeds
 
-    q1_base = math.atan2(wy, wx)
+    Every row takes the step J^T (J J^T + damping^2 I)^-1 e from the batched
+    Jacobian, with the linear rows scaled by the arm reach so position and
+    rotation errors weigh alike, and is clamped back into the joint limits.
+    Rows stop updating once they are within tolerance. The damping keeps the
+    step bounded at singular wrists where the analytic solution is
+    ill-defined. The joints of the robot are not modified.
 
-    # There are two possible q1 values due to the nature of atan2, so we calculate both and consider them as candidates
-    q1_flip = q1_base + math.pi
-    if q1_flip > math.pi:
-      q1_flip -= 2.0 * math.pi
-
-    # Calculate the effective radius in the plane of the first three joints
-    r = math.sqrt(wx**2 + wy**2)
-    q1_candidates = []
-    seen_q1 = set()
-    for k in range(-3, 4):
-      for q1_seed, r_eff_seed in [(q1_base, r), (q1_flip, -r)]:
-        a = q1_seed + k * 2.0 * math.pi
-        key = round(a, 10)
-        if self.joints[0].low_limit <= a <= self.joints[0].high_limit and key not in seen_q1:
-          seen_q1.add(key)
-          q1_candidates.append((a, r_eff_seed))
-
-    solutions = []
-
-    # For each candidate q1, we solve for q2 and q3 using the geometric approach. Then we compute q4, q5, and q6 based on the orientation of the end effector.
-    for q1, r_eff in q1_candidates:
-      A_c = 2.0 * a2 * a3       
-      B_c = -2.0 * a2 * d4      
-      K   = (r_eff - a1)**2 + wz**2 - (a2**2 + a3**2 + d4**2)
-      R_arm = math.sqrt(A_c**2 + B_c**2)
-      cos_arg = K / R_arm
-      if abs(cos_arg) > 1.0 + 1e-9:
-        continue  
-      cos_arg = np.clip(cos_arg, -1.0, 1.0)
-
-      # Calculate q3 using the cosine law, and then calculate q2 based on q3.
-      phi = math.atan2(B_c, A_c)
-      for elbow_sign in [1, -1]: 
-        q3 = (phi + elbow_sign * math.acos(cos_arg) + math.pi) % (2.0 * math.pi) - math.pi
-        if not (self.joints[2].low_limit <= q3 <= self.joints[2].high_limit):
-          continue
-
-        c3 = math.cos(q3)
-        s3 = math.sin(q3)
-        P = a3 * c3 - d4 * s3 + a2   
-        Q = a3 * s3 + d4 * c3        
-        denom = P**2 + Q**2
-        if denom < 1e-10:
-          continue
-        s2 = (P * (r_eff - a1) - Q * wz) / denom
-        c2 = (P * wz           + Q * (r_eff - a1)) / denom
-        if abs(s2**2 + c2**2 - 1.0) > 1e-4:
-          continue
-        q2 = math.atan2(s2, c2)
-        if not (self.joints[1].low_limit <= q2 <= self.joints[1].high_limit):
-          continue
-        
-        # Build T_03 using the first three joints, and then compute R_36. From R_36, we can compute q4, q5, and q6.
-        T_tmp = np.eye(4)
-        for theta_i, idx in zip([q1, q2 - np.pi / 2, q3], [0, 1, 2]):
-          alpha_i = self.joints[idx]._alpha
-          a_i     = self.joints[idx]._a
-          d_i     = self.joints[idx]._d
-          ct, st  = math.cos(theta_i), math.sin(theta_i)
-          ca, sa  = math.cos(alpha_i), math.sin(alpha_i)
-          T_tmp   = T_tmp @ np.array([
-            [ct,    -st,    0,     a_i  ],
-            [st*ca, ct*ca, -sa,  -sa*d_i],
-            [st*sa, ct*sa,  ca,   ca*d_i],
-            [0,     0,      0,    1     ]
-          ])
-        R03 = T_tmp[:3, :3]
-        R36 = R03.T @ R_target
-
-        # Calculate q5 based on the elements of R36. Then calculate q4 and q6 based on q5 and the elements of R36.
-        s5_abs = math.sqrt(R36[0, 2]**2 + R36[2, 2]**2)
-        c5     = R36[1, 2]
-
-        # Two possible q5 values due to the nature of atan2, so we calculate both and consider them as candidates
-        for s5_sign in [1, -1]:   
-          s5 = s5_sign * s5_abs
-          q5 = math.atan2(s5, c5)
-          if not (self.joints[4].low_limit <= q5 <= self.joints[4].high_limit):
-            continue
-
-          if s5_abs < 1e-6:
-            q4_base = prev_joint_angles[3]
-            if c5 > 0:   
-              q6_base = math.atan2(-R36[1, 1], R36[1, 0]) - q4_base
-            else:        
-              q6_base = math.atan2(R36[1, 1], -R36[1, 0]) + q4_base
-          else:
-            q4_base = math.atan2( R36[2, 2] / s5, -R36[0, 2] / s5)
-            q6_base = math.atan2(-R36[1, 1] / s5,  R36[1, 0] / s5)
-
-          # Collect all candidate solutions for q4 and q6 by adding integer multiples of 2*pi to the base solutions, and checking if they are within joint limits.
-          q4_list = []
-          for k in range(-3, 4):
-            a = q4_base + k * 2.0 * math.pi
-            if self.joints[3].low_limit <= a <= self.joints[3].high_limit:
-              q4_list.append(a)
-          q6_list = []
-          for k in range(-3, 4):
-            a = q6_base + k * 2.0 * math.pi
-            if self.joints[5].low_limit <= a <= self.joints[5].high_limit:
-              q6_list.append(a)
-          # Combine the candidate q4 and q6 values with the previously calculated q1, q2, and q3 to form complete candidate solutions for the joint angles.
-          for q4 in q4_list:
-            for q6 in q6_list:
-              solutions.append(np.array([q1, q2, q3, q4, q5, q6]))
-
-    if not solutions:
-      return False, []
+    Args:
+        ee_frames (np.ndarray): (N,4,4) desired end effector frames
+        seeds (np.ndarray): (6,) or (N,6) starting joint angles, e.g. an
+                            analytic solution or the previous sample
+        iterations (int, optional): max number of steps. Defaults to 20.
+        damping (float, optional): damping factor. Defaults to 0.05.
+        tolerance (float, optional): max position (mm) and rotation (rad)
+                                     error. Defaults to 1e-3.
 
-    best_sol  = None
-    best_dist = float('inf')
-    for sol in solutions:
-      try:
-        T_check = self.calculate_fk(sol)
-      except ValueError:
-        continue
-      pos_err = np.linalg.norm(ee_frame[:3, 3] - T_check[:3, 3])
-      R_err   = ee_frame[:3, :3] @ T_check[:3, :3].T
-      rot_err = np.linalg.norm(0.5 * np.array([
-          R_err[2, 1] - R_err[1, 2],
-          R_err[0, 2] - R_err[2, 0],
-          R_err[1, 0] - R_err[0, 1],
-      ]))
-      if pos_err > 1e-3 or rot_err > 1e-3:
-        continue
-      dist = np.linalg.norm(sol - prev_joint_angles)
-      if dist < best_dist:
-        best_dist = dist
-        best_sol  = sol
-
-    if best_sol is None:
-      return False, []
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (N,) bool converged per frame, and the
+                                       (N,6) refined joint angles
+    """
+    frames = np.asarray(ee_frames, dtype=float).reshape(-1, 4, 4)
+    low = np.array([joint.low_limit for joint in self.joints])
+    high = np.array([joint.high_limit for joint in self.joints])
+    q = np.clip(np.broadcast_to(np.asarray(seeds, dtype=float), (len(frames), 6)),
+                low, high)
+    length_scale = self.a_2 + math.hypot(self.a_3, self.l_4_z)
+
+    converged = np.zeros(len(frames), dtype=bool)
+    active = np.arange(len(frames))
+    for step in range(iterations + 1):
+      T = self.calculate_fk_batch(q[active])
+      pos_err = frames[active, :3, 3] - T[:, :3, 3]
+      R_err = frames[active, :3, :3] @ np.swapaxes(T[:, :3, :3], 1, 2)
+      rot_err = 0.5 * np.stack([R_err[:, 2, 1] - R_err[:, 1, 2],
+                                R_err[:, 0, 2] - R_err[:, 2, 0],
+                                R_err[:, 1, 0] - R_err[:, 0, 1]], axis=1)
+
+      # The skew part only steers the step, it vanishes for a 180 deg error
+      position_distance, rotation_angle = se3.pose_distance(frames[active], T)
+      done = (position_distance <= tolerance) & (rotation_angle <= tolerance)
+      converged[active[done]] = True
+      active, pos_err, rot_err = active[~done], pos_err[~done], rot_err[~done]
+      if len(active) == 0 or step == iterations:
+        break
+
+      jacobian = self.calculate_jacobian_batch(q[active])
+      jacobian[:, :3, :] /= length_scale
+      error = np.concatenate([pos_err / length_scale, rot_err], axis=1)
+      JJt = jacobian @ np.swapaxes(jacobian, 1, 2) + damping**2 * np.eye(6)
+      dq = np.swapaxes(jacobian, 1, 2) @ np.linalg.solve(JJt, error[..., None])
+      q[active] = np.clip(q[active] + dq[..., 0], low, high)
+
+    return converged, q
+
+  def calculate_cartesian_path(
+      self, start_frame: np.ndarray, end_frame: np.ndarray,
+      prev_joint_angles: np.ndarray, speed: float, sample_period: float,
+      angular_speed: float = math.radians(80), refine: bool = False,
+      max_joint_speed: float = math.radians(80),
+      max_joint_step: float = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Joint angles moving the end effector straight from one frame to another
+
+    The end effector position moves along the line at speed and the rotation
+    follows the SLERP arc at no more than angular_speed, sampled every
+    sample_period seconds (se3.interpolate). The start frame
+    itself is not included, the end frame is the last sample. A sample whose
+    joints move more than max_joint_step from the sample before it (a wrist
+    flip onto another IK branch, or a move faster than the joints allow)
+    counts as failed.
 
-    return True, best_sol
+    Args:
+        start_frame (np.ndarray): (4,4) current end effector frame
+        end_frame (np.ndarray): (4,4) desired end effector frame
+        prev_joint_angles (np.ndarray): (6,) joint angles at start_frame
+        speed (float): Cartesian speed of the end effector in mm/s
+        sample_period (float): time between samples in s
+        angular_speed (float, optional): max rotation rate in rad/s.
+                                         Defaults to 80 deg/s.
+        refine (bool, optional): retry samples without an analytic solution
+                                 with refine_ik_batch. Defaults to False.
+        max_joint_speed (float, optional): joint rate limit in rad/s used for
+                                           the default max_joint_step.
+                                           Defaults to 80 deg/s.
+        max_joint_step (float, optional): largest joint change in rad allowed
+                                          between samples. Defaults to
+                                          max_joint_speed * sample_period,
+                                          4 deg at 80 deg/s and 0.05 s.
 
+    Raises:
+        ValueError: if a speed, the sample period or max_joint_step is not
+                    positive
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (M,) bool success per sample, and the
+                                       (M,6) joint angles. A failed sample
+                                       holds the previous joint angles.
+    """
+    if speed <= 0 or angular_speed <= 0 or max_joint_speed <= 0:
+      raise ValueError("speed, angular_speed and max_joint_speed must be positive")
+    if sample_period <= 0:
+      raise ValueError("sample_period must be positive")
+    if max_joint_step is None:
+      max_joint_step = max_joint_speed * sample_period
+    elif max_joint_step <= 0:
+      raise ValueError("max_joint_step must be positive")
+
+    distance = np.linalg.norm(end_frame[:3, 3] - start_frame[:3, 3])
+    angle = np.linalg.norm(se3.so3_log(start_frame[:3, :3].T @ end_frame[:3, :3]))
+    n_samples = max(1, int(math.ceil(max(distance / (speed * sample_period),
+                                         angle / (angular_speed * sample_period)))))
+    frames = se3.interpolate(start_frame, end_frame, np.arange(1, n_samples + 1) / n_samples)
+
+    success = np.zeros(n_samples, dtype=bool)
+    path = np.zeros((n_samples, 6))
+    prev = np.asarray(prev_joint_angles, dtype=float)
+
+    # Enumerate every sample at once, then chain the closest solution to the previous sample
+    padded, mask = self.calculate_ik_all_batch(frames, prev)
+    for index in range(n_samples):
+      solutions = padded[index][mask[index]]
+      if len(solutions):
+        prev = solutions[int(np.argmin(np.linalg.norm(solutions - prev, axis=1)))]
+        success[index] = True
+      path[index] = prev
+
+    # Refine every failed sample together, warm-started from the sample before it
+    if refine and not success.all():
+      failed = np.flatnonzero(~success)
+      converged, refined = self.refine_ik_batch(frames[failed], path[failed])
+      path[failed[converged]] = refined[converged]
+      success[failed] = converged
+
+    # Reject samples that jump onto another branch instead of moving smoothly
+    previous = np.vstack([np.asarray(prev_joint_angles, dtype=float)[None], path[:-1]])
+    success &= np.abs(path - previous).max(axis=1) <= max_joint_step
+    return success, path
 
   def _create_plot(self):
     """Initialize the plot to use throughout
@@ -442,18 +1007,21 @@ class Fanuc(object):
       self.initialize_fanuc_drawing(joint_angles)
       self._drawn_once = True
 
-    self._base_frame.draw()
-    self._zero_frame.draw()
+    if self._robot_drawing is not None:
+      current_transform = self._draw_robot_collection()
+    else:
+      self._base_frame.draw()
+      self._zero_frame.draw()
 
-    current_transform = self._base_frame.dh_transform
+      current_transform = self._base_frame.dh_transform
 
-    for index, joint in enumerate(self.joints):
-      prev_transform = current_transform
-      current_transform = current_transform @ joint.dh_transform
-      joint.set_final_transform(current_transform)
-      joint.draw()
-      self._links[index].update_frames(prev_transform, current_transform)
-      self._links[index].draw()
+      for index, joint in enumerate(self.joints):
+        prev_transform = current_transform
+        current_transform = current_transform @ joint.dh_transform
+        joint.set_final_transform(current_transform)
+        joint.draw()
+        self._links[index].update_frames(prev_transform, current_transform)
+        self._links[index].draw()
 
     # draw the brush at the end
     self.brush.update_tool_frame(current_transform)
@@ -461,3 +1029,20 @@ class Fanuc(object):
     self.brush.paint()
 
     plt.pause(0.0001)
+
+  def _draw_robot_collection(self) -> np.ndarray:
+    """Draw the frames and links through the single RobotDrawing collection
+
+    Returns:
+        np.ndarray: (4,4) end effector frame including the base offset
+    """
+    base = self._base_frame.dh_transform
+    joint_frames = base @ np.array(self._chain.frames)
+    for joint, frame in zip(self.joints, joint_frames):
+      joint.set_final_transform(frame)
+
+    link_frames = np.concatenate([base[None], joint_frames])
+    self._robot_drawing.update_frames(
+        np.concatenate([base[None], np.eye(4)[None], joint_frames]), link_frames)
+    self._robot_drawing.draw()
+    return joint_frames[-1]
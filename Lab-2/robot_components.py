@@ -1,9 +1,11 @@
 import numpy as np
 import math
+from typing import List
 from mpl_toolkits.mplot3d import Axes3D
 
 import general_utility as general
-from drawing_helper import FrameDrawing, LinkDrawing
+import se3
+from drawing_helper import FrameDrawing, LinkDrawing, PaintDrawing
 
 class Brush(object):
   """Class holding the data for a brush object"""
@@ -29,6 +31,8 @@ class Brush(object):
           "Selected a brush color outside of the range [0, {}]".format(
               len(self._colors)))
     self._selection = selection
+    if selection != 0:
+      self._previously_selected_brush_frame = selection
 
   @property
   def color(self):
@@ -44,7 +48,7 @@ class Brush(object):
     if self._selection == 0:
       return np.eye(4)
     else:
-      return self._brush_frames[self._selection - 1]
+      return self._brush_frame(self._selection - 1)
 
   @property
   def selected_brush_frame_dh(self):
@@ -59,11 +63,7 @@ class Brush(object):
     Returns:
         np.ndarray: The DH parameters of the selected brush as a (4,4)
     """
-    if self._selection == 0:
-      return self._tool_relative_frames[self._previously_selected_brush_frame]
-    else:
-      self._previously_selected_brush_frame = self._selection
-      return self._tool_relative_frames[self._selection - 1]
+    return self._tool_relative_frames[self._tool_indices()[0]]
 
   @property
   def selected_color(self):
@@ -99,49 +99,54 @@ class Brush(object):
 
     self._tool_relative_frames = []
     self._create_tool_relative_frames()
+    # The offsets never change, so stack them and their inverses once
+    self._tool_offsets = np.array(self._tool_relative_frames)
+    self._tool_inverse_offsets = se3.inverse(self._tool_offsets)
+
+    # Brush frames in space, only recomputed when read after the tool moved
     self._brush_frames = [np.eye(4) for _ in range(4)]
+    self._stale_brush_frames = [False for _ in range(4)]
 
     if self._drawing_enabled:
       self._tool_lines = [LinkDrawing(self._ax, color) for color in self._colors]
     else:
       self._tool_lines = [None for _ in self._colors]
 
+    # One accumulating paint artist per brush selection, created on first use
+    self._paint_drawings = {}
+
   def _create_tool_relative_frames(self):
     """Create the relative tool frames"""
-    self._tool_relative_frames.append(
-        self._make_tool_frame([0, -math.pi / 4, 5 * math.pi / 4],
-                              [-self.l_t_rad, 0, self.l_t]))
-    self._tool_relative_frames.append(
-        self._make_tool_frame([0, -math.pi / 4, 7 * math.pi / 4],
-                              [-self.l_t_rad, 0, self.l_t]))
-    self._tool_relative_frames.append(
-        self._make_tool_frame([0, -math.pi / 4, math.pi / 4],
-                              [-self.l_t_rad, 0, self.l_t]))
-    self._tool_relative_frames.append(
-        self._make_tool_frame([0, -math.pi / 4, 3 * math.pi / 4],
-                              [-self.l_t_rad, 0, self.l_t]))
+    yaws = np.array([5, 7, 1, 3]) * math.pi / 4
+    rotations = np.column_stack([np.zeros(4), np.full(4, -math.pi / 4), yaws])
+    self._tool_relative_frames.extend(
+        self._make_tool_frame(rotations, [-self.l_t_rad, 0, self.l_t]))
 
   def _make_tool_frame(self, rotation: np.ndarray,
                        translation: np.ndarray) -> np.ndarray:
     """Make a tool frame to show up how we want in space w.r.t the EE 
 
+    The frame is yawT(z) @ trans_x @ pitchT(y) @ trans_z, written directly:
+    the rotation is a ZYX transform without roll, and the origin is the x
+    offset along the yawed x axis plus the z offset along the final z axis.
+
     Args:
-        rotation (np.ndarray): Rotation of the tool as rotations around X, Y, Z 
-        translation (np.ndarray): Translation of the tool in X, Y, Z
+        rotation (np.ndarray): (3,) or (N,3) rotation of the tool as rotations around X, Y, Z 
+        translation (np.ndarray): (3,) or (N,3) translation of the tool in X, Y, Z
 
     Returns:
-        np.ndarray: (4,4) array of the final transformation
+        np.ndarray: (4,4) or (N,4,4) array of the final transformation
     """
-    tool_frame = np.eye(4) 
-    trans_x = np.eye(4) 
-    trans_x[0,3] = translation[0]
-    trans_z = np.eye(4)
-    trans_z[2,3] = translation[2]
+    rotation = np.array(rotation, dtype=float)
+    translation = np.asarray(translation, dtype=float)
+    rotation[..., 0] = 0.0
+    tool_frame = general.zyxT(rotation)
 
-    tool_frame = tool_frame @ general.yawT(rotation[2])
-    tool_frame = tool_frame @ trans_x 
-    tool_frame = tool_frame @ general.pitchT(rotation[1])
-    tool_frame = tool_frame @ trans_z
+    yaw = rotation[..., 2]
+    trans_x = translation[..., 0, None]
+    trans_z = translation[..., 2, None]
+    tool_frame[..., :2, 3] = trans_x * np.stack([np.cos(yaw), np.sin(yaw)], axis=-1)
+    tool_frame[..., :3, 3] += trans_z * tool_frame[..., :3, 2]
 
     return tool_frame
 
@@ -154,7 +159,77 @@ class Brush(object):
     general.check_proper_numpy_format(frame, (4, 4))
 
     self._tool_base_frame = frame
-    self._update_tool_frames()
+    self._stale_brush_frames = [True for _ in self._tool_relative_frames]
+
+  def _brush_frame(self, index: int) -> np.ndarray:
+    """Frame of one brush tip in space, computed on first use after a tool update
+
+    Args:
+        index (int): brush index, i.e. selection - 1
+
+    Returns:
+        np.ndarray: (4,4) brush tip frame
+    """
+    if self._stale_brush_frames[index]:
+      self._brush_frames[index] = self._tool_base_frame @ self._tool_relative_frames[index]
+      self._stale_brush_frames[index] = False
+    return self._brush_frames[index]
+
+  def _tool_indices(self, brush=None) -> np.ndarray:
+    """Tool offset index for each requested brush selection
+
+    A selection of 0 (no brush) maps to the last brush before it in the
+    batch, or to the previously selected brush, like selected_brush_frame_dh.
+    Nothing is stored, so planning over a path leaves the selection state
+    alone.
+
+    Args:
+        brush (int or np.ndarray, optional): selection or (N,) selections.
+            Defaults to the current selection.
+
+    Raises:
+        ValueError: a selection is outside of [0, number of brushes]
+
+    Returns:
+        np.ndarray: (N,) indices into the tool offsets
+    """
+    selections = np.atleast_1d(self._selection if brush is None else brush).astype(int)
+    if selections.min() < 0 or selections.max() > len(self._tool_relative_frames):
+      raise ValueError("Selected a brush outside of the range [0, {}]".format(
+          len(self._tool_relative_frames)))
+
+    # Fill every 0 with the last non zero selection before it
+    last_brush = np.where(selections != 0, np.arange(len(selections)), -1)
+    np.maximum.accumulate(last_brush, out=last_brush)
+    selections = np.where(last_brush >= 0, selections[last_brush],
+                          self._previously_selected_brush_frame)
+    return selections - 1
+
+  def brush_tip_frames(self, ee_frames: np.ndarray, brush=None) -> np.ndarray:
+    """Batched brush tip frames for end effector frames
+
+    Args:
+        ee_frames (np.ndarray): (N,4,4) end effector frames
+        brush (int or np.ndarray, optional): selection or (N,) selections,
+            0 meaning the previous brush. Defaults to the current selection.
+
+    Returns:
+        np.ndarray: (N,4,4) brush tip frames
+    """
+    return ee_frames @ self._tool_offsets[self._tool_indices(brush)]
+
+  def ee_frames_from_brush(self, brush_frames: np.ndarray, brush=None) -> np.ndarray:
+    """Batched end effector frames that put the brush tip at brush_frames
+
+    Args:
+        brush_frames (np.ndarray): (N,4,4) desired brush tip frames
+        brush (int or np.ndarray, optional): selection or (N,) selections,
+            0 meaning the previous brush. Defaults to the current selection.
+
+    Returns:
+        np.ndarray: (N,4,4) end effector frames
+    """
+    return brush_frames @ self._tool_inverse_offsets[self._tool_indices(brush)]
 
   def _update_tool_frames(self, enable_all: bool = False):
     """Internal update of all of the tool frames to draw the correct ones
@@ -162,23 +237,14 @@ class Brush(object):
     Args:
         enable_all (bool, optional): True if you want to draw all brushes at once. Defaults to False.
     """
+    if not self._drawing_enabled:
+      return
 
-    for index, frame in enumerate(self._tool_relative_frames):
-      new_frame = self._tool_base_frame @ frame
-
-      self._brush_frames[index] = new_frame
-
-      if self._drawing_enabled and self._tool_lines[index] is not None:
-        if enable_all:
-          self._tool_lines[index].update_frames(self._tool_base_frame,
-                                                self._brush_frames[index])
-        elif not enable_all and np.allclose(self.selected_brush_frame,
-                                            self._brush_frames[index]):
-          self._tool_lines[index].update_frames(self._tool_base_frame,
-                                                self._brush_frames[index])
-        else:
-          self._tool_lines[index].update_frames(self._tool_base_frame,
-                                                self._tool_base_frame)
+    for index, tool_line in enumerate(self._tool_lines):
+      if enable_all or index == self._selection - 1:
+        tool_line.update_frames(self._tool_base_frame, self._brush_frame(index))
+      else:
+        tool_line.update_frames(self._tool_base_frame, self._tool_base_frame)
 
   def _draw(self, enable_all: bool = False):
     """Internal method to handle the different ways of drawing depending on enabled brushes
@@ -219,16 +285,40 @@ class Brush(object):
     self._draw(enable_all=True)
 
     if self._selection != 0:
-      self._ax.plot([self.selected_brush_frame[0, 3]],
-                    [self.selected_brush_frame[1, 3]],
-                    [self.selected_brush_frame[2, 3]],
-                    ".b",
-                    color=self.selected_color,
-                    markersize=10)
+      paint_drawing = self._selected_paint_drawing()
+      paint_drawing.append(self.selected_brush_frame[:3, 3])
+      paint_drawing.redraw()
+
+  def paint_at(self, points: np.ndarray):
+    """Leave paint spots of the selected color without moving the brush
+
+    Used for poses a real time playback skips, so their strokes still show.
+
+    Args:
+        points (np.ndarray): (N,3) spot locations
+    """
+    if not self._drawing_enabled or self._selection == 0 or len(points) == 0:
+      return
+    paint_drawing = self._selected_paint_drawing()
+    for point in points:
+      paint_drawing.append(point)
+    paint_drawing.redraw()
+
+  def _selected_paint_drawing(self) -> PaintDrawing:
+    """PaintDrawing of the selected color, created on first use"""
+    paint_drawing = self._paint_drawings.get(self._selection)
+    if paint_drawing is None:
+      paint_drawing = PaintDrawing(self._ax, self.selected_color, markersize=10)
+      paint_drawing.draw()
+      self._paint_drawings[self._selection] = paint_drawing
+    return paint_drawing
 
 
 class Link(object):
   """Class to hold information about and for a link"""
+  __slots__ = ("_frame_1", "_frame_2", "_drawing_enabled", "_link_drawings",
+               "_drawn_once")
+
   def __init__(self, ax: Axes3D, color=None, drawing_enabled: bool = True):
     """Create a Link 
     Links contain LinkDrawings and act a pass through and information holders
@@ -279,9 +369,14 @@ class Link(object):
 
 class Joint(object):
   """Hold the definition and information for each joint"""
+  __slots__ = ("_joint_limit", "_drawn_once", "_dh_transform", "_dh_buffer",
+               "_dh_view", "_dh_constants_stale", "_final_transform", "_color", "_a",
+               "_alpha", "_c_alpha", "_s_alpha", "_d", "_theta", "_revision",
+               "_drawing_enabled", "_frame_drawing")
 
   @staticmethod
-  def dh_tf(alpha: float, a: float, d: float, theta: float) -> np.ndarray:
+  def dh_tf(alpha: float, a: float, d: float, theta: float,
+            out: np.ndarray = None) -> np.ndarray:
     """Create a DH transform using alpha, a, d, and theta
 
     Args:
@@ -289,19 +384,80 @@ class Joint(object):
         a (float): a in mm
         d (float): d in mm
         theta (float): theta in radians
+        out (np.ndarray, optional): (4,4) array to write the transform into
+                                    instead of allocating one. Defaults to None.
 
     Returns:
         np.ndarray: (4,4) numpy array of the transformation matrix
     """
+    T = np.empty((4, 4)) if out is None else out
+    c_alpha = math.cos(alpha)
+    s_alpha = math.sin(alpha)
+    Joint._write_dh_constants(T, c_alpha, s_alpha, a, d)
+    Joint._write_dh_theta(T, c_alpha, s_alpha, theta)
+    return T
+
+  @staticmethod
+  def _write_dh_constants(T: np.ndarray, c_alpha: float, s_alpha: float,
+                          a: float, d: float) -> None:
+    """Write the theta independent entries of a DH transform in place"""
+    T[0, 2] = 0.0
+    T[0, 3] = a
+    T[1, 2] = -s_alpha
+    T[1, 3] = -s_alpha * d
+    T[2, 2] = c_alpha
+    T[2, 3] = c_alpha * d
+    T[3, 0] = 0.0
+    T[3, 1] = 0.0
+    T[3, 2] = 0.0
+    T[3, 3] = 1.0
+
+  @staticmethod
+  def _write_dh_theta(T: np.ndarray, c_alpha: float, s_alpha: float,
+                      theta: float) -> None:
+    """Write the theta dependent entries of a DH transform in place"""
     c_theta = math.cos(theta)
     s_theta = math.sin(theta)
+    T[0, 0] = c_theta
+    T[0, 1] = -s_theta
+    T[1, 0] = s_theta * c_alpha
+    T[1, 1] = c_theta * c_alpha
+    T[2, 0] = s_theta * s_alpha
+    T[2, 1] = c_theta * s_alpha
+
+  @staticmethod
+  def dh_tf_batch(alpha: float, a: float, d: float,
+                  theta: np.ndarray) -> np.ndarray:
+    """Create a stack of DH transforms sharing alpha, a and d
+
+    Args:
+        alpha (float): alpha angle in radians
+        a (float): a in mm
+        d (float): d in mm
+        theta (np.ndarray): (...) array of theta values in radians
+
+    Returns:
+        np.ndarray: (...,4,4) numpy array of the transformation matrices
+    """
+    theta = np.asarray(theta, dtype=float)
+    c_theta = np.cos(theta)
+    s_theta = np.sin(theta)
     c_alpha = math.cos(alpha)
     s_alpha = math.sin(alpha)
 
-    T = np.array([[c_theta, -s_theta, 0, a],
-                  [s_theta * c_alpha, c_theta * c_alpha, -s_alpha, -s_alpha * d],
-                  [s_theta * s_alpha, c_theta * s_alpha, c_alpha, c_alpha * d],
-                  [0, 0, 0, 1]])
+    T = np.zeros(theta.shape + (4, 4))
+    T[..., 0, 0] = c_theta
+    T[..., 0, 1] = -s_theta
+    T[..., 0, 3] = a
+    T[..., 1, 0] = s_theta * c_alpha
+    T[..., 1, 1] = c_theta * c_alpha
+    T[..., 1, 2] = -s_alpha
+    T[..., 1, 3] = -s_alpha * d
+    T[..., 2, 0] = s_theta * s_alpha
+    T[..., 2, 1] = c_theta * s_alpha
+    T[..., 2, 2] = c_alpha
+    T[..., 2, 3] = c_alpha * d
+    T[..., 3, 3] = 1.0
 
     return T
 
@@ -327,6 +483,9 @@ class Joint(object):
   def dh_transform(self):
     """Return the joints dh_transform
 
+    After set_theta this is a read-only view of a buffer the joint rewrites
+    in place, so it changes with the joint. Copy it to keep a snapshot.
+
     Returns:
         np.ndarray: (4,4) array of the DH transform of the joint
     """
@@ -341,6 +500,15 @@ class Joint(object):
     """
     return self._final_transform
 
+  @property
+  def revision(self) -> int:
+    """Counter bumped every time the DH transform changes
+
+    Returns:
+        int: number of DH transform updates so far
+    """
+    return self._revision
+
   def __init__(self, ax: Axes3D, color=None, drawing_enabled: bool = True):
     """Initialize the joint
 
@@ -351,12 +519,19 @@ class Joint(object):
     self._joint_limit = [0, 0]
     self._drawn_once = False
     self._dh_transform = np.eye(4)
+    self._dh_buffer = np.eye(4)
+    self._dh_view = self._dh_buffer.view()
+    self._dh_view.flags.writeable = False
+    self._dh_constants_stale = True
     self._final_transform = np.eye(4)
     self._color = color
     self._a = 0.0
     self._alpha = 0.0
+    self._c_alpha = 1.0
+    self._s_alpha = 0.0
     self._d = 0.0
     self._theta = 0.0
+    self._revision = 0
     self._drawing_enabled = drawing_enabled
     if self._drawing_enabled: 
       self._frame_drawing = FrameDrawing(ax, color)
@@ -379,6 +554,7 @@ class Joint(object):
         value (float): value of the a parameter for the dh table (in mm) 
     """
     self._a = value 
+    self._dh_constants_stale = True
 
   def set_dh_value_alpha(self, value: float) -> None: 
     """Set the alpha value for the DH parameters of the joint 
@@ -387,6 +563,9 @@ class Joint(object):
         value (float): value of alpha in radians
     """
     self._alpha = value 
+    self._c_alpha = math.cos(value)
+    self._s_alpha = math.sin(value)
+    self._dh_constants_stale = True
 
   def set_dh_value_d(self, value: float) -> None: 
     """Set the d value for the DH parameters of the joint
@@ -395,6 +574,24 @@ class Joint(object):
         value (float): Value to store for d (in mm) 
     """
     self._d = value 
+    self._dh_constants_stale = True
+
+  def set_dh_parameters(self, a: float, alpha: float, d: float) -> None:
+    """Set all fixed DH parameters at once, e.g. after calibration
+
+    Unlike the set_dh_value_* calls used during setup, the transform is
+    rebuilt at the current theta right away and revision is bumped, so
+    cached chains and robots that skip unchanged angles see the new values.
+
+    Args:
+        a (float): link length (mm)
+        alpha (float): link twist (rad)
+        d (float): link offset (mm)
+    """
+    self.set_dh_value_a(a)
+    self.set_dh_value_alpha(alpha)
+    self.set_dh_value_d(d)
+    self.update_dh_transform()
 
   def set_theta(self, value: float) -> None: 
     """Set the current value of theta for the joint
@@ -406,8 +603,20 @@ class Joint(object):
     self.update_dh_transform()
 
   def update_dh_transform(self) -> None:
-    """Update the DH transform using the stored DH parameters"""
-    self._dh_transform = Joint.dh_tf(self._alpha, self._a, self._d, self._theta)
+    """Update the DH transform using the stored DH parameters
+
+    The transform is written in place into a buffer owned by the joint, and
+    the entries that only depend on alpha, a and d are rewritten only after
+    one of them changes. Consumers see the change through revision, and
+    dh_transform hands out a read-only view of the buffer.
+    """
+    T = self._dh_buffer
+    if self._dh_constants_stale:
+      Joint._write_dh_constants(T, self._c_alpha, self._s_alpha, self._a, self._d)
+      self._dh_constants_stale = False
+    Joint._write_dh_theta(T, self._c_alpha, self._s_alpha, self._theta)
+    self._dh_transform = self._dh_view
+    self._revision += 1
 
     if self._drawing_enabled and self._frame_drawing is not None:
       self._update_drawing()
@@ -420,6 +629,7 @@ class Joint(object):
     """
     general.check_proper_numpy_format(transform, (4, 4))
     self._dh_transform = transform
+    self._revision += 1
 
     if self._drawing_enabled and self._frame_drawing is not None: 
       self._update_drawing()
@@ -472,3 +682,75 @@ class Joint(object):
       return False
     else:
       return True
+
+
+class FrameChain(object):
+  """Cached cumulative transforms of a serial chain of joints
+
+  The products T_01, T_02, ... T_0n are rebuilt only when one of the joints
+  reports a new revision (set_theta, pos or set_dh_transform), and only from
+  the first changed joint onward; the prefix products before it are reused.
+  Reading the end effector frame several times per step then costs a revision
+  check instead of a chain of matrix products.
+  """
+
+  def __init__(self, joints: List[Joint]):
+    """Create the chain
+
+    Args:
+        joints (List[Joint]): joints in order from the base to the end effector
+    """
+    self._joints = list(joints)
+    self._revisions = None
+    self._frames = []
+
+  @property
+  def frames(self) -> List[np.ndarray]:
+    """Cumulative frames of every joint, shared with the cache
+
+    Returns:
+        List[np.ndarray]: (4,4) frames T_01 ... T_0n. Do not modify in place.
+    """
+    revisions = [joint.revision for joint in self._joints]
+    if revisions != self._revisions:
+      self._rebuild(self._first_changed(revisions))
+      self._revisions = revisions
+    return self._frames
+
+  @property
+  def ee_frame(self) -> np.ndarray:
+    """Final frame of the chain, shared with the cache
+
+    Returns:
+        np.ndarray: (4,4) frame T_0n. Do not modify in place.
+    """
+    return self.frames[-1]
+
+  def _first_changed(self, revisions: List[int]) -> int:
+    """Index of the first joint whose revision differs from the cached one
+
+    Args:
+        revisions (List[int]): current revision of every joint
+
+    Returns:
+        int: index of the first changed joint, 0 if nothing is cached yet
+    """
+    if self._revisions is None:
+      return 0
+    for index, (new, old) in enumerate(zip(revisions, self._revisions)):
+      if new != old:
+        return index
+    return len(revisions)
+
+  def _rebuild(self, start: int = 0) -> None:
+    """Multiply the joint DH transforms out, reusing the prefix before start
+
+    Args:
+        start (int, optional): first joint to recompute. Defaults to 0.
+    """
+    frames = self._frames[:start]
+    current = frames[-1] if frames else np.eye(4)
+    for joint in self._joints[start:]:
+      current = current @ joint.dh_transform
+      frames.append(current)
+    self._frames = frames
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""Differential benchmark of the compiled and the pure Python Fanuc IK.
+
+Both solvers get the same random reachable frames (batched FK of random joint
+angles inside the limits) and the same seeds (those joint angles plus noise).
+Reports throughput, latency percentiles, and every frame where the solvers
+disagree on whether a solution exists or on the solution they pick.
+
+Run from this folder:
+    python benchmark_ik.py
+    python benchmark_ik.py --samples 20000 --seed 3 --tolerance 1e-4
+"""
+import argparse
+import importlib.util
+import os
+import time
+from typing import Callable, List, Tuple
+
+import numpy as np
+
+import se3
+from fanuc_provided import Fanuc
+
+LAB_2_FANUC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..",
+                           "Lab-2", "fanuc.py")
+
+
+def load_python_fanuc() -> Fanuc:
+  """Load the pure Python Lab 2 Fanuc without drawing
+
+  Lab 2 and Lab 3 share identical robot_components and general_utility, so
+  the Lab 2 module resolves its imports from this folder.
+
+  Returns:
+      Fanuc: the Lab 2 Fanuc model
+  """
+  spec = importlib.util.spec_from_file_location("fanuc_python", LAB_2_FANUC)
+  module = importlib.util.module_from_spec(spec)
+  spec.loader.exec_module(module)
+  return module.Fanuc(drawing_enabled=False)
+
+
+def make_cases(robot: Fanuc, n_samples: int, seed_noise: float,
+               rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+  """Random reachable frames and nearby seeds
+
+  Args:
+      robot (Fanuc): model used for the batched FK
+      n_samples (int): number of frames
+      seed_noise (float): std dev in rad of the noise added to the seeds
+      rng (np.random.Generator): random generator
+
+  Returns:
+      Tuple[np.ndarray, np.ndarray, np.ndarray]: (N,6) joint angles used to
+          make the frames, (N,4,4) frames, (N,6) seeds
+  """
+  low = np.array([joint.low_limit for joint in robot.joints])
+  high = np.array([joint.high_limit for joint in robot.joints])
+  joint_angles = rng.uniform(low, high, (n_samples, 6))
+  frames = robot.calculate_fk_batch(joint_angles)
+  seeds = np.clip(joint_angles + rng.normal(0.0, seed_noise, joint_angles.shape),
+                  low, high)
+  return joint_angles, frames, seeds
+
+
+def run_solver(solve: Callable, frames: np.ndarray,
+               seeds: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+  """Time a calculate_ik style function on every frame
+
+  Args:
+      solve (Callable): (frame, seed) -> (bool, joint angles)
+      frames (np.ndarray): (N,4,4) target frames
+      seeds (np.ndarray): (N,6) previous joint angles
+
+  Returns:
+      Tuple[np.ndarray, np.ndarray, np.ndarray]: (N,) bool solved, (N,6)
+          solutions (nan where unsolved), (N,) latency in seconds
+  """
+  solved = np.zeros(len(frames), dtype=bool)
+  solutions = np.full((len(frames), 6), np.nan)
+  latency = np.zeros(len(frames))
+  for index, (frame, seed) in enumerate(zip(frames, seeds)):
+    start = time.perf_counter()
+    success, joint_angles = solve(frame, seed)
+    latency[index] = time.perf_counter() - start
+    if success:
+      solved[index] = True
+      solutions[index] = joint_angles
+  return solved, solutions, latency
+
+
+def check_solutions(robot: Fanuc, solutions: np.ndarray, solved: np.ndarray,
+                    frames: np.ndarray) -> Tuple[float, float, int]:
+  """Validate the solved frames with batched FK
+
+  Returns:
+      Tuple[float, float, int]: largest end effector position error in mm and
+          rotation error in rad over the in-limit solutions, and the number of
+          solutions outside the limits
+  """
+  low = np.array([joint.low_limit for joint in robot.joints])
+  high = np.array([joint.high_limit for joint in robot.joints])
+  in_limits = solved.copy()
+  in_limits[solved] = ((solutions[solved] >= low) & (solutions[solved] <= high)).all(axis=1)
+  out_of_limits = int(solved.sum() - in_limits.sum())
+  if not in_limits.any():
+    return 0.0, 0.0, out_of_limits
+  reached = robot.calculate_fk_batch(solutions[in_limits])
+  position_error, rotation_error = se3.pose_distance(reached, frames[in_limits])
+  return float(position_error.max()), float(rotation_error.max()), out_of_limits
+
+
+def report(name: str, solved: np.ndarray, latency: np.ndarray,
+           position_error: float, rotation_error: float,
+           out_of_limits: int) -> List[str]:
+  """Format throughput and latency percentiles for one solver"""
+  p50, p90, p99 = np.percentile(latency, [50, 90, 99]) * 1e6
+  return [
+      f"{name}",
+      f"  solved        {solved.sum()}/{len(solved)}",
+      f"  throughput    {len(latency) / latency.sum():.0f} calls/s",
+      f"  latency (us)  p50 {p50:.1f}  p90 {p90:.1f}  p99 {p99:.1f}  max {latency.max() * 1e6:.1f}",
+      f"  max FK error  {position_error:.2e} mm  {rotation_error:.2e} rad",
+      f"  out of limits {out_of_limits}",
+  ]
+
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument("--samples", type=int, default=5000,
+                      help="number of random reachable frames")
+  parser.add_argument("--seed", type=int, default=0, help="random seed")
+  parser.add_argument("--seed-noise", type=float, default=0.2,
+                      help="std dev (rad) of the noise added to the IK seeds")
+  parser.add_argument("--tolerance", type=float, default=1e-4,
+                      help="max joint difference (rad) counted as agreement")
+  parser.add_argument("--show", type=int, default=10,
+                      help="number of disagreements to print")
+  args = parser.parse_args()
+
+  rng = np.random.default_rng(args.seed)
+  compiled = Fanuc(drawing_enabled=False)
+  python = load_python_fanuc()
+  joint_angles, frames, seeds = make_cases(compiled, args.samples, args.seed_noise, rng)
+
+  results = {}
+  results["python"] = run_solver(python.calculate_ik, frames, seeds)
+  try:
+    import fanuc_ik  # compiled C++ extension
+  except ImportError as error:
+    print(f"compiled fanuc_ik unavailable ({error}); benchmarking Python only")
+  else:
+    results["compiled"] = run_solver(compiled.calculate_ik, frames, seeds)
+
+  lines = []
+  for name, (solved, solutions, latency) in results.items():
+    lines += report(name, solved, latency,
+                    *check_solutions(compiled, solutions, solved, frames))
+
+  # The batch API has no per-call latency, only throughput
+  start = time.perf_counter()
+  python.calculate_ik_all_batch(frames, seeds)
+  elapsed = time.perf_counter() - start
+  lines.append(f"python calculate_ik_all_batch  {len(frames) / elapsed:.0f} frames/s")
+  if "compiled" in results:
+    start = time.perf_counter()
+    compiled.ik_session.solve_batch(frames, seeds[0])
+    elapsed = time.perf_counter() - start
+    lines.append(f"compiled IKSolverSession.solve_batch  {len(frames) / elapsed:.0f} frames/s")
+
+  if "compiled" in results:
+    py_solved, py_solutions, _ = results["python"]
+    c_solved, c_solutions, _ = results["compiled"]
+    existence = np.flatnonzero(py_solved != c_solved)
+    both = py_solved & c_solved
+    diff = np.abs(py_solutions - c_solutions).max(axis=1)
+    picked = np.flatnonzero(both & (diff > args.tolerance))
+
+    lines.append("disagreements")
+    lines.append(f"  solved by only one solver  {len(existence)}")
+    lines.append(f"  different solution picked  {len(picked)} (tolerance {args.tolerance} rad)")
+    for index in np.concatenate([existence, picked])[:args.show]:
+      lines.append(f"  frame {index}: q_true {np.round(joint_angles[index], 4)}")
+      lines.append(f"    python   {py_solved[index]} {np.round(py_solutions[index], 4)}")
+      lines.append(f"    compiled {c_solved[index]} {np.round(c_solutions[index], 4)}")
+
+  print("\n".join(lines))
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,225 @@
+"""calibration.py — fit Fanuc DH corrections to measured end effector poses.
+
+The fitted parameters are the link lengths a_1, a_2, a_3, d_4, d_6 and a
+theta offset per joint. Every sample of commanded joint angles and measured
+flange frame contributes six residuals (position in mm, rotation scaled to mm
+by the arm reach), and the whole dataset is solved with damped Gauss-Newton
+steps. The parameter Jacobian is analytic: in a modified DH chain a change of
+a_i slides along x of frame i-1, a change of d_i slides along z of frame i, and
+a theta offset rotates about z of frame i. All of these come from one batched
+FK pass per iteration.
+"""
+
+import math
+
+import numpy as np
+
+from fanuc_provided import Fanuc
+from robot_components import Joint
+
+LENGTH_NAMES = ("a_1", "a_2", "a_3", "d_4", "d_6")
+
+# (joint index, DH value) that each length parameter drives
+LENGTH_SLOTS = ((1, "a"), (2, "a"), (3, "a"), (3, "d"), (5, "d"))
+
+# Theta of joint 2 is q2 - pi/2 in the Fanuc FK
+NOMINAL_OFFSETS = np.array([0, -math.pi / 2, 0, 0, 0, 0])
+
+
+class CalibrationResult(object):
+  """Fitted DH corrections and fit statistics"""
+
+  def __init__(self, lengths: np.ndarray, joint_offsets: np.ndarray,
+               rms_position: float, rms_rotation: float, iterations: int):
+    self.lengths       = lengths        # (5,) a_1, a_2, a_3, d_4, d_6       [mm]
+    self.joint_offsets = joint_offsets  # (6,) theta correction per joint    [rad]
+    self.rms_position  = rms_position   # RMS position residual              [mm]
+    self.rms_rotation  = rms_rotation   # RMS rotation residual              [rad]
+    self.iterations    = iterations     # Gauss-Newton iterations used
+
+  @property
+  def params(self) -> dict:
+    """Fitted link lengths by name [mm]."""
+    return dict(zip(LENGTH_NAMES, self.lengths.tolist()))
+
+  def apply(self, fanuc: Fanuc) -> None:
+    """Write the fitted link lengths into a Fanuc model
+
+    Joint offsets are not part of the Fanuc model or the compiled IK, so
+    send commands through compensate() instead.
+
+    Args:
+        fanuc (Fanuc): robot to update
+    """
+    for name, value in self.params.items():
+      setattr(fanuc, name, value)
+    # set_dh_parameters bumps the joint revision, so the next calculate_fk
+    # reloads the joint even when the angles are unchanged
+    for (index, slot), value in zip(LENGTH_SLOTS, self.lengths):
+      joint = fanuc.joints[index]
+      a, d = (float(value), joint._d) if slot == "a" else (joint._a, float(value))
+      joint.set_dh_parameters(a, joint._alpha, d)
+
+    if fanuc._ik_session is not None:
+      fanuc._ik_session.refresh()
+
+  def compensate(self, joint_angles: np.ndarray) -> np.ndarray:
+    """Joint angles to command so the real robot reaches the nominal ones
+
+    Args:
+        joint_angles (np.ndarray): (6,) or (N,6) joint angles from IK
+
+    Returns:
+        np.ndarray: joint angles with the fitted offsets removed
+    """
+    return np.asarray(joint_angles, dtype=float) - self.joint_offsets
+
+
+def nominal_lengths(fanuc: Fanuc) -> np.ndarray:
+  """Current link lengths of a Fanuc model
+
+  Args:
+      fanuc (Fanuc): robot model
+
+  Returns:
+      np.ndarray: (5,) a_1, a_2, a_3, d_4, d_6 in mm
+  """
+  return np.array([getattr(fanuc, name) for name in LENGTH_NAMES], dtype=float)
+
+
+def calibrated_fk(fanuc: Fanuc, joint_angles: np.ndarray, lengths: np.ndarray,
+                  joint_offsets: np.ndarray) -> np.ndarray:
+  """Batched FK of the Fanuc with candidate lengths and joint offsets
+
+  Args:
+      fanuc (Fanuc): robot model providing the DH alphas
+      joint_angles (np.ndarray): (N,6) commanded joint angles
+      lengths (np.ndarray): (5,) a_1, a_2, a_3, d_4, d_6 in mm
+      joint_offsets (np.ndarray): (6,) theta corrections in rad
+
+  Returns:
+      np.ndarray: (N,7,4,4) frames [T_00, T_01, ... T_06]
+  """
+  a_values = [joint._a for joint in fanuc.joints]
+  d_values = [joint._d for joint in fanuc.joints]
+  for (index, slot), value in zip(LENGTH_SLOTS, lengths):
+    if slot == "a":
+      a_values[index] = value
+    else:
+      d_values[index] = value
+
+  thetas = np.asarray(joint_angles, dtype=float) + NOMINAL_OFFSETS + joint_offsets
+  current = np.broadcast_to(np.eye(4), (len(thetas), 4, 4))
+  frames = [current]
+  for index, joint in enumerate(fanuc.joints):
+    current = current @ Joint.dh_tf_batch(joint._alpha, a_values[index],
+                                          d_values[index], thetas[:, index])
+    frames.append(current)
+  return np.stack(frames, axis=1)
+
+
+def pose_residuals(frames: np.ndarray, measured_frames: np.ndarray,
+                   length_scale: float) -> np.ndarray:
+  """Stacked position and scaled rotation residuals
+
+  Args:
+      frames (np.ndarray): (N,4,4) modelled flange frames
+      measured_frames (np.ndarray): (N,4,4) measured flange frames
+      length_scale (float): mm per rad used to weigh rotation errors
+
+  Returns:
+      np.ndarray: (N,6) [position error (mm), rotation error * length_scale]
+  """
+  R_err = measured_frames[:, :3, :3] @ np.swapaxes(frames[:, :3, :3], 1, 2)
+  rot_err = 0.5 * np.stack([R_err[:, 2, 1] - R_err[:, 1, 2],
+                            R_err[:, 0, 2] - R_err[:, 2, 0],
+                            R_err[:, 1, 0] - R_err[:, 0, 1]], axis=1)
+  pos_err = measured_frames[:, :3, 3] - frames[:, :3, 3]
+  return np.concatenate([pos_err, length_scale * rot_err], axis=1)
+
+
+def parameter_jacobian(frames: np.ndarray, length_scale: float) -> np.ndarray:
+  """Analytic derivative of the flange pose with respect to the parameters
+
+  Args:
+      frames (np.ndarray): (N,7,4,4) frames from calibrated_fk
+      length_scale (float): mm per rad used to weigh rotation errors
+
+  Returns:
+      np.ndarray: (N,6,11) Jacobian, columns a_1, a_2, a_3, d_4, d_6 then
+                  the six joint offsets
+  """
+  p_ee = frames[:, -1, :3, 3]
+  jacobian = np.zeros((len(frames), 6, 11))
+
+  # Lengths only translate the flange: a_i along x_{i-1}, d_i along z_i
+  for column, (index, slot) in enumerate(LENGTH_SLOTS):
+    if slot == "a":
+      jacobian[:, :3, column] = frames[:, index, :3, 0]
+    else:
+      jacobian[:, :3, column] = frames[:, index + 1, :3, 2]
+
+  # Offsets rotate about z_i like a joint, i.e. the geometric Jacobian
+  axes = frames[:, 1:, :3, 2]
+  origins = frames[:, 1:, :3, 3]
+  jacobian[:, :3, 5:] = np.swapaxes(np.cross(axes, p_ee[:, None] - origins), 1, 2)
+  jacobian[:, 3:, 5:] = length_scale * np.swapaxes(axes, 1, 2)
+  return jacobian
+
+
+def calibrate(fanuc: Fanuc, joint_angles: np.ndarray, measured_frames: np.ndarray,
+              position_only: bool = False, iterations: int = 20,
+              damping: float = 1e-6, step_tolerance: float = 1e-9) -> CalibrationResult:
+  """Fit link lengths and joint offsets to measured flange poses
+
+  Args:
+      fanuc (Fanuc): robot model supplying the nominal parameters
+      joint_angles (np.ndarray): (N,6) commanded joint angles in rad
+      measured_frames (np.ndarray): (N,4,4) measured flange frames in mm
+      position_only (bool, optional): fit positions only, e.g. for tracker
+          data without orientation. The joint 6 offset is then unobservable
+          and stays near zero. Defaults to False.
+      iterations (int, optional): max Gauss-Newton iterations. Defaults to 20.
+      damping (float, optional): Levenberg damping relative to the normal
+          matrix diagonal. Defaults to 1e-6.
+      step_tolerance (float, optional): stop once the largest parameter step
+          is below this. Defaults to 1e-9.
+
+  Raises:
+      ValueError: if the inputs are not (N,6) and (N,4,4)
+
+  Returns:
+      CalibrationResult: fitted lengths, joint offsets and residuals
+  """
+  joint_angles = np.asarray(joint_angles, dtype=float)
+  measured_frames = np.asarray(measured_frames, dtype=float)
+  if joint_angles.ndim != 2 or joint_angles.shape[1] != 6:
+    raise ValueError("joint_angles must be an (N,6) array")
+  if measured_frames.shape != (len(joint_angles), 4, 4):
+    raise ValueError("measured_frames must be an (N,4,4) array matching joint_angles")
+
+  length_scale = fanuc.a_2 + math.hypot(fanuc.a_3, fanuc.d_4)
+  rows = slice(0, 3) if position_only else slice(0, 6)
+  params = np.concatenate([nominal_lengths(fanuc), np.zeros(6)])
+
+  for iteration in range(1, iterations + 1):
+    frames = calibrated_fk(fanuc, joint_angles, params[:5], params[5:])
+    residual = pose_residuals(frames[:, -1], measured_frames, length_scale)[:, rows]
+    jacobian = parameter_jacobian(frames, length_scale)[:, rows]
+
+    # Normal equations summed over every sample at once
+    JtJ = np.einsum('nki,nkj->ij', jacobian, jacobian)
+    Jte = np.einsum('nki,nk->i', jacobian, residual)
+    diagonal = np.diag_indices_from(JtJ)
+    JtJ[diagonal] += damping * (JtJ[diagonal] + 1.0)
+    step = np.linalg.solve(JtJ, Jte)
+    params += step
+    if np.abs(step).max() < step_tolerance:
+      break
+
+  frames = calibrated_fk(fanuc, joint_angles, params[:5], params[5:])
+  residual = pose_residuals(frames[:, -1], measured_frames, length_scale)
+  rms_position = float(np.sqrt(np.mean(np.sum(residual[:, :3]**2, axis=1))))
+  rms_rotation = float(np.sqrt(np.mean(np.sum(residual[:, 3:]**2, axis=1)))) / length_scale
+  return CalibrationResult(params[:5].copy(), params[5:].copy(), rms_position,
+                           rms_rotation, iteration)
@@ -1,5 +1,10 @@
+import time
+
 import numpy as np
 from mpl_toolkits.mplot3d import Axes3D
+from matplotlib.colors import is_color_like, to_rgba_array
+from matplotlib.widgets import Slider
+from mpl_toolkits.mplot3d.art3d import Line3DCollection
 
 import general_utility as general
 
@@ -200,3 +205,692 @@ class LinkDrawing(object):
   def redraw(self):
     """Update artist data; caller is responsible for a single canvas flush."""
     self._update_drawing()
+
+
+class PaintDrawing(object):
+  """One growable artist holding every paint spot of a single color
+
+  Spots are appended in place into a preallocated buffer that doubles when it
+  fills up, so painting N spots keeps a single artist on the axes instead of
+  creating N of them.
+  """
+  INITIAL_CAPACITY = 256  # spots stored before the first buffer growth
+
+  def __init__(self, ax: Axes3D, color=None, markersize: float = 10):
+    """Initialize the paint drawing
+
+    Args:
+        ax (Axes3D): The Axes3D to use for drawing
+        color (_type_, optional): The color of the spots. Defaults to None.
+        markersize (float, optional): size of each spot. Defaults to 10.
+    """
+    self._ax = ax
+    self._color = color
+    self._markersize = markersize
+    self._spot_artist = None
+
+    self._points = np.empty((self.INITIAL_CAPACITY, 3))
+    self._count = 0
+    self._scaled_count = 0
+
+  def __len__(self) -> int:
+    return self._count
+
+  @property
+  def color(self):
+    """Color of the spots"""
+    return 'b' if self._color is None else self._color
+
+  @property
+  def points(self) -> np.ndarray:
+    """(N,3) view of the painted spots"""
+    return self._points[:self._count]
+
+  def append(self, location: np.ndarray):
+    """Add a paint spot, growing the buffer when it is full
+
+    Args:
+        location (np.ndarray): (3,) location of the spot
+    """
+    if self._count == len(self._points):
+      grown = np.empty((2 * len(self._points), 3))
+      grown[:self._count] = self._points
+      self._points = grown
+    self._points[self._count] = location[:3]
+    self._count += 1
+
+  def draw(self):
+    """Create the artist holding every spot"""
+    points = self.points
+    (self._spot_artist, ) = self._ax.plot(
+        points[:, 0], points[:, 1], points[:, 2],
+        linestyle="none",
+        marker=".",
+        color=self.color,
+        markersize=self._markersize)
+    self._scaled_count = self._count
+
+  def _update_drawing(self):
+    """Point the artist at the current spots and grow the view to fit new ones"""
+    # Re-attach the artist if the axes have been cleared since the last draw
+    if self._spot_artist.axes is None:
+      self._ax.add_line(self._spot_artist)
+
+    points = self.points
+    self._spot_artist.set_data_3d(points[:, 0], points[:, 1], points[:, 2])
+    if self._scaled_count < self._count:
+      new_points = points[self._scaled_count:]
+      self._ax.auto_scale_xyz(new_points[:, 0], new_points[:, 1],
+                              new_points[:, 2], had_data=True)
+      self._scaled_count = self._count
+
+  def redraw(self):
+    """Update artist data; caller is responsible for a single canvas flush."""
+    self._update_drawing()
+
+
+class RobotDrawing(object):
+  """Every frame and link of a robot drawn as a single Line3DCollection
+
+  Each frame adds three axis segments and each link one segment. All of them
+  live in one (M,2,3) array that is rewritten in place and handed to the
+  collection with one set_segments call, instead of updating one Line3D
+  artist per axis and per link.
+  """
+  FRAME_LINEWIDTH = 1.5  # width of the frame axes
+  LINK_LINEWIDTH = 1.5   # width of the links
+
+  def __init__(self, ax: Axes3D, frame_colors: list, link_colors: list,
+               frame_size: float = None):
+    """Initialize the robot drawing
+
+    Args:
+        ax (Axes3D): The Axes3D to use for drawing
+        frame_colors (list): one entry per frame, None for red/green/blue axes
+            or a single color for all three axes
+        link_colors (list): one color per link, None for blue
+        frame_size (float, optional): length of frame axes. Defaults to FrameDrawing.LENGTH.
+    """
+    self._ax = ax
+    self._length = FrameDrawing.LENGTH if frame_size is None else frame_size
+    self._n_frames = len(frame_colors)
+    self._n_links = len(link_colors)
+    self._segments = np.zeros((3 * self._n_frames + self._n_links, 2, 3))
+    self._collection_artist = None
+
+    self._colors = []
+    for color in frame_colors:
+      self._colors += ["r", "g", "b"] if color is None else [color] * 3
+    self._colors += ['b' if color is None else color for color in link_colors]
+    self._linewidths = ([self.FRAME_LINEWIDTH] * 3 * self._n_frames +
+                        [self.LINK_LINEWIDTH] * self._n_links)
+
+  @property
+  def segments(self) -> np.ndarray:
+    """(M,2,3) start and end point of every segment, frame axes first"""
+    return self._segments
+
+  @property
+  def colors(self) -> list:
+    """Color of every segment"""
+    return self._colors
+
+  @property
+  def linewidths(self) -> list:
+    """Line width of every segment"""
+    return self._linewidths
+
+  def update_frames(self, frames: np.ndarray, link_frames: np.ndarray):
+    """Rebuild every segment from the robot frames
+
+    Args:
+        frames (np.ndarray): (F,4,4) frames drawn as axes
+        link_frames (np.ndarray): (L+1,4,4) chain frames, link i joins the
+            origins of link_frames[i] and link_frames[i + 1]
+    """
+    general.check_proper_numpy_format(frames, (self._n_frames, 4, 4))
+    general.check_proper_numpy_format(link_frames, (self._n_links + 1, 4, 4))
+
+    axes = self._segments[:3 * self._n_frames].reshape(self._n_frames, 3, 2, 3)
+    origins = frames[:, None, :3, 3]
+    axes[:, :, 0] = origins
+    axes[:, :, 1] = origins + self._length * np.swapaxes(frames[:, :3, :3], 1, 2)
+
+    link_origins = link_frames[:, :3, 3]
+    links = self._segments[3 * self._n_frames:]
+    links[:, 0] = link_origins[:-1]
+    links[:, 1] = link_origins[1:]
+
+  def update_segments(self, segments: np.ndarray):
+    """Overwrite every segment at once
+
+    Args:
+        segments (np.ndarray): (M,2,3) segments ordered like the segments property
+    """
+    general.check_proper_numpy_format(segments, self._segments.shape)
+    self._segments[...] = segments
+
+  def draw(self):
+    """Create the collection on the first call, then only update it"""
+    if self._collection_artist is not None:
+      self.redraw()
+      return
+    self._collection_artist = Line3DCollection(self._segments,
+                                               colors=self._colors,
+                                               linewidths=self._linewidths)
+    self._ax.add_collection3d(self._collection_artist)
+
+  def _update_drawing(self):
+    """Hand the segment array to the collection"""
+    self._collection_artist.set_segments(self._segments)
+
+  def redraw(self):
+    """Update artist data; caller is responsible for a single canvas flush."""
+    self._update_drawing()
+
+
+class BlitManager(object):
+  """Redraw only the moving artists of an axes over a cached background
+
+  Artists already on the axes when the manager is created (panes, grid,
+  labels) are static. Everything added later is marked animated, so a full
+  canvas draw renders only the static scene, which is cached on every
+  draw_event (first show, resize, view rotation). update() restores that
+  background, draws the animated artists with draw_artist and blits.
+  """
+
+  def __init__(self, ax: Axes3D):
+    """Initialize the blit manager before any moving artist is drawn
+
+    Args:
+        ax (Axes3D): The Axes3D holding the robot artists
+    """
+    self._ax = ax
+    self._canvas = ax.figure.canvas
+    self._static_artists = set(ax.get_children())
+    self._known_artists = set()
+    self._background = None
+    self._canvas.mpl_connect("draw_event", self._on_draw)
+
+  def _animated_artists(self) -> list:
+    """Every non static artist of the axes, marked as animated
+
+    Returns:
+        list: artists drawn on top of the background
+    """
+    artists = [artist for artist in self._ax.get_children()
+               if artist not in self._static_artists]
+    for artist in artists:
+      artist.set_animated(True)
+    return artists
+
+  def _draw_animated(self, artists: list):
+    """Draw the animated artists onto the canvas renderer"""
+    for artist in artists:
+      if not artist.get_visible():
+        continue
+      # 3D collections project their segments during the axes draw only
+      project = getattr(artist, "do_3d_projection", None)
+      if project is not None:
+        project()
+      self._ax.draw_artist(artist)
+
+  def _on_draw(self, event):
+    """Cache the static scene after a full draw and put the robot back on it"""
+    self._background = self._canvas.copy_from_bbox(self._ax.figure.bbox)
+    self._draw_animated(self._animated_artists())
+
+  def refresh(self):
+    """Re-render the static background, e.g. after changing axis limits"""
+    self._animated_artists()
+    self._canvas.draw()
+
+  def update(self):
+    """Show the current state of the animated artists"""
+    artists = self._animated_artists()
+    new_artists = [artist for artist in artists if artist not in self._known_artists]
+    if self._background is None or new_artists:
+      # New artists may already be baked into the cached background
+      self._known_artists.update(new_artists)
+      self._canvas.draw()
+
+    self._canvas.restore_region(self._background)
+    self._draw_animated(artists)
+    self._canvas.blit(self._ax.figure.bbox)
+    self._canvas.flush_events()
+
+
+class PlaybackScheduler(object):
+  """Play poses against the wall clock, skipping the ones rendering misses
+
+  Iterating yields the index of every pose to render. Pose i is due at
+  timestamps[i] / speed seconds after the first yield; the scheduler sleeps
+  until the next pose is due and, when a render overruns, jumps straight to
+  the newest pose that is already due. The skipped indices are counted as
+  dropped, and the last pose is always rendered, so playback takes the path
+  duration whatever the machine.
+  """
+
+  def __init__(self, timestamps: np.ndarray, speed: float = 1.0,
+               clock=time.perf_counter, sleep=time.sleep):
+    """Initialize the scheduler
+
+    Args:
+        timestamps (np.ndarray): (N,) non decreasing path time of every pose [s]
+        speed (float, optional): playback speed, 2 plays twice as fast.
+            Defaults to 1.
+        clock (callable, optional): wall clock in seconds. Defaults to
+            time.perf_counter.
+        sleep (callable, optional): waits for a number of seconds. Defaults
+            to time.sleep.
+
+    Raises:
+        ValueError: if timestamps are not (N,) non decreasing or speed <= 0
+    """
+    timestamps = np.asarray(timestamps, dtype=float)
+    if timestamps.ndim != 1 or np.any(np.diff(timestamps) < 0):
+      raise ValueError("timestamps must be an (N,) non decreasing array")
+    if speed <= 0:
+      raise ValueError("speed must be positive")
+    self._times = (timestamps - timestamps[0]) / speed if len(timestamps) else timestamps
+    self._clock = clock
+    self._sleep = sleep
+    self._rendered = 0
+    self._dropped = 0
+    self._elapsed = 0.0
+
+  @classmethod
+  def from_period(cls, count: int, period: float, speed: float = 1.0,
+                  **kwargs) -> "PlaybackScheduler":
+    """Scheduler for count poses spaced period seconds apart"""
+    return cls(np.arange(count) * period, speed, **kwargs)
+
+  @property
+  def rendered(self) -> int:
+    """Number of poses yielded so far"""
+    return self._rendered
+
+  @property
+  def dropped(self) -> int:
+    """Number of poses skipped so far"""
+    return self._dropped
+
+  @property
+  def elapsed(self) -> float:
+    """Wall clock seconds since the first pose"""
+    return self._elapsed
+
+  @property
+  def fps(self) -> float:
+    """Achieved rendered poses per wall clock second"""
+    return self._rendered / self._elapsed if self._elapsed > 0 else 0.0
+
+  def report(self) -> str:
+    """One line summary of the playback"""
+    target = self._times[-1] if len(self._times) else 0.0
+    return (f"played {self._rendered + self._dropped} poses in {self._elapsed:.2f} s "
+            f"(target {target:.2f} s): "
+            f"{self._rendered} rendered at {self.fps:.1f} fps, "
+            f"{self._dropped} dropped")
+
+  def __iter__(self):
+    self._rendered = 0
+    self._dropped = 0
+    count = len(self._times)
+    start = self._clock()
+    index = 0
+    while index < count:
+      wait = self._times[index] - (self._clock() - start)
+      if wait > 0:
+        self._sleep(wait)
+      yield index
+      self._rendered += 1
+      self._elapsed = self._clock() - start
+      if index == count - 1:
+        break
+
+      # Newest pose already due, but never past the last one
+      due = int(np.searchsorted(self._times, self._elapsed, side="right")) - 1
+      next_index = min(max(index + 1, due), count - 1)
+      self._dropped += next_index - index - 1
+      index = next_index
+    self._elapsed = self._clock() - start
+
+
+class TimelineScrubber(object):
+  """Random access viewer of a recorded run driven by a slider
+
+  Every chain frame of every pose is computed up front (e.g. with a batched
+  FK) and kept in one compact (N,K,4,4) float32 array. Moving the slider, or
+  the left/right arrow keys, shows pose i by handing frames[i] to a
+  RobotDrawing and trimming the paint to the spots left up to pose i, so
+  jumping anywhere in the run costs the same as drawing one pose.
+  """
+
+  def __init__(self, ax: Axes3D, robot_drawing: "RobotDrawing", frames: np.ndarray,
+               frame_indices=None, link_indices=None, times: np.ndarray = None,
+               on_show=None):
+    """Initialize the scrubber and add its slider below the axes
+
+    Args:
+        ax (Axes3D): The Axes3D the robot is drawn in
+        robot_drawing (RobotDrawing): drawing that shows one pose
+        frames (np.ndarray): (N,K,4,4) chain frames of every pose
+        frame_indices (list, optional): which of the K frames are drawn as
+            axes. Defaults to all of them.
+        link_indices (list, optional): which of the K frames the links join,
+            in chain order. Defaults to all of them.
+        times (np.ndarray, optional): (N,) time of every pose [s], shown on
+            the slider. Defaults to the pose index.
+        on_show (callable, optional): called with the pose index after the
+            robot is updated, e.g. to move a brush. Defaults to None.
+
+    Raises:
+        ValueError: if frames is not (N,K,4,4) or times does not match
+    """
+    frames = np.asarray(frames, dtype=np.float32)
+    if frames.ndim != 4 or frames.shape[2:] != (4, 4) or len(frames) == 0:
+      raise ValueError("frames must be a non empty (N,K,4,4) array")
+    if times is not None and len(times) != len(frames):
+      raise ValueError("times must have one entry per pose")
+
+    all_indices = np.arange(frames.shape[1])
+    self._ax = ax
+    self._robot_drawing = robot_drawing
+    self._frames = frames
+    self._frame_indices = all_indices if frame_indices is None else np.asarray(frame_indices)
+    self._link_indices = all_indices if link_indices is None else np.asarray(link_indices)
+    self._times = None if times is None else np.asarray(times, dtype=float)
+    self._on_show = on_show
+    self._paint = []  # (artist, pose indices, points) per paint color
+    self._index = 0
+
+    figure = ax.figure
+    figure.subplots_adjust(bottom=0.12)
+    slider_ax = figure.add_axes([0.15, 0.03, 0.7, 0.03])
+    self._slider = Slider(slider_ax, "pose", 0, len(frames) - 1, valinit=0,
+                          valstep=1)
+    self._slider.drawon = False  # _show requests the one redraw per pose
+    self._slider.on_changed(self._on_slider)
+    figure.canvas.mpl_connect("key_press_event", self._on_key)
+
+  def __len__(self) -> int:
+    return len(self._frames)
+
+  @property
+  def frames(self) -> np.ndarray:
+    """(N,K,4,4) float32 chain frames of every pose"""
+    return self._frames
+
+  @property
+  def index(self) -> int:
+    """Pose currently shown"""
+    return self._index
+
+  def add_paint(self, color, pose_indices: np.ndarray, points: np.ndarray,
+                markersize: float = 6):
+    """Paint spots of one color, each revealed once its pose is reached
+
+    Args:
+        color: Matplotlib color of the spots
+        pose_indices (np.ndarray): (M,) non decreasing pose that leaves each spot
+        points (np.ndarray): (M,3) spot locations
+        markersize (float, optional): spot size. Defaults to 6.
+    """
+    (artist, ) = self._ax.plot([], [], [], linestyle="none", marker=".",
+                               color=color, markersize=markersize)
+    self._paint.append((artist, np.asarray(pose_indices),
+                        np.asarray(points, dtype=np.float32)))
+
+  def show(self, index: int):
+    """Show one pose and move the slider to it
+
+    Args:
+        index (int): pose index, clipped to the recorded range
+    """
+    index = int(np.clip(index, 0, len(self._frames) - 1))
+    if index != int(self._slider.val):
+      self._slider.set_val(index)  # calls back into _show
+      return
+    self._show(index)
+
+  def _show(self, index: int):
+    """Update the robot, paint and slider label for one pose"""
+    self._index = index
+    pose = self._frames[index]
+    self._robot_drawing.update_frames(pose[self._frame_indices], pose[self._link_indices])
+    self._robot_drawing.draw()
+
+    for artist, pose_indices, points in self._paint:
+      shown = points[:np.searchsorted(pose_indices, index, side="right")]
+      artist.set_data_3d(shown[:, 0], shown[:, 1], shown[:, 2])
+
+    if self._on_show is not None:
+      self._on_show(index)
+    if self._times is not None:
+      self._slider.valtext.set_text(f"{self._times[index]:.2f} s")
+    self._ax.figure.canvas.draw_idle()
+
+  def _on_slider(self, value: float):
+    self._show(int(value))
+
+  def _on_key(self, event):
+    if event.key == "right":
+      self.show(self._index + 1)
+    elif event.key == "left":
+      self.show(self._index - 1)
+
+
+class RasterCanvas(object):
+  """Headless orthographic renderer writing straight into a NumPy RGB buffer
+
+  Points are projected with a fixed camera (elevation and azimuth as in
+  Axes3D.view_init) scaled so the given bounds fill the image. Lines are
+  sampled every half pixel and splatted with bilinear weights, which gives
+  anti-aliased edges without a per-line Python loop; spots are anti-aliased
+  discs. Everything drawn in one call is blended by coverage, so overlaps
+  inside a call average their colors while later calls paint over earlier
+  ones. No Matplotlib figure or GUI backend is involved.
+  """
+  SAMPLE_SPACING = 0.5  # pixels between line samples
+
+  def __init__(self, width: int, height: int, bounds: tuple,
+               elev: float = 30.0, azim: float = -60.0,
+               background=(1.0, 1.0, 1.0), margin: int = 10):
+    """Initialize the canvas and its camera
+
+    Args:
+        width (int): image width in pixels
+        height (int): image height in pixels
+        bounds (tuple): (x_min, x_max, y_min, y_max, z_min, z_max) box that
+            must fit inside the image
+        elev (float, optional): camera elevation in degrees. Defaults to 30.
+        azim (float, optional): camera azimuth in degrees. Defaults to -60.
+        background (tuple, optional): RGB background in [0, 1]. Defaults to white.
+        margin (int, optional): empty border in pixels. Defaults to 10.
+    """
+    self._width = int(width)
+    self._height = int(height)
+    self._bounds = np.asarray(bounds, dtype=float).reshape(3, 2)
+    self._buffer = np.empty((self._height, self._width, 3), dtype=np.float32)
+    self._backdrop = np.empty_like(self._buffer)
+    self._backdrop[...] = np.asarray(background, dtype=np.float32)
+    self.clear()
+
+    # Screen right and screen up of a camera orbiting the z axis
+    elev = np.radians(elev)
+    azim = np.radians(azim)
+    self._view = np.array([
+        [-np.sin(azim), np.cos(azim), 0.0],
+        [-np.sin(elev) * np.cos(azim), -np.sin(elev) * np.sin(azim), np.cos(elev)],
+    ])
+
+    # Scale and center the projected corners of the bounds in the image
+    corners = np.stack(np.meshgrid(*self._bounds, indexing="ij"), axis=-1).reshape(-1, 3)
+    projected = corners @ self._view.T
+    low = projected.min(axis=0)
+    span = np.maximum(projected.max(axis=0) - low, 1e-12)
+    self._scale = min((self._width - 2 * margin) / span[0],
+                      (self._height - 2 * margin) / span[1])
+    self._offset = (np.array([self._width, self._height]) -
+                    self._scale * span) / 2 - self._scale * low
+
+  @property
+  def shape(self) -> tuple:
+    """(height, width, 3) of the image"""
+    return self._buffer.shape
+
+  def project(self, points: np.ndarray) -> np.ndarray:
+    """Pixel coordinates of 3D points
+
+    Args:
+        points (np.ndarray): (...,3) points in space
+
+    Returns:
+        np.ndarray: (...,2) column and row, row 0 at the top of the image
+    """
+    pixels = np.asarray(points, dtype=float) @ self._view.T * self._scale + self._offset
+    pixels[..., 1] = self._height - pixels[..., 1]
+    return pixels
+
+  def clear(self):
+    """Reset the image to the background, see also keep_as_background"""
+    self._buffer[...] = self._backdrop
+
+  def keep_as_background(self):
+    """Make the current image the one clear() restores
+
+    Draw static content such as draw_bounds once, call this, and every later
+    frame starts from it instead of redrawing it.
+    """
+    self._backdrop[...] = self._buffer
+
+  def image(self) -> np.ndarray:
+    """The current image as (height, width, 3) uint8 RGB"""
+    return (np.clip(self._buffer, 0.0, 1.0) * 255 + 0.5).astype(np.uint8)
+
+  def _rgb(self, colors, count: int) -> np.ndarray:
+    """One RGB row per item from any Matplotlib color or list of colors"""
+    if is_color_like(colors):
+      colors = [colors]
+    rgb = to_rgba_array(colors)[:, :3]
+    return np.broadcast_to(rgb, (count, 3)) if len(rgb) == 1 else rgb
+
+  def _composite(self, flat: np.ndarray, coverage: np.ndarray, colors: np.ndarray):
+    """Blend coverage weighted colors into the buffer
+
+    Args:
+        flat (np.ndarray): (P,) flat pixel indices
+        coverage (np.ndarray): (P,) coverage of each contribution
+        colors (np.ndarray): (P,3) color of each contribution
+    """
+    if len(flat) == 0:
+      return
+    # Sum per touched pixel only, never over the whole image
+    hit, slot = np.unique(flat, return_inverse=True)
+    total = np.bincount(slot, coverage, len(hit))
+    keep = total > 0
+    rgb = np.stack([np.bincount(slot, coverage * colors[:, channel], len(hit))
+                    for channel in range(3)], axis=1)[keep] / total[keep, None]
+    hit = hit[keep]
+    alpha = np.minimum(total[keep], 1.0)[:, None]
+    buffer = self._buffer.reshape(-1, 3)
+    buffer[hit] = buffer[hit] * (1 - alpha) + rgb * alpha
+
+  def draw_segments(self, segments: np.ndarray, colors, width: float = 1.0):
+    """Draw anti-aliased 3D line segments
+
+    Args:
+        segments (np.ndarray): (M,2,3) start and end point of every segment
+        colors: one color for all segments or one per segment
+        width (float, optional): line width in pixels. Defaults to 1.
+    """
+    segments = np.asarray(segments, dtype=float).reshape(-1, 2, 3)
+    if len(segments) == 0:
+      return
+    colors = self._rgb(colors, len(segments))
+    ends = self.project(segments)
+    start = ends[:, 0]
+    delta = ends[:, 1] - start
+    length = np.hypot(delta[:, 0], delta[:, 1])
+
+    # Evenly spaced samples along every segment, all segments at once
+    n_samples = np.ceil(length / self.SAMPLE_SPACING).astype(int) + 1
+    owner = np.repeat(np.arange(len(segments)), n_samples)
+    first = np.cumsum(n_samples) - n_samples
+    steps = np.maximum(n_samples - 1, 1)
+    t = (np.arange(len(owner)) - first[owner]) / steps[owner]
+    samples = start[owner] + t[:, None] * delta[owner]
+    spacing = np.where(n_samples > 1, length / steps, 1.0)[owner]
+
+    # Wide lines are several parallel strands, each covering its share
+    strands = max(1, int(np.ceil(width)))
+    normal = np.stack([-delta[:, 1], delta[:, 0]], axis=1) / np.maximum(length, 1e-12)[:, None]
+    shifts = (np.arange(strands) - (strands - 1) / 2) * (width / strands)
+    samples = (samples[None] + shifts[:, None, None] * normal[owner][None]).reshape(-1, 2)
+    weights = np.tile(spacing * width / strands, strands)
+    self._splat(samples, weights, np.tile(colors[owner], (strands, 1)))
+
+  def _splat(self, points: np.ndarray, weights: np.ndarray, colors: np.ndarray):
+    """Spread weighted 2D samples over their four nearest pixels"""
+    points = points - 0.5  # pixel centers sit at +0.5
+    base = np.floor(points).astype(int)
+    frac = points - base
+    flats, coverages, spread_colors = [], [], []
+    for dx, dy in ((0, 0), (1, 0), (0, 1), (1, 1)):
+      column = base[:, 0] + dx
+      row = base[:, 1] + dy
+      inside = (column >= 0) & (column < self._width) & (row >= 0) & (row < self._height)
+      weight = (weights * np.abs(1 - dx - frac[:, 0]) * np.abs(1 - dy - frac[:, 1]))
+      flats.append((row * self._width + column)[inside])
+      coverages.append(weight[inside])
+      spread_colors.append(colors[inside])
+    self._composite(np.concatenate(flats), np.concatenate(coverages),
+                    np.concatenate(spread_colors))
+
+  def draw_points(self, points: np.ndarray, colors, radius: float = 2.0):
+    """Draw anti-aliased round spots, e.g. paint spots
+
+    Args:
+        points (np.ndarray): (N,3) spot centers
+        colors: one color for all spots or one per spot
+        radius (float, optional): spot radius in pixels. Defaults to 2.
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
+    if len(points) == 0:
+      return
+    colors = self._rgb(colors, len(points))
+    centers = self.project(points)
+
+    reach = int(np.ceil(radius)) + 1
+    grid = np.stack(np.meshgrid(np.arange(-reach, reach + 1),
+                                np.arange(-reach, reach + 1)), axis=-1).reshape(-1, 2)
+    pixels = np.floor(centers).astype(int)[:, None] + grid[None]
+    distance = np.linalg.norm(pixels + 0.5 - centers[:, None], axis=2)
+    coverage = np.clip(radius + 0.5 - distance, 0.0, 1.0)
+    inside = ((coverage > 0) & (pixels[..., 0] >= 0) & (pixels[..., 0] < self._width) &
+              (pixels[..., 1] >= 0) & (pixels[..., 1] < self._height))
+    owner = np.nonzero(inside)[0]
+    flat = pixels[..., 1] * self._width + pixels[..., 0]
+    self._composite(flat[inside], coverage[inside], colors[owner])
+
+  def draw_robot(self, robot_drawing: "RobotDrawing"):
+    """Draw the current segments of a RobotDrawing with its colors and widths
+
+    Args:
+        robot_drawing (RobotDrawing): robot whose update_frames was called;
+            it may have been created without axes
+    """
+    linewidths = np.asarray(robot_drawing.linewidths)
+    colors = self._rgb(robot_drawing.colors, len(linewidths))
+    for width in np.unique(linewidths):
+      group = linewidths == width
+      self.draw_segments(robot_drawing.segments[group], colors[group], width)
+
+  def draw_bounds(self, color=(0.75, 0.75, 0.75)):
+    """Draw the twelve edges of the bounds box"""
+    (x_0, x_1), (y_0, y_1), (z_0, z_1) = self._bounds
+    corners = np.array([[x, y, z] for x in (x_0, x_1) for y in (y_0, y_1) for z in (z_0, z_1)])
+    edges = [(a, b) for a in range(8) for b in range(a + 1, 8)
+             if bin(a ^ b).count("1") == 1]
+    self.draw_segments(corners[np.array(edges)], color)
@@ -5,7 +5,9 @@ from mpl_toolkits.mplot3d import Axes3D
 from typing import Tuple, List
 
 import general_utility as general
-from robot_components import Link, Joint
+import se3
+from robot_components import Link, Joint, FrameChain
+from drawing_helper import BlitManager, RobotDrawing
 
 
 def make_frame(rotation: np.ndarray, translation: np.ndarray) -> np.ndarray:
@@ -18,12 +20,7 @@ def make_frame(rotation: np.ndarray, translation: np.ndarray) -> np.ndarray:
   Returns:
       np.ndarray: 4x4 numpy transformation array
   """
-  frame = np.eye(4)
-  frame = frame @ general.yawT(rotation[2])
-  frame = frame @ general.pitchT(rotation[1])
-  frame = frame @ general.rollT(rotation[0])
-  frame[:3, 3] = translation
-  return frame
+  return general.zyxT(rotation, translation)
 
 
 class Workspace(object):
@@ -37,6 +34,78 @@ class Workspace(object):
     self.z_max = z_max
 
 
+class IKSolverSession(object):
+  """Reusable handle on the compiled IK solver for one Fanuc
+
+  The compiled module and the parameter dict it needs (link lengths and joint
+  limits) are looked up once instead of on every call. Call refresh() after
+  changing the DH values or joint limits of the robot.
+  """
+  def __init__(self, fanuc: "Fanuc"):
+    """Import the compiled solver and build its parameters
+
+    Args:
+        fanuc (Fanuc): robot whose DH values and joint limits are used
+    """
+    import fanuc_ik  # compiled C++ extension
+    self._fanuc = fanuc
+    self._solve = fanuc_ik.calculate_ik
+    self.params = None
+    self.refresh()
+
+  def refresh(self) -> None:
+    """Rebuild the solver parameters from the robot"""
+    fanuc = self._fanuc
+    self.params = {
+        'a1': fanuc.a_1, 'a2': fanuc.a_2, 'a3': fanuc.a_3,
+        'd4': fanuc.d_4, 'd6': fanuc.d_6,
+        'limits': [(j.low_limit, j.high_limit) for j in fanuc.joints],
+    }
+
+  def solve(self, ee_frame: np.ndarray,
+            prev_joint_angles: np.ndarray) -> Tuple[bool, np.ndarray]:
+    """Solve one frame
+
+    Args:
+        ee_frame (np.ndarray): Desired 4x4 end-effector frame (float array)
+        prev_joint_angles (np.ndarray): Previous joint angles (radians, float array)
+
+    Returns:
+        Tuple[bool, np.ndarray]: (is_solution, 6-element joint angle array)
+    """
+    return self._solve(ee_frame, prev_joint_angles, self.params)
+
+  def solve_batch(self, ee_frames: np.ndarray,
+                  prev_joint_angles: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Solve a path of frames, seeding each from the previous solution
+
+    The inputs are converted once for the whole batch. A frame without a
+    solution holds the previous joint angles and the next frame is seeded
+    from those.
+
+    Args:
+        ee_frames (np.ndarray): (N,4,4) desired end-effector frames
+        prev_joint_angles (np.ndarray): (6,) joint angles before the first frame
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (N,) bool success per frame, and the
+                                       (N,6) joint angles
+    """
+    frames = np.ascontiguousarray(ee_frames, dtype=float).reshape(-1, 4, 4)
+    prev = np.array(prev_joint_angles, dtype=float)
+    success = np.zeros(len(frames), dtype=bool)
+    path = np.zeros((len(frames), 6))
+
+    solve, params = self._solve, self.params
+    for index in range(len(frames)):
+      solved, joint_angles = solve(frames[index], prev, params)
+      if solved:
+        prev = np.asarray(joint_angles, dtype=float)
+        success[index] = True
+      path[index] = prev
+    return success, path
+
+
 class Fanuc(object):
   """Fanuc class to hold the information about the Fanuc Arm"""
 
@@ -51,20 +120,42 @@ class Fanuc(object):
   def ee_frame(self) -> np.ndarray:
     """Returns the position of the end effector given the joint transforms.
 
+    Cached until one of the joints changes (see robot_components.FrameChain).
+
     Returns:
         np.ndarray: (4,4) of the final location of the end effector.
     """
-    return (self._joint_1.dh_transform @ self._joint_2.dh_transform
-            @ self._joint_3.dh_transform @ self._joint_4.dh_transform
-            @ self._joint_5.dh_transform @ self._joint_6.dh_transform)
+    return self._chain.ee_frame.copy()
+
+  @property
+  def ik_session(self) -> IKSolverSession:
+    """Compiled IK solver session, created on first use
+
+    Returns:
+        IKSolverSession: session bound to this robot
+    """
+    if self._ik_session is None:
+      self._ik_session = IKSolverSession(self)
+    return self._ik_session
 
-  def __init__(self, drawing_enabled: bool = True, swap_sign: bool = False):
-    """Initialize the class"""
+  def __init__(self, drawing_enabled: bool = True, swap_sign: bool = False,
+               collection_drawing: bool = False, blitting: bool = False):
+    """Initialize the class
+
+    Args:
+        drawing_enabled (bool, optional): draw the robot. Defaults to True.
+        swap_sign (bool, optional): flip the sign of the joint angles. Defaults to False.
+        collection_drawing (bool, optional): draw every frame and link as one
+            RobotDrawing collection instead of one artist each. Defaults to False.
+        blitting (bool, optional): cache the static axes once and only
+            redraw the robot artists on every frame. Defaults to False.
+    """
 
     self._joints = []
     self._drawn_once = False
     self._swap_sign = swap_sign
     self._drawing_enabled = drawing_enabled
+    self._collection_drawing = drawing_enabled and collection_drawing
 
     ## Fanuc link lengths in millimeters
     self.l_1_z = 1000  #[mm]
@@ -98,6 +189,11 @@ class Fanuc(object):
       self.fig = None
       self.ax  = None
 
+    # Created before any robot artist so only the empty axes count as static
+    self._blit_manager: BlitManager = None
+    if drawing_enabled and blitting:
+      self._blit_manager = BlitManager(self.ax)
+
     ## Base frame
     base_frame = make_frame([0, 0, 0], [0, 0, self.l_1_z])
     self._base_frame = Joint(self.ax)
@@ -116,9 +212,25 @@ class Fanuc(object):
     self._joint_6: Joint = None
 
     self._setup_joints(swap_sign=swap_sign)
+    self._chain = FrameChain(self.joints)
+    self._loaded_thetas = [None] * 6
+    self._loaded_revisions = [None] * 6
+    self._ik_session: IKSolverSession = None
+
+    # Link capsules for self-collision checks, sized from the link dimensions
+    self.capsule_radii = np.array([0.5 * self.a_1, 0.4 * self.a_1, 0.08 * self.a_2,
+                                   0.4 * self.a_3, 0.4 * self.a_3, 0.25 * self.d_6])
+    self.collision_pairs = np.array([(first, second) for first in range(6)
+                                     for second in range(first + 2, 6)])
 
     self._links = [Link(self.ax, self.colors[index]) for index in range(6)]
 
+    # Base frame, zero frame and six joint frames, plus the six links
+    self._robot_drawing: RobotDrawing = None
+    if self._collection_drawing:
+      self._robot_drawing = RobotDrawing(self.ax, [None, None] + self.colors[:6],
+                                         self.colors[:6])
+
     self.initialize_fanuc_drawing()
 
   def _setup_joints(self, swap_sign: bool):
@@ -170,7 +282,7 @@ class Fanuc(object):
     self._joint_6.set_dh_value_a(0.0)
     self._joint_6.set_dh_value_d(self.d_6)
 
-    if self._drawing_enabled:
+    if self._drawing_enabled and not self._collection_drawing:
       for joint in self.joints:
         joint.draw()
 
@@ -187,36 +299,331 @@ class Fanuc(object):
         print(f"input angle outside of the limit for joint {index + 1}")
         raise ValueError("input angle outside of the limit")
 
-    self._joint_1.set_theta(joint_angles[0])
-    self._joint_2.set_theta(joint_angles[1] - math.pi / 2)
-    self._joint_3.set_theta(joint_angles[2])
-    self._joint_4.set_theta(joint_angles[3])
-    self._joint_5.set_theta(joint_angles[4])
-    self._joint_6.set_theta(joint_angles[5])
+    # Only reload joints whose angle or revision (set_dh_parameters) changed;
+    # the cached prefix frames before the first changed joint are reused
+    # (see FrameChain)
+    thetas = [joint_angles[0], joint_angles[1] - math.pi / 2, joint_angles[2],
+              joint_angles[3], joint_angles[4], joint_angles[5]]
+    for index, (joint, theta) in enumerate(zip(self.joints, thetas)):
+      if (self._loaded_thetas[index] != theta or
+          self._loaded_revisions[index] != joint.revision):
+        joint.set_theta(theta)
+        self._loaded_thetas[index] = theta
+        self._loaded_revisions[index] = joint.revision
+
+  def calculate_fk_batch(self, joint_angles: np.ndarray,
+                         return_all: bool = False) -> np.ndarray:
+    """Calculate the forward kinematics for many joint configurations at once
+
+    Uses the DH parameters loaded in _setup_joints with broadcast trig and
+    stacked matrix products. The joints of the robot are not modified, so
+    this can score whole paths without disturbing the drawn configuration.
+
+    Args:
+        joint_angles (np.ndarray): (N,6) array of joint angles, one row per sample
+        return_all (bool, optional): return every link frame instead of only
+                                     the end effector. Defaults to False.
+
+    Raises:
+        ValueError: if the input is not (N,6) or any angle is out of range
+
+    Returns:
+        np.ndarray: (N,4,4) end effector frames, or (N,7,4,4) frames
+                    [T_00, T_01, ... T_06] when return_all is True
+    """
+    q = np.asarray(joint_angles, dtype=float)
+    if q.ndim != 2 or q.shape[1] != 6:
+      raise ValueError("joint_angles must be an (N,6) array")
+
+    low = np.array([joint.low_limit for joint in self.joints])
+    high = np.array([joint.high_limit for joint in self.joints])
+    outside = (q < low) | (q > high)
+    if outside.any():
+      row, col = np.argwhere(outside)[0]
+      raise ValueError(
+          f"Joint {col + 1} angle {q[row, col]} is out of range (sample {row})")
+
+    thetas = q - np.array([0, np.pi / 2, 0, 0, 0, 0])
+
+    current = np.broadcast_to(np.eye(4), (len(q), 4, 4))
+    frames = [current]
+    for index, joint in enumerate(self.joints):
+      current = current @ Joint.dh_tf_batch(joint._alpha, joint._a, joint._d,
+                                            thetas[:, index])
+      frames.append(current)
+
+    if return_all:
+      return np.stack(frames, axis=1)
+    return current
+
+  def capsule_segments(self, joint_angles: np.ndarray) -> np.ndarray:
+    """End points of the link capsules for many joint configurations
+
+    Capsules, in order: base pedestal, shoulder (a_1), upper arm (a_2), elbow
+    offset (a_3), forearm (d_4), wrist to flange (d_6).
+
+    Args:
+        joint_angles (np.ndarray): (N,6) array of joint angles, one row per sample
+
+    Returns:
+        np.ndarray: (N,6,2,3) start and end point of every capsule in mm
+    """
+    frames = self.calculate_fk_batch(joint_angles, return_all=True)
+    origins = frames[:, :, :3, 3]
+    elbow = origins[:, 3] + self.a_3 * frames[:, 3, :3, 0]
+
+    segments = np.empty((len(frames), 6, 2, 3))
+    # The turret carrying joint 2 is covered by the shoulder capsule, so the
+    # pedestal stops a_1 below joint 2
+    segments[:, 0, 0] = [0, 0, -self.l_1_z]
+    segments[:, 0, 1] = [0, 0, -self.a_1]
+    segments[:, 1] = np.stack([origins[:, 1], origins[:, 2]], axis=1)
+    segments[:, 2] = np.stack([origins[:, 2], origins[:, 3]], axis=1)
+    segments[:, 3] = np.stack([origins[:, 3], elbow], axis=1)
+    segments[:, 4] = np.stack([elbow, origins[:, 4]], axis=1)
+    segments[:, 5] = np.stack([origins[:, 5], origins[:, 6]], axis=1)
+    return segments
+
+  def self_collision_batch(self, joint_angles: np.ndarray,
+                           margin: float = 0.0) -> Tuple[np.ndarray, np.ndarray]:
+    """Check many joint configurations for the arm folding through itself
+
+    Every non-adjacent capsule pair is tested with one vectorized
+    segment-segment distance (general.segment_distance).
+
+    Args:
+        joint_angles (np.ndarray): (N,6) array of joint angles, one row per sample
+        margin (float, optional): extra clearance in mm required between
+                                  capsules. Defaults to 0.0.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (N,) bool True where a pair collides,
+                                       and the (N,) smallest clearance in mm
+    """
+    segments = self.capsule_segments(joint_angles)
+    first, second = self.collision_pairs.T
+    distance = general.segment_distance(segments[:, first, 0], segments[:, first, 1],
+                                        segments[:, second, 0], segments[:, second, 1])
+    clearance = (distance - self.capsule_radii[first] - self.capsule_radii[second]).min(axis=1)
+    return clearance < margin, clearance
+
+  def calculate_jacobian_batch(self, joint_angles: np.ndarray) -> np.ndarray:
+    """Calculate the geometric Jacobian for many joint configurations at once
+
+    Every joint is revolute about the z axis of its DH frame, so column i is
+    [z_i x (p_ee - o_i); z_i] with all frames taken from calculate_fk_batch.
+    The joints of the robot are not modified.
+
+    Args:
+        joint_angles (np.ndarray): (N,6) array of joint angles, one row per sample
+
+    Raises:
+        ValueError: if the input is not (N,6) or any angle is out of range
+
+    Returns:
+        np.ndarray: (N,6,6) Jacobians in the base frame. Rows 0-2 map joint
+                    rates to linear velocity (mm/s), rows 3-5 to angular
+                    velocity (rad/s).
+    """
+    frames = self.calculate_fk_batch(joint_angles, return_all=True)
+    axes = frames[:, 1:, :3, 2]
+    origins = frames[:, 1:, :3, 3]
+    p_ee = frames[:, -1:, :3, 3]
+
+    jacobian = np.empty((len(frames), 6, 6))
+    jacobian[:, :3, :] = np.swapaxes(np.cross(axes, p_ee - origins), 1, 2)
+    jacobian[:, 3:, :] = np.swapaxes(axes, 1, 2)
+    return jacobian
+
+  def manipulability_batch(
+      self, joint_angles: np.ndarray,
+      length_scale: float = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Singularity metrics for many joint configurations at once
+
+    The linear rows of the Jacobian are divided by length_scale so that they
+    are unitless like the angular rows before taking singular values.
+
+    Args:
+        joint_angles (np.ndarray): (N,6) array of joint angles, one row per sample
+        length_scale (float, optional): characteristic length in mm. Defaults
+                                        to the arm reach from joint 2.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]:
+            (N,) Yoshikawa manipulability (product of singular values),
+            (N,) condition number (inf at a singularity),
+            (N,) smallest singular value, the distance to singularity
+    """
+    if length_scale is None:
+      length_scale = self.a_2 + math.hypot(self.a_3, self.d_4)
+    jacobian = self.calculate_jacobian_batch(joint_angles)
+    jacobian[:, :3, :] /= length_scale
+
+    sigma = np.linalg.svd(jacobian, compute_uv=False)
+    sigma_min = sigma[:, -1]
+    manipulability = np.prod(sigma, axis=1)
+    with np.errstate(divide='ignore'):
+      condition = np.where(sigma_min > 0, sigma[:, 0] / sigma_min, np.inf)
+    return manipulability, condition, sigma_min
 
   def calculate_ik(self, ee_frame: np.ndarray,
-                   prev_joint_angles: np.ndarray) -> Tuple[bool, np.ndarray]:
+                   prev_joint_angles: np.ndarray,
+                   refine: bool = False) -> Tuple[bool, np.ndarray]:
     """Calculate the inverse kinematics of the Fanuc.
 
-    Delegates to the compiled C++ extension (fanuc_ik) for the algorithm.
+    Delegates to the compiled C++ extension (fanuc_ik) through ik_session.
 
     Args:
         ee_frame (np.ndarray): Desired 4x4 end-effector frame
         prev_joint_angles (np.ndarray): Previous joint angles (radians)
+        refine (bool, optional): if the compiled solver finds no solution, try
+                                 refine_ik_batch warm-started from prev_joint_angles.
+                                 Defaults to False.
 
     Returns:
         Tuple[bool, np.ndarray]: (is_solution, 6-element joint angle array)
     """
-    import fanuc_ik  # compiled C++ extension
-    params = {
-        'a1': self.a_1, 'a2': self.a_2, 'a3': self.a_3,
-        'd4': self.d_4, 'd6': self.d_6,
-        'limits': [(j.low_limit, j.high_limit) for j in self.joints],
-    }
-    return fanuc_ik.calculate_ik(
+    solved, joint_angles = self.ik_session.solve(
         np.asarray(ee_frame, dtype=float),
-        np.asarray(prev_joint_angles, dtype=float),
-        params)
+        np.asarray(prev_joint_angles, dtype=float))
+    if not solved and refine:
+      converged, refined = self.refine_ik_batch(
+          np.asarray(ee_frame, dtype=float)[None], prev_joint_angles)
+      if converged[0]:
+        return True, refined[0]
+    return solved, joint_angles
+
+  def refine_ik_batch(self, ee_frames: np.ndarray, seeds: np.ndarray,
+                      iterations: int = 20, damping: float = 0.05,
+                      tolerance: float = 1e-3) -> Tuple[np.ndarray, np.ndarray]:
+    """Refine IK numerically with damped least squares, warm-started from seeds
+
+    Every row takes the step J^T (J J^T + damping^2 I)^-1 e from the batched
+    Jacobian, with the linear rows scaled by the arm reach so position and
+    rotation errors weigh alike, and is clamped back into the joint limits.
+    Rows stop updating once they are within tolerance. The damping keeps the
+    step bounded at singular wrists where the analytic solution is
+    ill-defined. The joints of the robot are not modified.
+
+    Args:
+        ee_frames (np.ndarray): (N,4,4) desired end effector frames
+        seeds (np.ndarray): (6,) or (N,6) starting joint angles, e.g. an
+                            analytic solution or the previous sample
+        iterations (int, optional): max number of steps. Defaults to 20.
+        damping (float, optional): damping factor. Defaults to 0.05.
+        tolerance (float, optional): max position (mm) and rotation (rad)
+                                     error. Defaults to 1e-3.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (N,) bool converged per frame, and the
+                                       (N,6) refined joint angles
+    """
+    frames = np.asarray(ee_frames, dtype=float).reshape(-1, 4, 4)
+    low = np.array([joint.low_limit for joint in self.joints])
+    high = np.array([joint.high_limit for joint in self.joints])
+    q = np.clip(np.broadcast_to(np.asarray(seeds, dtype=float), (len(frames), 6)),
+                low, high)
+    length_scale = self.a_2 + math.hypot(self.a_3, self.d_4)
+
+    converged = np.zeros(len(frames), dtype=bool)
+    active = np.arange(len(frames))
+    for step in range(iterations + 1):
+      T = self.calculate_fk_batch(q[active])
+      pos_err = frames[active, :3, 3] - T[:, :3, 3]
+      R_err = frames[active, :3, :3] @ np.swapaxes(T[:, :3, :3], 1, 2)
+      rot_err = 0.5 * np.stack([R_err[:, 2, 1] - R_err[:, 1, 2],
+                                R_err[:, 0, 2] - R_err[:, 2, 0],
+                                R_err[:, 1, 0] - R_err[:, 0, 1]], axis=1)
+
+      # The skew part only steers the step, it vanishes for a 180 deg error
+      position_distance, rotation_angle = se3.pose_distance(frames[active], T)
+      done = (position_distance <= tolerance) & (rotation_angle <= tolerance)
+      converged[active[done]] = True
+      active, pos_err, rot_err = active[~done], pos_err[~done], rot_err[~done]
+      if len(active) == 0 or step == iterations:
+        break
+
+      jacobian = self.calculate_jacobian_batch(q[active])
+      jacobian[:, :3, :] /= length_scale
+      error = np.concatenate([pos_err / length_scale, rot_err], axis=1)
+      JJt = jacobian @ np.swapaxes(jacobian, 1, 2) + damping**2 * np.eye(6)
+      dq = np.swapaxes(jacobian, 1, 2) @ np.linalg.solve(JJt, error[..., None])
+      q[active] = np.clip(q[active] + dq[..., 0], low, high)
+
+    return converged, q
+
+  def calculate_cartesian_path(
+      self, start_frame: np.ndarray, end_frame: np.ndarray,
+      prev_joint_angles: np.ndarray, speed: float, sample_period: float,
+      angular_speed: float = math.radians(80), refine: bool = False,
+      max_joint_speed: float = math.radians(80),
+      max_joint_step: float = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Joint angles moving the end effector straight from one frame to another
+
+    The end effector position moves along the line at speed and the rotation
+    follows the SLERP arc at no more than angular_speed, sampled every
+    sample_period seconds (se3.interpolate). The start frame
+    itself is not included, the end frame is the last sample. A sample whose
+    joints move more than max_joint_step from the sample before it (a wrist
+    flip onto another IK branch, or a move faster than the joints allow)
+    counts as failed.
+
+    Args:
+        start_frame (np.ndarray): (4,4) current end effector frame
+        end_frame (np.ndarray): (4,4) desired end effector frame
+        prev_joint_angles (np.ndarray): (6,) joint angles at start_frame
+        speed (float): Cartesian speed of the end effector in mm/s
+        sample_period (float): time between samples in s
+        angular_speed (float, optional): max rotation rate in rad/s.
+                                         Defaults to 80 deg/s.
+        refine (bool, optional): retry samples the compiled solver cannot solve
+                                 with refine_ik_batch. Defaults to False.
+        max_joint_speed (float, optional): joint rate limit in rad/s used for
+                                           the default max_joint_step.
+                                           Defaults to 80 deg/s.
+        max_joint_step (float, optional): largest joint change in rad allowed
+                                          between samples. Defaults to
+                                          max_joint_speed * sample_period,
+                                          4 deg at 80 deg/s and 0.05 s.
+
+    Raises:
+        ValueError: if a speed, the sample period or max_joint_step is not
+                    positive
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (M,) bool success per sample, and the
+                                       (M,6) joint angles. A failed sample
+                                       holds the previous joint angles.
+    """
+    if speed <= 0 or angular_speed <= 0 or max_joint_speed <= 0:
+      raise ValueError("speed, angular_speed and max_joint_speed must be positive")
+    if sample_period <= 0:
+      raise ValueError("sample_period must be positive")
+    if max_joint_step is None:
+      max_joint_step = max_joint_speed * sample_period
+    elif max_joint_step <= 0:
+      raise ValueError("max_joint_step must be positive")
+
+    distance = np.linalg.norm(end_frame[:3, 3] - start_frame[:3, 3])
+    angle = np.linalg.norm(se3.so3_log(start_frame[:3, :3].T @ end_frame[:3, :3]))
+    n_samples = max(1, int(math.ceil(max(distance / (speed * sample_period),
+                                         angle / (angular_speed * sample_period)))))
+    frames = se3.interpolate(start_frame, end_frame, np.arange(1, n_samples + 1) / n_samples)
+
+    # Seed every sample from the previous one
+    success, path = self.ik_session.solve_batch(frames, prev_joint_angles)
+
+    # Refine every failed sample together, warm-started from the sample before it
+    if refine and not success.all():
+      failed = np.flatnonzero(~success)
+      converged, refined = self.refine_ik_batch(frames[failed], path[failed])
+      path[failed[converged]] = refined[converged]
+      success[failed] = converged
+
+    # Reject samples that jump onto another branch instead of moving smoothly
+    previous = np.vstack([np.asarray(prev_joint_angles, dtype=float)[None], path[:-1]])
+    success &= np.abs(path - previous).max(axis=1) <= max_joint_step
+    return success, path
 
   def _create_plot(self):
     if not self._drawing_enabled:
@@ -241,11 +648,13 @@ class Fanuc(object):
     print("initialized fanuc drawing")
     self._drawn_once = True
 
-  def draw_fanuc(self, joint_angles: np.ndarray) -> np.ndarray:
+  def draw_fanuc(self, joint_angles: np.ndarray, flush: bool = True) -> np.ndarray:
     """Draw the Fanuc in the provided configuration.
 
     Args:
         joint_angles (np.ndarray): 6x1 array of the desired joint angles.
+        flush (bool, optional): push the frame to the screen. Subclasses that
+            draw more on top pass False and call flush_drawing. Defaults to True.
     """
     if not self._drawing_enabled:
       return
@@ -254,6 +663,12 @@ class Fanuc(object):
 
     self.calculate_fk(joint_angles)
 
+    if self._robot_drawing is not None:
+      current_transform = self._draw_robot_collection()
+      if flush:
+        self.flush_drawing()
+      return current_transform
+
     self._base_frame.draw()
     self._zero_frame.draw()
 
@@ -271,6 +686,31 @@ class Fanuc(object):
         joint.draw()
         self._links[index].draw()
 
-    self.fig.canvas.draw()
-    self.fig.canvas.flush_events()
+    if flush:
+      self.flush_drawing()
     return current_transform
+
+  def flush_drawing(self) -> None:
+    """Push the current artists to the screen, blitting when enabled"""
+    if self._blit_manager is not None:
+      self._blit_manager.update()
+    else:
+      self.fig.canvas.draw()
+      self.fig.canvas.flush_events()
+
+  def _draw_robot_collection(self) -> np.ndarray:
+    """Draw the frames and links through the single RobotDrawing collection
+
+    Returns:
+        np.ndarray: (4,4) end effector frame including the base offset
+    """
+    base = self._base_frame.dh_transform
+    joint_frames = base @ np.array(self._chain.frames)
+    for joint, frame in zip(self.joints, joint_frames):
+      joint.set_final_transform(frame)
+
+    link_frames = np.concatenate([base[None], joint_frames])
+    self._robot_drawing.update_frames(
+        np.concatenate([base[None], np.eye(4)[None], joint_frames]), link_frames)
+    self._robot_drawing.draw()
+    return joint_frames[-1]
@@ -4,15 +4,24 @@ from typing import List
 
 from fanuc_provided import Fanuc
 from robot_components import Brush
+from drawing_helper import PlaybackScheduler, TimelineScrubber
 import general_utility as general
 
-import matplotlib.pyplot as plt
-
 class Picasso(Fanuc):
-  def __init__(self, swap_sign: bool = False, drawing_enabled: bool = True):
-    super().__init__(swap_sign=swap_sign, drawing_enabled=drawing_enabled)
+  def __init__(self, swap_sign: bool = False, drawing_enabled: bool = True,
+               collection_drawing: bool = False, blitting: bool = False):
+    super().__init__(swap_sign=swap_sign, drawing_enabled=drawing_enabled,
+                     collection_drawing=collection_drawing, blitting=blitting)
     ## Fanuc brush selection
     self.brush = Brush(self.ax)
+
+    ## Cartesian motion used for brush changes
+    self.cartesian_speed = 200.0  # mm/s
+    self.sample_period = 0.05     # s between path samples
+    self.max_joint_speed = np.radians(80.0)  # rad/s, 4 deg per path sample
+
+    ## Fall back to damped least squares IK when the analytic solver fails
+    self.refine_ik = False
     
 
   def draw_picasso(self, joint_angles: np.ndarray) -> None:
@@ -24,13 +33,13 @@ class Picasso(Fanuc):
     if not self._drawing_enabled:
       return
     
-    ee_frame = super().draw_fanuc(joint_angles)
+    ee_frame = super().draw_fanuc(joint_angles, flush=False)
 
-    # draw the brush at the end
+    # draw the brush at the end, then push robot and brush in one frame
     self.brush.update_tool_frame(ee_frame)
     self.brush.show_enabled()
     self.brush.paint()
-    plt.pause(0.00001)
+    self.flush_drawing()
 
   def get_ee_pose_from_brush(self, rotation: np.ndarray,
                              brush_pose: np.ndarray) -> np.ndarray:
@@ -57,9 +66,8 @@ class Picasso(Fanuc):
     T_brush[:3, :3] = rotation      
     T_brush[:3, 3] = brush_pose     
 
-    # The brush tip is offset from the end effector frame by a fixed transform (T_brush_dh) that depends on the selected brush.
-    T_brush_dh = self.brush.selected_brush_frame_dh
-    ee_pose = T_brush @ np.linalg.inv(T_brush_dh)
+    # The brush tip is offset from the end effector frame by a fixed transform that depends on the selected brush.
+    ee_pose = self.brush.ee_frames_from_brush(T_brush[None])[0]
     return ee_pose
   
   def calculate_picasso_path(self, starting_angles: np.ndarray, path: str) -> List[np.ndarray]:
@@ -79,7 +87,7 @@ class Picasso(Fanuc):
         List[np.ndarray]: List of 7x1 numpy arrays of joint angles and brush color to draw the path
     """
     # Load waypoint data (x, y, z positions and color index per point) from the YAML file
-    data = general.get_data_from_yaml(path)
+    data = general.load_path_columns(path)
     output_path = []
 
     x_vals = data['x']
@@ -90,6 +98,12 @@ class Picasso(Fanuc):
     # Keep the brush orientation fixed 
     rotation = np.eye(3)
 
+    # End effector pose of every waypoint in one batch, each with its own brush offset
+    brush_frames = np.tile(np.eye(4), (len(x_vals), 1, 1))
+    brush_frames[:, :3, :3] = rotation
+    brush_frames[:, :3, 3] = np.column_stack([x_vals, y_vals, z_vals])
+    ee_poses = self.brush.ee_frames_from_brush(brush_frames, colors)
+
     # Track the previous joint angles for IK seeding and smooth interpolation
     prev_angles = np.array(starting_angles, dtype=float)
     # Track the previous color to detect brush color changes 
@@ -97,32 +111,39 @@ class Picasso(Fanuc):
 
     for i in range(len(x_vals)):
       color = int(colors[i])
-      brush_pose = np.array([x_vals[i], y_vals[i], z_vals[i]], dtype=float)
+      ee_pose = ee_poses[i]
 
       if color != prev_color and prev_color != 0:
-        # Select the new brush color and solve IK for the target pose
+        # Select the new brush color and move the end effector there in a straight line
         self.brush.selection = color
-        ee_pose = self.get_ee_pose_from_brush(rotation, brush_pose)
-        success, q_new = self.calculate_ik(ee_pose, prev_angles)
-        if not success:
-          # If IK fails, stay at the current configuration rather than making a bad jump
-          q_new = prev_angles.copy()
-
-        # Compute how many interpolation steps are needed so no joint moves more than 4 deg per step
-        max_diff_deg = np.degrees(np.max(np.abs(q_new - prev_angles)))
-        n_steps = max(1, int(np.ceil(max_diff_deg / 4.0)))
-        for step in range(1, n_steps + 1):
-          alpha = step / n_steps
-          q_interp = prev_angles + alpha * (q_new - prev_angles)
-          output_path.append(np.array([*q_interp, 0]))
-        prev_angles = q_new
-
-      # Select the current brush color and compute the EE pose for this waypoint
+        start_frame = self.calculate_fk_batch(prev_angles[None])[0]
+        solved, segment = self.calculate_cartesian_path(
+            start_frame, ee_pose, prev_angles, self.cartesian_speed, self.sample_period,
+            refine=self.refine_ik, max_joint_speed=self.max_joint_speed)
+        if solved.all():
+          output_path.extend(np.array([*q_step, 0]) for q_step in segment)
+          prev_angles = segment[-1]
+        else:
+          # Fall back to joint space if the line leaves the workspace or flips the wrist
+          success, q_new = self.calculate_ik(ee_pose, prev_angles, self.refine_ik)
+          if not success:
+            # If IK fails, stay at the current configuration rather than making a bad jump
+            q_new = prev_angles.copy()
+
+          # Compute how many interpolation steps are needed so no joint moves faster than max_joint_speed
+          max_diff = np.max(np.abs(q_new - prev_angles))
+          n_steps = max(1, int(np.ceil(max_diff / (self.max_joint_speed * self.sample_period))))
+          for step in range(1, n_steps + 1):
+            alpha = step / n_steps
+            q_interp = prev_angles + alpha * (q_new - prev_angles)
+            output_path.append(np.array([*q_interp, 0]))
+          prev_angles = q_new
+
+      # Select the current brush color for this waypoint
       self.brush.selection = color
-      ee_pose = self.get_ee_pose_from_brush(rotation, brush_pose)
 
       # Solve IK seeded from the previous joint angles to keep the motion smooth
-      success, joint_angles = self.calculate_ik(ee_pose, prev_angles)
+      success, joint_angles = self.calculate_ik(ee_pose, prev_angles, self.refine_ik)
       if success:
         prev_angles = joint_angles
       # Append the [q1..q6, color] vector for this waypoint
@@ -131,19 +152,104 @@ class Picasso(Fanuc):
 
     return output_path
 
-  def draw_picasso_path(self, starting_angles: np.ndarray, path: str) -> None:
+  def draw_picasso_path(self, starting_angles: np.ndarray, path: str,
+                        real_time: bool = False, speed: float = 1.0) -> None:
     """Draw the fanuc moving through a desired path
 
     Args:
         starting_angles (np.ndarray): 1x6 starting angles of the robot 
         path (str): full length path from your home directory to the file 
                     eg "/home/lcfarrell/ME_498/lab2/test_paths/prism.yaml"
+        real_time (bool, optional): play one path sample per sample_period of
+            wall clock time, dropping poses when drawing falls behind, and
+            print the achieved fps. Defaults to False, which draws every pose.
+        speed (float, optional): real time playback speed. Defaults to 1.
     """
 
-    path_to_draw = self.calculate_picasso_path(starting_angles, path)
-    for angles in path_to_draw:
-      self.brush.selection = int(angles[6])
-      self.draw_picasso(np.array(angles[:6]))
+    path_to_draw = np.array(self.calculate_picasso_path(starting_angles, path))
+    if not real_time:
+      for angles in path_to_draw:
+        self.brush.selection = int(angles[6])
+        self.draw_picasso(np.array(angles[:6]))
+      return
+
+    scheduler = PlaybackScheduler.from_period(len(path_to_draw), self.sample_period, speed)
+    previous = -1
+    for index in scheduler:
+      self._paint_skipped(path_to_draw[previous + 1:index])
+      self.brush.selection = int(path_to_draw[index, 6])
+      self.draw_picasso(path_to_draw[index, :6])
+      previous = index
+    print(scheduler.report())
+
+  def scrub_picasso_path(self, starting_angles: np.ndarray, path: str) -> TimelineScrubber:
+    """Precompute a whole path and browse it with a slider
+
+    All frames come from one batched FK pass and are kept as float32; the
+    slider (or the left/right keys) jumps to any pose, with the brush and the
+    paint left up to that pose. Call plt.show() afterwards to interact.
+
+    Args:
+        starting_angles (np.ndarray): 1x6 starting angles of the robot 
+        path (str): full length path from your home directory to the file 
+
+    Raises:
+        ValueError: if the Picasso was not created with drawing_enabled and
+                    collection_drawing
+
+    Returns:
+        TimelineScrubber: the scrubber, showing the first pose
+    """
+    if self._robot_drawing is None:
+      raise ValueError("scrubbing needs Picasso(drawing_enabled=True, collection_drawing=True)")
+
+    path_to_draw = np.array(self.calculate_picasso_path(starting_angles, path))
+    joint_angles = path_to_draw[:, :6]
+    colors = path_to_draw[:, 6].astype(int)
+
+    # [base, T_01 ... T_06] on the base frame, plus the zero frame as drawn
+    chain = self._base_frame.dh_transform @ self.calculate_fk_batch(joint_angles, return_all=True)
+    zero = np.broadcast_to(np.eye(4), (len(chain), 1, 4, 4))
+    frames = np.concatenate([chain[:, :1], zero, chain[:, 1:]], axis=1)
+
+    def show_brush(index: int) -> None:
+      self.brush.selection = int(colors[index])
+      self.brush.update_tool_frame(chain[index, -1])
+      self.brush.show_enabled()
+
+    scrubber = TimelineScrubber(self.ax, self._robot_drawing, frames,
+                                link_indices=[0, 2, 3, 4, 5, 6, 7],
+                                times=np.arange(len(frames)) * self.sample_period,
+                                on_show=show_brush)
+
+    painted = np.flatnonzero(colors != 0)
+    tips = self.brush.brush_tip_frames(chain[painted, -1], colors[painted])[:, :3, 3]
+    for color in np.unique(colors[painted]):
+      self.brush.selection = int(color)
+      selected = colors[painted] == color
+      scrubber.add_paint(self.brush.selected_color, painted[selected], tips[selected],
+                         markersize=10)
+    scrubber.show(0)
+    return scrubber
+
+  def _paint_skipped(self, skipped: np.ndarray) -> None:
+    """Leave the paint of poses dropped by real time playback
+
+    Args:
+        skipped (np.ndarray): (N,7) skipped [q1..q6, color] rows
+    """
+    if not self._drawing_enabled or len(skipped) == 0:
+      return
+    colors = skipped[:, 6].astype(int)
+    painted = colors != 0
+    if not painted.any():
+      return
+    # Drawn frames sit on the base frame, like draw_fanuc
+    ee_frames = self._base_frame.dh_transform @ self.calculate_fk_batch(skipped[painted, :6])
+    tips = self.brush.brush_tip_frames(ee_frames, colors[painted])[:, :3, 3]
+    for color in np.unique(colors[painted]):
+      self.brush.selection = int(color)
+      self.brush.paint_at(tips[colors[painted] == color])
 
 if __name__ == "__main__":
   picasso = Picasso(swap_sign=False, drawing_enabled=True)
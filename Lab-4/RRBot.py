@@ -5,7 +5,8 @@ import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d import Axes3D
 from copy import deepcopy
 
-from robot_components import Link, Joint
+from robot_components import Link, Joint, FrameChain
+from drawing_helper import BlitManager
 import general_utility as general
 
 TAU_MAX = 100.0  # N·m — maximum allowable torque per joint
@@ -42,6 +43,7 @@ class Workspace(object):
 
 class JointState(object):
   """Holds position, velocity, and acceleration for a single joint."""
+  __slots__ = ("_pos", "_vel", "_accel")
 
   @property
   def pos(self):
@@ -103,15 +105,18 @@ class RRBot(object):
 
   @property
   def ee_frame(self) -> np.ndarray:
-    """End-effector frame as the product of joint DH transforms."""
-    return self._joint_1.dh_transform @ self._joint_2.dh_transform
+    """End-effector frame as the product of joint DH transforms (cached)."""
+    return self._chain.ee_frame.copy()
 
-  def __init__(self, drawing_enabled: bool = True) -> None:
+  def __init__(self, drawing_enabled: bool = True,
+               blitting: bool = False) -> None:
     """Initialize the RR robot.
 
     Args:
         drawing_enabled (bool): If True, create a Matplotlib figure and
                                 draw the robot during simulation.
+        blitting (bool): If True, cache the static axes once and only redraw
+                         the robot artists on every frame. Defaults to False.
     """
     self._drawing_enabled = drawing_enabled
     self._drawn_once = False
@@ -183,13 +188,17 @@ class RRBot(object):
 
     self.fig = None
     self.ax = None
+    self._blit_manager = None
     if self._drawing_enabled:
       self._create_plot()
+      if blitting:
+        self._blit_manager = BlitManager(self.ax)
 
     self._joint_1 = None
     self._joint_2 = None
     self._joint_ee = None
     self._setup_joints()
+    self._chain = FrameChain([self._joint_1, self._joint_2])
 
     if self._drawing_enabled:
       self._links = [Link(self.ax, self.colors[i]) for i in range(3)]
@@ -532,7 +541,10 @@ class RRBot(object):
       self._links[index].update_frames(prev_transform, current_transform)
       self._links[index].draw()
 
-    plt.pause(0.001)
+    if self._blit_manager is not None:
+      self._blit_manager.update()
+    else:
+      plt.pause(0.001)
 
   def plot_energy_summary(self, label: str = "") -> None:
     """Print an energy summary and display a KE / PE / E_total plot.
@@ -5,7 +5,8 @@ import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d import Axes3D
 from copy import deepcopy
 
-from robot_components import Link, Joint, RobotPayload
+from robot_components import Link, Joint, RobotPayload, FrameChain
+from drawing_helper import BlitManager, RobotDrawing
 import general_utility as general
 
 
@@ -248,11 +249,12 @@ class RobBase(object):
   def ee_frame(self) -> np.ndarray:
     """End-effector pose as the product of all joint DH transforms.
 
+    The product is cached until a joint position changes.
+
     Returns:
         np.ndarray: 4×4 homogeneous transform
     """
-    return (self._joint_1.dh_transform @ self._joint_2.dh_transform @
-            self._joint_3.dh_transform @ self._joint_ee.dh_transform)
+    return self._chain.ee_frame.copy()
 
   @property
   def tool_tip(self) -> np.ndarray:
@@ -270,7 +272,7 @@ class RobBase(object):
     Returns:
         np.ndarray: (3,) position vector
     """
-    return self.ee_frame[0:3, 3]
+    return self._chain.ee_frame[0:3, 3].copy()
 
   @property
   def ee_rotation(self) -> np.ndarray:
@@ -279,16 +281,23 @@ class RobBase(object):
     Returns:
         np.ndarray: 3×3 rotation matrix
     """
-    return self.ee_frame[0:3, 0:3]
+    return self._chain.ee_frame[0:3, 0:3].copy()
 
-  def __init__(self, drawing_enabled: bool = True):
+  def __init__(self, drawing_enabled: bool = True,
+               collection_drawing: bool = False, blitting: bool = False):
     """Initialize the robot.
 
     Args:
         drawing_enabled (bool): If True, create Matplotlib figure and draw
                                 the robot during simulation. Defaults to True.
+        collection_drawing (bool): If True, draw every frame and link as one
+                                   RobotDrawing collection instead of one
+                                   artist each. Defaults to False.
+        blitting (bool): If True, cache the static axes once and only redraw
+                         the robot artists on every frame. Defaults to False.
     """
     self._drawing_enabled = drawing_enabled
+    self._collection_drawing = drawing_enabled and collection_drawing
     self._drawn_once = False
     self._frame_size = 75.0
     self.colors = [[1, 0, 0], [0, 1, 0], [0, 0, 1], [0.5, 0.5, 0]]
@@ -315,14 +324,18 @@ class RobBase(object):
     self.fig = None
     self.ax = None
     self._robot_payload = None
+    self._blit_manager = None
     if self._drawing_enabled:
       self._create_plot()
+      if blitting:
+        self._blit_manager = BlitManager(self.ax)
 
     self._joint_1 = None
     self._joint_2 = None
     self._joint_3 = None
     self._joint_ee = None
     self._setup_joints()
+    self._chain = FrameChain(self.joints)
 
     self._joint_1_des = 0.0
     self._joint_2_des = 0.0
@@ -339,6 +352,12 @@ class RobBase(object):
       self._links = None
       self._base_frame = None
 
+    # Base frame and the four joint frames, plus the four links
+    self._robot_drawing = None
+    if self._collection_drawing:
+      self._robot_drawing = RobotDrawing(self.ax, [None] * 5, self.colors,
+                                         frame_size=self._frame_size)
+
   def calculate_parameters(self):
     """Compute derived inertia and COM parameters from link masses/lengths."""
     # Distance from frame 3 origin to link 3 COM [mm]
@@ -380,7 +399,7 @@ class RobBase(object):
     self._joint_ee.set_joint_limits(-math.pi, math.pi)
     self._joint_ee.set_dh_parameters(0, math.pi / 2, self.l3, 0)
 
-    if self._drawing_enabled:
+    if self._drawing_enabled and not self._collection_drawing:
       for joint in self.joints:
         joint.draw()
 
@@ -408,6 +427,44 @@ class RobBase(object):
     self._joint_2.pos = joint_angles[1]
     self._joint_3.pos = joint_angles[2] + math.pi / 2
 
+  def calculate_fk_batch(self, joint_angles: np.ndarray,
+                         return_all: bool = False) -> np.ndarray:
+    """Forward kinematics for many joint configurations at once.
+
+    Uses the same DH parameters and joint 3 offset as calculate_fk with
+    broadcast trig and stacked matrix products. The joints are not modified.
+
+    Args:
+        joint_angles (np.ndarray): (N,3) array [θ1, θ2, θ3] per sample, radians.
+        return_all (bool): return every chain frame instead of only the end
+                           effector. Defaults to False.
+
+    Raises:
+        ValueError: if the input is not (N,3)
+
+    Returns:
+        np.ndarray: (N,4,4) end-effector frames, or (N,5,4,4) frames
+                    [T_00, T_01, T_02, T_03, T_0ee] when return_all is True
+    """
+    q = np.asarray(joint_angles, dtype=float)
+    if q.ndim != 2 or q.shape[1] != 3:
+      raise ValueError("joint_angles must be an (N,3) array")
+
+    # Joint positions as set by calculate_fk; the EE frame never moves
+    positions = np.column_stack([q[:, 0], q[:, 1], q[:, 2] + math.pi / 2,
+                                 np.full(len(q), self._joint_ee.pos)])
+
+    current = np.broadcast_to(np.eye(4), (len(q), 4, 4))
+    frames = [current]
+    for index, joint in enumerate(self.joints):
+      current = current @ Joint.dh_tf_batch(joint._alpha, joint._a, joint._d,
+                                            positions[:, index] + joint._theta_offset)
+      frames.append(current)
+
+    if return_all:
+      return np.stack(frames, axis=1)
+    return current
+
   def draw_rob(self, joint_angles: np.ndarray) -> None:
     """Render the robot at the given joint angles.
 
@@ -425,6 +482,11 @@ class RobBase(object):
       plt.pause(0.5)
       self._drawn_once = True
 
+    if self._robot_drawing is not None:
+      self._draw_robot_collection()
+      self._flush_drawing()
+      return
+
     self._base_frame.draw()
     current_transform = self._base_frame.dh_transform
 
@@ -436,7 +498,25 @@ class RobBase(object):
       self._links[index].update_frames(prev_transform, current_transform)
       self._links[index].draw()
 
-    plt.pause(0.001)
+    self._flush_drawing()
+
+  def _flush_drawing(self) -> None:
+    """Show the drawn frame, blitting when enabled."""
+    if self._blit_manager is not None:
+      self._blit_manager.update()
+    else:
+      plt.pause(0.001)
+
+  def _draw_robot_collection(self) -> None:
+    """Draw the frames and links through the single RobotDrawing collection."""
+    base = self._base_frame.dh_transform
+    joint_frames = base @ np.array(self._chain.frames)
+    for joint, frame in zip(self.joints, joint_frames):
+      joint.set_final_transform(frame)
+
+    frames = np.concatenate([base[None], joint_frames])
+    self._robot_drawing.update_frames(frames, frames)
+    self._robot_drawing.draw()
 
   def calculate_ik(self, desired_pose: np.ndarray,
                    prev_joint_angle: np.ndarray) -> Tuple[bool, np.ndarray]:
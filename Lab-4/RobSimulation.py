@@ -12,6 +12,7 @@ import numpy as np
 
 from RobBase import RobBase, Trajectory
 from rob_data import MotionData, Data
+from drawing_helper import PlaybackScheduler, TimelineScrubber
 
 DRAW_EVERY = 10   # replay every N timesteps in _draw_simulation
 
@@ -24,12 +25,16 @@ class RobSimulation(RobBase):
     get_rob_torque(theta, theta_dot, t) -> np.ndarray (3,)
   """
 
-  def __init__(self, drawing_enabled=True):
-    super().__init__(drawing_enabled=drawing_enabled)
+  def __init__(self, drawing_enabled=True, collection_drawing=False,
+               blitting=False, real_time=False):
+    super().__init__(drawing_enabled=drawing_enabled,
+                     collection_drawing=collection_drawing, blitting=blitting)
+    self._real_time = real_time   # replay on the wall clock instead of DRAW_EVERY
     self._traj     = None
     self._data     = Data()
     self._dt       = 0.01        # integration timestep [s]
     self._last_tau = np.zeros(3) # most recent torque — used by _calculate_rob_dynamics
+    self._events   = None        # (waypoints, pickup_step, drop_step) of the last run
 
   # ── Subclass interface ───────────────────────────────────────────────────────
 
@@ -91,6 +96,9 @@ class RobSimulation(RobBase):
     """Replay the recorded simulation data as a frame-by-frame animation.
 
     Called only when drawing_enabled=True.  Never touches the physics.
+    With real_time=True the replay follows the recorded timestamps on the
+    wall clock, dropping steps when drawing falls behind, and prints the
+    achieved fps; otherwise every DRAW_EVERY-th step is drawn.
 
     Args:
         waypoints (np.ndarray): (4, 3) EE waypoints — used for payload position.
@@ -101,28 +109,73 @@ class RobSimulation(RobBase):
       self._robot_payload.set_position(waypoints[1])
       self._robot_payload.enable()
 
+    if self._real_time:
+      scheduler = PlaybackScheduler(self._data.times)
+      for step in scheduler:
+        self._draw_step(step, self._data[step], waypoints, pickup_step, drop_step)
+      print(scheduler.report())
+      return
+
     for step, motion in enumerate(self._data):
       if step % DRAW_EVERY != 0:
         continue
+      self._draw_step(step, motion, waypoints, pickup_step, drop_step)
+
+  def _draw_step(self, step, motion, waypoints, pickup_step, drop_step):
+    """Draw the robot and payload of one recorded simulation step."""
+    self.draw_rob(motion.theta)
+    self._place_payload(step, motion.ee_frame[:3, 3], waypoints, pickup_step, drop_step)
+
+  def _place_payload(self, step, ee_pos, waypoints, pickup_step, drop_step):
+    """Move the payload to where it is at a recorded step."""
+    if self._robot_payload is None:
+      return
+    if pickup_step >= 0 and drop_step >= 0:
+      if step < pickup_step:
+        self._robot_payload.set_position(waypoints[1])
+      elif step < drop_step:
+        self._robot_payload.set_position(ee_pos)
+      else:
+        self._robot_payload.set_position(waypoints[2])
+    elif pickup_step >= 0 and step >= pickup_step:
+      self._robot_payload.set_position(ee_pos)
+    else:
+      self._robot_payload.set_position(waypoints[1])
+    self._robot_payload.draw()
+
+  def scrub_simulation(self):
+    """Browse the recorded simulation with a slider.
 
-      theta  = motion.theta
-      ee_pos = motion.ee_frame[:3, 3]
+    Every chain frame of every step comes from one calculate_fk_batch call
+    and is kept as float32, so any step can be shown instantly instead of
+    replaying the run. Needs drawing_enabled and collection_drawing; call
+    plt.show() afterwards to interact.
 
-      self.draw_rob(theta)
+    Raises:
+        ValueError: if nothing was simulated or collection drawing is off
 
-      if self._robot_payload is not None:
-        if pickup_step >= 0 and drop_step >= 0:
-          if step < pickup_step:
-            self._robot_payload.set_position(waypoints[1])
-          elif step < drop_step:
-            self._robot_payload.set_position(ee_pos)
-          else:
-            self._robot_payload.set_position(waypoints[2])
-        elif pickup_step >= 0 and step >= pickup_step:
-          self._robot_payload.set_position(ee_pos)
-        else:
-          self._robot_payload.set_position(waypoints[1])
-        self._robot_payload.draw()
+    Returns:
+        TimelineScrubber: the scrubber, showing the first step
+    """
+    if self._robot_drawing is None:
+      raise ValueError("scrubbing needs drawing_enabled=True, collection_drawing=True")
+    if len(self._data) == 0:
+      raise ValueError("no recorded simulation to scrub, run simulate_rob first")
+
+    frames = self.calculate_fk_batch(self._data.thetas, return_all=True)
+
+    def show_payload(step):
+      if self._events is None:
+        return
+      waypoints, pickup_step, drop_step = self._events
+      self._place_payload(step, frames[step, -1, :3, 3], waypoints, pickup_step, drop_step)
+
+    if self._events is not None and self._robot_payload is not None:
+      self._robot_payload.enable()
+    scrubber = TimelineScrubber(self.ax, self._robot_drawing, frames,
+                                times=self._data.times, on_show=show_payload)
+    scrubber.show(0)
+    return scrubber
 
 
   def simulate_rob(self, waypoints):
@@ -143,6 +196,8 @@ class RobSimulation(RobBase):
                                            np.asarray(waypoints, dtype=float))
     for r in result["records"]:
       self._data.append(r)
+    self._events = (np.asarray(waypoints, dtype=float),
+                    result["pickup_step"], result["drop_step"])
     if self._drawing_enabled:
       self._draw_simulation(waypoints,
                             result["pickup_step"],
@@ -19,8 +19,11 @@ from RobSimulation import RobSimulation
 
 class RobStudent(RobSimulation):
 
-  def __init__(self, drawing_enabled=True):
-    super().__init__(drawing_enabled=drawing_enabled)
+  def __init__(self, drawing_enabled=True, collection_drawing=False,
+               blitting=False, real_time=False):
+    super().__init__(drawing_enabled=drawing_enabled,
+                     collection_drawing=collection_drawing, blitting=blitting,
+                     real_time=real_time)
     self._ik_angles = None
     self._home_waypoint = None
     self._int_err = np.zeros(3)
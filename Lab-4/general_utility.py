@@ -1,7 +1,20 @@
 import numpy as np
 import math
+import re
 import yaml
 
+# libyaml parser when PyYAML was built with it, about 8x faster than pure Python
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Column types of the known path schemas, x/y/z/color paths and j1..j6 joint paths
+PATH_COLUMN_DTYPES = {"x": np.float64, "y": np.float64, "z": np.float64, "color": np.int64,
+                      "j1": np.float64, "j2": np.float64, "j3": np.float64,
+                      "j4": np.float64, "j5": np.float64, "j6": np.float64}
+PATH_SCHEMAS = (("x", "y", "z", "color"), ("j1", "j2", "j3", "j4", "j5", "j6"))
+
+# A top level "key:" line opening a block sequence
+_COLUMN_HEADER = re.compile(r"^([A-Za-z_]\w*):[ \t]*$", re.MULTILINE)
+
 
 def rollr(roll: float) -> np.ndarray:
   """Create an X Rotation matrix
@@ -81,6 +94,146 @@ def yawT(yaw: float) -> np.ndarray:
   return result 
 
 
+def _rotation_batch(angle: np.ndarray, axis: int) -> np.ndarray:
+  """Stack of rotation matrices about one coordinate axis
+
+  Args:
+      angle (np.ndarray): (...) radian values to rotate
+      axis (int): 0 for X, 1 for Y, 2 for Z
+
+  Returns:
+      np.ndarray: (...,3,3) numpy array of rotation matrices
+  """
+  angle = np.asarray(angle, dtype=float)
+  c = np.cos(angle)
+  s = np.sin(angle)
+  i, j = ((1, 2), (2, 0), (0, 1))[axis]  # plane the rotation acts in
+  R = np.zeros(angle.shape + (3, 3))
+  R[..., axis, axis] = 1.0
+  R[..., i, i] = c
+  R[..., j, j] = c
+  R[..., i, j] = -s
+  R[..., j, i] = s
+  return R
+
+def _transform_batch(rotation: np.ndarray) -> np.ndarray:
+  """Stack of transformation matrices from a stack of rotation matrices"""
+  T = np.zeros(rotation.shape[:-2] + (4, 4))
+  T[..., :3, :3] = rotation
+  T[..., 3, 3] = 1.0
+  return T
+
+
+def rollr_batch(roll: np.ndarray) -> np.ndarray:
+  """Create a stack of X rotation matrices, one per angle
+
+  Args:
+      roll (np.ndarray): (N,) radian values to rotate around X
+
+  Returns:
+      np.ndarray: (N,3,3) numpy array of rotation matrices
+  """
+  return _rotation_batch(roll, 0)
+
+def rollT_batch(roll: np.ndarray) -> np.ndarray:
+  """Create a stack of transformation matrices with a roll about X
+
+  Args:
+      roll (np.ndarray): (N,) radian values to rotate around X
+
+  Returns:
+      np.ndarray: (N,4,4) numpy array of transformation matrices
+  """
+  return _transform_batch(_rotation_batch(roll, 0))
+
+
+def pitchr_batch(pitch: np.ndarray) -> np.ndarray:
+  """Create a stack of Y rotation matrices, one per angle
+
+  Args:
+      pitch (np.ndarray): (N,) radian values to rotate around Y
+
+  Returns:
+      np.ndarray: (N,3,3) numpy array of rotation matrices
+  """
+  return _rotation_batch(pitch, 1)
+
+def pitchT_batch(pitch: np.ndarray) -> np.ndarray:
+  """Create a stack of transformation matrices with a pitch about Y
+
+  Args:
+      pitch (np.ndarray): (N,) radian values to rotate around Y
+
+  Returns:
+      np.ndarray: (N,4,4) numpy array of transformation matrices
+  """
+  return _transform_batch(_rotation_batch(pitch, 1))
+
+
+def yawr_batch(yaw: np.ndarray) -> np.ndarray:
+  """Create a stack of Z rotation matrices, one per angle
+
+  Args:
+      yaw (np.ndarray): (N,) radian values to rotate around Z
+
+  Returns:
+      np.ndarray: (N,3,3) numpy array of rotation matrices
+  """
+  return _rotation_batch(yaw, 2)
+
+def yawT_batch(yaw: np.ndarray) -> np.ndarray:
+  """Create a stack of transformation matrices with a yaw about Z
+
+  Args:
+      yaw (np.ndarray): (N,) radian values to rotate around Z
+
+  Returns:
+      np.ndarray: (N,4,4) numpy array of transformation matrices
+  """
+  return _transform_batch(_rotation_batch(yaw, 2))
+
+
+def zyxT(rotation: np.ndarray, translation: np.ndarray = None) -> np.ndarray:
+  """Create ZYX Euler transforms, yawT(z) @ pitchT(y) @ rollT(x) plus a translation
+
+  Every entry is written directly from the sines and cosines, without the
+  intermediate matrices and products of chaining the single axis builders.
+
+  Args:
+      rotation (np.ndarray): (3,) or (N,3) roll, pitch, yaw in radians
+      translation (np.ndarray, optional): (3,) or (N,3) translation. Defaults to None.
+
+  Returns:
+      np.ndarray: (4,4) or (N,4,4) numpy array of transformation matrices
+  """
+  rotation = np.asarray(rotation, dtype=float)
+  if rotation.ndim == 1:
+    # Scalar trig is much cheaper than array trig for a single frame
+    roll, pitch, yaw = rotation.tolist()
+    c_r, c_p, c_y = math.cos(roll), math.cos(pitch), math.cos(yaw)
+    s_r, s_p, s_y = math.sin(roll), math.sin(pitch), math.sin(yaw)
+  else:
+    c = np.cos(rotation)
+    s = np.sin(rotation)
+    c_r, c_p, c_y = c[..., 0], c[..., 1], c[..., 2]
+    s_r, s_p, s_y = s[..., 0], s[..., 1], s[..., 2]
+
+  T = np.zeros(rotation.shape[:-1] + (4, 4))
+  T[..., 0, 0] = c_y * c_p
+  T[..., 0, 1] = c_y * s_p * s_r - s_y * c_r
+  T[..., 0, 2] = c_y * s_p * c_r + s_y * s_r
+  T[..., 1, 0] = s_y * c_p
+  T[..., 1, 1] = s_y * s_p * s_r + c_y * c_r
+  T[..., 1, 2] = s_y * s_p * c_r - c_y * s_r
+  T[..., 2, 0] = -s_p
+  T[..., 2, 1] = c_p * s_r
+  T[..., 2, 2] = c_p * c_r
+  if translation is not None:
+    T[..., :3, 3] = translation
+  T[..., 3, 3] = 1.0
+  return T
+
+
 def check_proper_numpy_format(value: np.ndarray, shape: tuple) -> bool:
   """Send in a numpy array to make sure it is the right shape 
 
@@ -100,6 +253,52 @@ def check_proper_numpy_format(value: np.ndarray, shape: tuple) -> bool:
   return True
 
 
+def segment_distance(p_start: np.ndarray, p_end: np.ndarray,
+                     q_start: np.ndarray, q_end: np.ndarray) -> np.ndarray:
+  """Shortest distance between pairs of 3D line segments
+
+  Clamped closest-point parameters on both segments, evaluated with array
+  math so any number of segment pairs are handled in one call.
+
+  Args:
+      p_start (np.ndarray): (...,3) start points of the first segments
+      p_end (np.ndarray): (...,3) end points of the first segments
+      q_start (np.ndarray): (...,3) start points of the second segments
+      q_end (np.ndarray): (...,3) end points of the second segments
+
+  Returns:
+      np.ndarray: (...) distances between the segment pairs
+  """
+  d1 = p_end - p_start
+  d2 = q_end - q_start
+  r = p_start - q_start
+  a = np.sum(d1 * d1, axis=-1)
+  e = np.sum(d2 * d2, axis=-1)
+  f = np.sum(d2 * r, axis=-1)
+  c = np.sum(d1 * r, axis=-1)
+  b = np.sum(d1 * d2, axis=-1)
+  eps = 1e-12
+
+  denom = a * e - b * b
+  safe_a = np.where(a > eps, a, 1.0)
+  safe_e = np.where(e > eps, e, 1.0)
+  safe_denom = np.where(denom > eps, denom, 1.0)
+
+  # Closest point on the infinite lines, clamped to the first segment
+  s = np.where(denom > eps, np.clip((b * f - c * e) / safe_denom, 0.0, 1.0), 0.0)
+  # Matching point on the second segment, then re-clamp s if t left [0, 1]
+  t = np.where(e > eps, (b * s + f) / safe_e, 0.0)
+  s = np.where(t < 0.0, np.clip(-c / safe_a, 0.0, 1.0), s)
+  s = np.where(t > 1.0, np.clip((b - c) / safe_a, 0.0, 1.0), s)
+  # Segments that are only points
+  s = np.where(e > eps, s, np.clip(-c / safe_a, 0.0, 1.0))
+  t = np.where(a > eps, t, f / safe_e)
+  s = np.where(a > eps, s, 0.0)
+  t = np.clip(t, 0.0, 1.0)
+
+  closest = (p_start + s[..., None] * d1) - (q_start + t[..., None] * d2)
+  return np.linalg.norm(closest, axis=-1)
+
 
 def get_data_from_yaml(filepath: str) -> dict:
   """Get the data out of a yaml file in dictionary form
@@ -113,5 +312,65 @@ def get_data_from_yaml(filepath: str) -> dict:
   """
 
   with open(filepath, "r") as yaml_file:
-    data = yaml.safe_load(yaml_file)
+    data = yaml.load(yaml_file, Loader=YAML_LOADER)
   return data
+
+
+def _parse_flat_columns(text: str) -> dict:
+  """Parse a mapping of block sequences of plain numbers without a yaml parser
+
+  Every column is located by its header first, so its length is known before
+  any value is converted. Returns None when the text is anything other than
+  "key:" lines each followed by "- number" lines.
+  """
+  headers = list(_COLUMN_HEADER.finditer(text))
+  if not headers or text[:headers[0].start()].strip():
+    return None
+
+  columns = {}
+  for header, next_header in zip(headers, headers[1:] + [None]):
+    end = len(text) if next_header is None else next_header.start()
+    tokens = text[header.end():end].split()
+    dashes, values = tokens[0::2], tokens[1::2]
+    if len(dashes) != len(values) or dashes.count("-") != len(dashes):
+      return None
+    try:
+      columns[header.group(1)] = np.array(
+          values, dtype=PATH_COLUMN_DTYPES.get(header.group(1), np.float64))
+    except ValueError:
+      return None
+  return columns
+
+
+def load_path_columns(filepath: str) -> dict:
+  """Load a path yaml straight into typed NumPy columns
+
+  Files laid out like the provided paths (top level keys each holding a list
+  of numbers) skip the yaml parser entirely. Anything else goes through
+  YAML_LOADER and the columns are converted afterwards.
+
+  Args:
+      filepath (str): full filepath to the location on your computer
+                      eg: "/home/lcfarrell/ME_498/Lab2/pahts/path_name.yaml"
+
+  Raises:
+      ValueError: if the columns of a known schema (x/y/z/color or j1..j6)
+                  have different lengths
+
+  Returns:
+      dict: column name to (N,) array, int64 for "color" and float64 otherwise
+  """
+  with open(filepath, "r") as yaml_file:
+    text = yaml_file.read()
+
+  columns = _parse_flat_columns(text)
+  if columns is None:
+    data = yaml.load(text, Loader=YAML_LOADER)
+    columns = {key: np.asarray(value, dtype=PATH_COLUMN_DTYPES.get(key, np.float64))
+               for key, value in data.items()}
+
+  for schema in PATH_SCHEMAS:
+    lengths = {len(columns[key]) for key in schema if key in columns}
+    if len(lengths) > 1:
+      raise ValueError(f"{filepath}: columns {', '.join(schema)} have different lengths")
+  return columns
@@ -10,7 +10,8 @@ from mpl_toolkits.mplot3d import Axes3D
 PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(os.path.join(PROJECT_DIR, "shared"))
 import general_utility as general
-from robot_components import Joint, Link
+from drawing_helper import BlitManager, RobotDrawing
+from robot_components import FrameChain, Joint, Link
 
 
 def _rot_x(theta: float) -> np.ndarray:
@@ -62,7 +63,8 @@ class RoboRoll(object):
     J3_LIMITS = (-math.pi / 3, 2.0 * math.pi / 3)
     J4_LIMITS = (-math.pi / 2, math.pi / 2)
 
-    def __init__(self, drawing_enabled: bool = True):
+    def __init__(self, drawing_enabled: bool = True, collection_drawing: bool = False,
+                 blitting: bool = False):
         self._drawing_enabled = drawing_enabled
         self._drawn_once = False
         self._joint_angles = np.zeros(4, dtype=float)
@@ -80,6 +82,10 @@ class RoboRoll(object):
         else:
             self.fig = None
             self.ax = None
+        # Opt-in: cache the empty axes and only redraw the robot artists
+        self._blit_manager = None
+        if drawing_enabled and blitting:
+            self._blit_manager = BlitManager(self.ax)
 
         frame_size = 65.0
         self._joint_1 = Joint(self.ax, self.colors[0], self._drawing_enabled, frame_size=frame_size)
@@ -93,6 +99,14 @@ class RoboRoll(object):
         self._joint_4.set_joint_limits(*self.J4_LIMITS)
 
         self._links = [Link(self.ax, self.colors[i], drawing_enabled) for i in range(4)]
+        # Opt-in: all joint frames and links as one Line3DCollection
+        self._robot_drawing = None
+        if drawing_enabled and collection_drawing:
+            self._robot_drawing = RobotDrawing(self.ax, self.colors, self.colors,
+                                               frame_size=frame_size)
+        self._chain = FrameChain(self.joints)
+        self._nozzle_frame = None
+        self._nozzle_source = None
         self._update_joint_transforms(self._joint_angles)
 
     @property
@@ -101,13 +115,18 @@ class RoboRoll(object):
 
     @property
     def ee_frame(self) -> np.ndarray:
-        return self._forward_frame(self._joint_angles)
+        # Cached product of the joint transforms, rebuilt only after a joint moves
+        return self._chain.ee_frame.copy()
 
     @property
     def nozzle_frame(self) -> np.ndarray:
-        t_nozzle = np.eye(4)
-        t_nozzle[0, 3] = self.NOZZLE_OFFSET
-        return self.ee_frame @ t_nozzle
+        ee_frame = self._chain.ee_frame
+        if self._nozzle_source is not ee_frame:
+            t_nozzle = np.eye(4)
+            t_nozzle[0, 3] = self.NOZZLE_OFFSET
+            self._nozzle_frame = ee_frame @ t_nozzle
+            self._nozzle_source = ee_frame
+        return self._nozzle_frame.copy()
 
     def _forward_frame(self, joint_angles: np.ndarray) -> np.ndarray:
         t1, t2, t3, t4 = joint_angles
@@ -148,6 +167,55 @@ class RoboRoll(object):
         self._update_joint_transforms(self._joint_angles)
         return self.ee_frame
 
+    def calculate_fk_batch(self, joint_angles: np.ndarray,
+                           return_all: bool = False) -> np.ndarray:
+        """Forward kinematics of many configurations at once.
+
+        Same chain as _update_joint_transforms, built with stacked matrix
+        products. The joints are not modified.
+
+        Args:
+            joint_angles: (N,4) joint angles, one row per sample [rad]
+            return_all: return every chain frame instead of only the end
+                effector. Defaults to False.
+
+        Raises:
+            ValueError: if the input is not (N,4) or any angle is out of range
+
+        Returns:
+            (N,4,4) end effector frames, or (N,5,4,4) frames
+            [T_00, T_01 ... T_04] when return_all is True
+        """
+        q = np.asarray(joint_angles, dtype=float)
+        if q.ndim != 2 or q.shape[1] != 4:
+            raise ValueError("joint_angles must be an (N,4) array")
+
+        low = np.array([joint.low_limit for joint in self.joints])
+        high = np.array([joint.high_limit for joint in self.joints])
+        outside = (q < low) | (q > high)
+        if outside.any():
+            row, col = np.argwhere(outside)[0]
+            raise ValueError(
+                f"Joint {col + 1} angle {math.degrees(q[row, col]):.2f} deg is outside "
+                f"limits (sample {row})")
+
+        # Constant part of every joint transform, before its z rotation
+        fixed = [
+            np.eye(4),
+            _tz(self.D_1) @ _homogeneous(_rot_x(self.TOOL_TILT_X), np.zeros(3)),
+            _tx(self.A_2),
+            _tx(self.A_3),
+        ]
+        current = np.broadcast_to(np.eye(4), (len(q), 4, 4))
+        frames = [current]
+        for index, constant in enumerate(fixed):
+            current = current @ constant @ general.yawT_batch(q[:, index])
+            frames.append(current)
+
+        if return_all:
+            return np.stack(frames, axis=1)
+        return current
+
     def calculate_ik(
         self,
         ee_frame: np.ndarray,
@@ -231,7 +299,25 @@ class RoboRoll(object):
             plt.pause(0.5)
             self._drawn_once = True
 
-        base_frame = np.eye(4)
+        self._draw_chain(np.eye(4))
+        self._flush_drawing(0.0001)
+
+    def _flush_drawing(self, pause: float) -> None:
+        if self._blit_manager is not None:
+            self._blit_manager.update()
+        else:
+            plt.pause(pause)
+
+    def _draw_chain(self, base_frame: np.ndarray) -> None:
+        if self._robot_drawing is not None:
+            joint_frames = base_frame @ np.array(self._chain.frames)
+            for joint, frame in zip(self.joints, joint_frames):
+                joint.set_final_transform(frame)
+            self._robot_drawing.update_frames(
+                joint_frames, np.concatenate([base_frame[None], joint_frames]))
+            self._robot_drawing.draw()
+            return
+
         current_transform = base_frame.copy()
         for index, joint in enumerate(self.joints):
             prev_transform = current_transform.copy()
@@ -241,8 +327,6 @@ class RoboRoll(object):
             self._links[index].update_frames(prev_transform, current_transform)
             self._links[index].draw()
 
-        plt.pause(0.0001)
-
     def _create_plot(self, ws: float):
         self.fig = plt.figure(figsize=(9, 9), facecolor="w")
         self.ax = self.fig.add_subplot(111, projection="3d")
@@ -6,8 +6,11 @@ Wall 3 (X = -900 mm): five horizontal colour-sweep stripes.
 Wall 4 (Y = -900 mm): five horizontal colour-sweep stripes.
 
 Run from the repository root:
-    python Project/section_3_demo/project_demo.py          # live window
-    python Project/section_3_demo/project_demo.py --gif    # export GIF
+    python Project/section_3_demo/project_demo.py                  # live window
+    python Project/section_3_demo/project_demo.py --real-time      # wall-clock paced
+    python Project/section_3_demo/project_demo.py --scrub          # slider over the path
+    python Project/section_3_demo/project_demo.py --gif            # export GIF
+    python Project/section_3_demo/project_demo.py --gif --raster   # fast GIF, no Matplotlib 3D
 """
 
 import math
@@ -28,7 +31,10 @@ PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(os.path.join(PROJECT_DIR, "section_1_2_kinematics"))
 sys.path.append(os.path.join(PROJECT_DIR, "shared"))
 
+import general_utility as general
 from RoboRoll import RoboRoll
+from drawing_helper import (PaintDrawing, PlaybackScheduler, RasterCanvas, RobotDrawing,
+                            TimelineScrubber)
 from robot_components import Brush
 
 # ── display offset: robot base is shifted -200 mm in X so it sits inside the room
@@ -113,14 +119,22 @@ class RoboRollRoomDemo(RoboRoll):
 
     def __init__(self, drawing_enabled: bool = True,
                  frame_delay: float = 0.005,
-                 samples_per_segment: int = 7):
-        super().__init__(drawing_enabled=drawing_enabled)
+                 samples_per_segment: int = 7,
+                 collection_drawing: bool = False,
+                 blitting: bool = False):
+        super().__init__(drawing_enabled=drawing_enabled,
+                         collection_drawing=collection_drawing,
+                         blitting=blitting)
         self.brush = Brush(self.ax, drawing_enabled=drawing_enabled)
         self.display_offset = _DISPLAY_OFFSET.copy()
         self.frame_delay = max(0.0, float(frame_delay))
         self.samples_per_segment = max(2, int(samples_per_segment))
         self._ee_marker = None
 
+        # Headless RasterCanvas output, built on the first raster_demo_pose
+        self._raster_robot = None
+        self._raster_paint = {}
+
         if self._drawing_enabled:
             self._configure_room_view()
 
@@ -164,21 +178,59 @@ class RoboRollRoomDemo(RoboRoll):
 
         base_frame = np.eye(4)
         base_frame[:3, 3] = self.display_offset
-        cur = base_frame.copy()
-        for idx, joint in enumerate(self.joints):
-            prev = cur.copy()
-            cur = cur @ joint.dh_transform
-            joint.set_final_transform(cur)
-            joint.draw()
-            self._links[idx].update_frames(prev, cur)
-            self._links[idx].draw()
+        self._draw_chain(base_frame)
 
         visual_ee = self._shift_frame(self.ee_frame) @ _yaw_transform(wrist_visual_angle)
         self.brush.update_tool_frame(visual_ee)
         self.brush.show_all()
         if leave_paint:
             self.brush.paint(show_all_tools=True)
-        plt.pause(0.000_01)
+        self._flush_drawing(0.000_01)
+
+    def raster_demo_pose(self, canvas: RasterCanvas, joint_angles: np.ndarray,
+                         color: int = 0, leave_paint: bool = False,
+                         wrist_visual_angle: float = 0.0) -> np.ndarray:
+        """Render a demo pose with the NumPy rasterizer instead of Matplotlib.
+
+        Works with drawing disabled. The room box is drawn into the canvas
+        background on the first call; every call then draws the robot frames
+        and links, the selected tool and all paint left so far.
+
+        Returns:
+            np.ndarray: (H, W, 3) uint8 RGB image
+        """
+        if self._raster_robot is None:
+            self._raster_robot = RobotDrawing(None, self.colors, self.colors,
+                                              frame_size=65.0)
+            canvas.clear()
+            canvas.draw_bounds()
+            canvas.keep_as_background()
+        self.brush.selection = int(color)
+        self.calculate_fk(joint_angles)
+
+        base_frame = np.eye(4)
+        base_frame[:3, 3] = self.display_offset
+        joint_frames = base_frame @ np.array(self._chain.frames)
+        self._raster_robot.update_frames(
+            joint_frames, np.concatenate([base_frame[None], joint_frames]))
+
+        canvas.clear()
+        canvas.draw_robot(self._raster_robot)
+
+        if self.brush.selection != 0:
+            visual_ee = self._shift_frame(self.ee_frame) @ _yaw_transform(wrist_visual_angle)
+            self.brush.update_tool_frame(visual_ee)
+            tip = self.brush.selected_brush_frame[:3, 3]
+            canvas.draw_segments([[visual_ee[:3, 3], tip]], self.brush.selected_color, 2.0)
+            if leave_paint:
+                if self.brush.selection not in self._raster_paint:
+                    self._raster_paint[self.brush.selection] = PaintDrawing(
+                        None, self.brush.selected_color)
+                self._raster_paint[self.brush.selection].append(tip)
+
+        for paint in self._raster_paint.values():
+            canvas.draw_points(paint.points, paint.color, radius=2.0)
+        return canvas.image()
 
     # ── path building ─────────────────────────────────────────────────────────
 
@@ -349,18 +401,138 @@ class RoboRollRoomDemo(RoboRoll):
 
     # ── run ──────────────────────────────────────────────────────────────────
 
-    def run_demo(self) -> None:
+    def run_demo(self, real_time: bool = False, pose_period: float = 0.02,
+                 speed: float = 1.0) -> None:
+        """Play the demo path.
+
+        Args:
+            real_time: pace poses pose_period seconds apart on the wall clock,
+                dropping poses when drawing falls behind (their paint is still
+                left) and printing the achieved fps. Defaults to False, which
+                draws every pose with frame_delay between them.
+            pose_period: path time of one pose in real time mode [s].
+            speed: real time playback speed.
+        """
         path = self.build_demo_path()
         print(f"  Path built: {len(path)} rendered frames")
-        for joint_angles, color, should_paint, wrist_angle in path:
+        if not real_time:
+            for joint_angles, color, should_paint, wrist_angle in path:
+                self.draw_demo_pose(joint_angles, color=color,
+                                    leave_paint=should_paint,
+                                    wrist_visual_angle=wrist_angle)
+                time.sleep(self.frame_delay)
+            return
+
+        scheduler = PlaybackScheduler.from_period(len(path), pose_period, speed)
+        previous = -1
+        for index in scheduler:
+            self._paint_skipped(path[previous + 1:index])
+            joint_angles, color, should_paint, wrist_angle = path[index]
             self.draw_demo_pose(joint_angles, color=color,
                                 leave_paint=should_paint,
                                 wrist_visual_angle=wrist_angle)
-            time.sleep(self.frame_delay)
+            previous = index
+        print(f"  {scheduler.report()}")
+
+    def scrub_demo(self, pose_period: float = 0.02) -> TimelineScrubber:
+        """Precompute the demo path and browse it with a slider.
+
+        All chain frames come from one calculate_fk_batch call and are kept
+        as float32; the slider (or the left/right keys) jumps to any pose with
+        the tools and the paint left up to it. Needs drawing_enabled and
+        collection_drawing; call plt.show() afterwards to interact.
+
+        Args:
+            pose_period: path time of one pose shown on the slider [s].
+        """
+        if self._robot_drawing is None:
+            raise ValueError("scrubbing needs drawing_enabled=True, collection_drawing=True")
+
+        path = self.build_demo_path()
+        print(f"  Path built: {len(path)} poses")
+        joint_angles = np.array([pose[0] for pose in path])
+        colors = np.array([pose[1] for pose in path], dtype=int)
+        should_paint = np.array([pose[2] for pose in path], dtype=bool)
+        wrist_angles = np.array([pose[3] for pose in path], dtype=float)
+
+        base_frame = np.eye(4)
+        base_frame[:3, 3] = self.display_offset
+        chain = base_frame @ self.calculate_fk_batch(joint_angles, return_all=True)
+        visual_ee = chain[:, -1] @ general.yawT_batch(wrist_angles)
+
+        def show_tools(index: int) -> None:
+            self.brush.selection = int(colors[index])
+            self.brush.update_tool_frame(visual_ee[index])
+            self.brush.show_all()
+
+        scrubber = TimelineScrubber(self.ax, self._robot_drawing, chain,
+                                    frame_indices=[1, 2, 3, 4],
+                                    times=np.arange(len(path)) * pose_period,
+                                    on_show=show_tools)
+
+        painted = np.flatnonzero(should_paint & (colors != 0))
+        tips = self.brush.brush_tip_frames(visual_ee[painted], colors[painted])[:, :3, 3]
+        for color in np.unique(colors[painted]):
+            self.brush.selection = int(color)
+            selected = colors[painted] == color
+            scrubber.add_paint(self.brush.selected_color, painted[selected], tips[selected])
+        scrubber.show(0)
+        return scrubber
+
+    def _paint_skipped(self, poses: List[Tuple[np.ndarray, int, bool, float]]) -> None:
+        """Leave the paint of demo poses that real time playback dropped."""
+        if not self._drawing_enabled:
+            return
+        for joint_angles, color, should_paint, wrist_angle in poses:
+            if not should_paint or color == 0:
+                continue
+            self.brush.selection = int(color)
+            self.calculate_fk(joint_angles)
+            visual_ee = self._shift_frame(self.ee_frame) @ _yaw_transform(wrist_angle)
+            self.brush.update_tool_frame(visual_ee)
+            self.brush.paint_at(self.brush.selected_brush_frame[None, :3, 3])
 
 
 # ── entry point ───────────────────────────────────────────────────────────────
 
+def export_gif_raster() -> None:
+    """Render the demo with RasterCanvas and save it as roboroll_demo.gif.
+
+    Skips Matplotlib entirely, so there are no axes, ticks or panes, only the
+    room box, robot, tool and paint.
+    """
+    from PIL import Image
+
+    out_path = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            "roboroll_demo.gif")
+
+    robot = RoboRollRoomDemo(
+        drawing_enabled=False,
+        frame_delay=0.0,
+        samples_per_segment=5,
+    )
+    r = RoboRollRoomDemo.ROOM_HALF
+    canvas = RasterCanvas(640, 640, (-r, r, -r, r, 0.0, r), elev=22, azim=42)
+
+    path = robot.build_demo_path()
+    frames = []
+    keep_every = 2
+
+    for index, (joint_angles, color, should_paint, wrist_angle) in enumerate(path):
+        image = robot.raster_demo_pose(canvas, joint_angles, color=color,
+                                       leave_paint=should_paint,
+                                       wrist_visual_angle=wrist_angle)
+        if index % keep_every == 0 or index == len(path) - 1:
+            # Flat colors quantize well with the fast octree method
+            frames.append(Image.fromarray(image).quantize(
+                256, method=Image.Quantize.FASTOCTREE, dither=Image.Dither.NONE))
+
+    frames[0].save(out_path, save_all=True, append_images=frames[1:],
+                   duration=55, loop=0, optimize=True)
+    print(f"Saved {out_path}")
+    print(f"Rendered {len(frames)} GIF frames from {len(path)} demo poses")
+
+
 def export_gif() -> None:
     """Render the demo headlessly and save it as roboroll_demo.gif."""
     from PIL import Image
@@ -402,7 +574,10 @@ def export_gif() -> None:
 
 def main() -> None:
     if "--gif" in sys.argv:
-        export_gif()
+        if "--raster" in sys.argv:
+            export_gif_raster()
+        else:
+            export_gif()
         return
 
     print("RoboRoll Coatings — Demo")
@@ -411,13 +586,22 @@ def main() -> None:
     print("  Wall 3 (X=-900 mm): five horizontal colour stripes")
     print("  Wall 4 (Y=-900 mm): five horizontal colour stripes")
 
+    if "--scrub" in sys.argv:
+        robot = RoboRollRoomDemo(drawing_enabled=True, collection_drawing=True)
+        scrubber = robot.scrub_demo()  # keep a reference so the slider stays live
+        plt.show()
+        return
+
+    real_time = "--real-time" in sys.argv
     robot = RoboRollRoomDemo(
         drawing_enabled=True,
         frame_delay=0.005,
         samples_per_segment=7,
+        collection_drawing=real_time,
+        blitting=real_time,
     )
 
-    robot.run_demo()
+    robot.run_demo(real_time=real_time)
 
     print("Demo complete. Close the window when finished.")
     plt.show()
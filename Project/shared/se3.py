@@ -0,0 +1,279 @@
+"""se3.py — batched rigid transform toolkit.
+
+Every function works on stacks: frames are (...,4,4), rotations (...,3,3),
+rotation vectors (...,3) and twists (...,6) ordered [v, w]. Leading axes
+broadcast, so a whole path is handled in one call instead of a Python loop
+of pairwise products.
+"""
+import functools
+
+import numpy as np
+
+# Below this angle the trig ratios are replaced by their Taylor series
+SMALL_ANGLE = 1e-6
+
+# se3_log's (1 - (t/2) / tan(t/2)) / t^2 still subtracts nearly equal numbers
+# (relative error ~ eps / t^2), so it switches to its series much earlier;
+# two terms are exact to machine precision below this angle
+SERIES_ANGLE_LOG = 1e-3
+
+
+def inverse(frames: np.ndarray) -> np.ndarray:
+  """Closed form inverse of rigid transforms, [R^T, -R^T p]
+
+  Args:
+      frames (np.ndarray): (...,4,4) rigid transforms
+
+  Returns:
+      np.ndarray: (...,4,4) inverse transforms
+  """
+  frames = np.asarray(frames, dtype=float)
+  R_T = np.swapaxes(frames[..., :3, :3], -1, -2)
+  result = np.zeros(frames.shape)
+  result[..., :3, :3] = R_T
+  result[..., :3, 3] = -(R_T @ frames[..., :3, 3, None])[..., 0]
+  result[..., 3, 3] = 1.0
+  return result
+
+
+def compose(*frames: np.ndarray) -> np.ndarray:
+  """Chain transforms left to right, broadcasting over leading axes
+
+  Args:
+      *frames (np.ndarray): (...,4,4) transforms, e.g. base, joints, tool
+
+  Returns:
+      np.ndarray: (...,4,4) product frames[0] @ frames[1] @ ...
+  """
+  return functools.reduce(np.matmul, frames)
+
+
+def transform_points(frames: np.ndarray, points: np.ndarray) -> np.ndarray:
+  """Map points through rigid transforms
+
+  Args:
+      frames (np.ndarray): (...,4,4) transforms
+      points (np.ndarray): (...,3) points
+
+  Returns:
+      np.ndarray: (...,3) transformed points R p + t
+  """
+  frames = np.asarray(frames, dtype=float)
+  return (frames[..., :3, :3] @ np.asarray(points, dtype=float)[..., None])[..., 0] + frames[..., :3, 3]
+
+
+def hat(vectors: np.ndarray) -> np.ndarray:
+  """Skew symmetric matrices of 3 vectors
+
+  Args:
+      vectors (np.ndarray): (...,3) vectors
+
+  Returns:
+      np.ndarray: (...,3,3) matrices with hat(a) @ b == cross(a, b)
+  """
+  vectors = np.asarray(vectors, dtype=float)
+  x, y, z = vectors[..., 0], vectors[..., 1], vectors[..., 2]
+  result = np.zeros(vectors.shape + (3,))
+  result[..., 0, 1] = -z
+  result[..., 0, 2] = y
+  result[..., 1, 0] = z
+  result[..., 1, 2] = -x
+  result[..., 2, 0] = -y
+  result[..., 2, 1] = x
+  return result
+
+
+def _rodrigues_coefficients(angle: np.ndarray):
+  """sin(t)/t, (1-cos(t))/t^2 and (t-sin(t))/t^3, safe at t = 0
+
+  1-cos(t) is evaluated as 2 sin(t/2)^2, which does not cancel for small t.
+  """
+  small = angle < SMALL_ANGLE
+  safe = np.where(small, 1.0, angle)
+  angle_2 = angle * angle
+  a = np.where(small, 1.0 - angle_2 / 6.0, np.sin(safe) / safe)
+  b = np.where(small, 0.5 - angle_2 / 24.0, 2.0 * (np.sin(0.5 * safe) / safe)**2)
+  c = np.where(small, 1.0 / 6.0 - angle_2 / 120.0, (safe - np.sin(safe)) / safe**3)
+  return a, b, c
+
+
+def so3_exp(rotvecs: np.ndarray) -> np.ndarray:
+  """Rotation matrices of rotation vectors (Rodrigues' formula)
+
+  Args:
+      rotvecs (np.ndarray): (...,3) axis scaled by the angle in radians
+
+  Returns:
+      np.ndarray: (...,3,3) rotation matrices
+  """
+  rotvecs = np.asarray(rotvecs, dtype=float)
+  a, b, _ = _rodrigues_coefficients(np.linalg.norm(rotvecs, axis=-1))
+  K = hat(rotvecs)
+  return np.eye(3) + a[..., None, None] * K + b[..., None, None] * (K @ K)
+
+
+def so3_log(rotations: np.ndarray) -> np.ndarray:
+  """Rotation vectors of rotation matrices, accurate for every angle
+
+  The angle comes from atan2 of the skew and trace parts. Up to 90 deg the
+  axis is the skew part; beyond that it is read from the symmetric part,
+  which stays well conditioned up to and including 180 deg.
+
+  Args:
+      rotations (np.ndarray): (...,3,3) rotation matrices
+
+  Returns:
+      np.ndarray: (...,3) rotation vectors with angles in [0, pi]
+  """
+  R = np.asarray(rotations, dtype=float)
+  skew = 0.5 * np.stack([R[..., 2, 1] - R[..., 1, 2],
+                         R[..., 0, 2] - R[..., 2, 0],
+                         R[..., 1, 0] - R[..., 0, 1]], axis=-1)
+  sin_angle = np.linalg.norm(skew, axis=-1)
+  cos_angle = 0.5 * (np.trace(R, axis1=-2, axis2=-1) - 1.0)
+  angle = np.arctan2(sin_angle, cos_angle)
+
+  # Small and medium angles: rotvec = skew * angle / sin(angle)
+  ratio = np.where(sin_angle > 1e-12, angle / np.where(sin_angle > 1e-12, sin_angle, 1.0), 1.0)
+  result = skew * ratio[..., None]
+
+  # Large angles: a a^T = (sym(R) - cos I) / (1 - cos), signed to match skew
+  large = cos_angle < 0.0
+  if np.any(large):
+    R_large = R[large]
+    outer = (0.5 * (R_large + np.swapaxes(R_large, -1, -2)) -
+             cos_angle[large][:, None, None] * np.eye(3)) / (1.0 - cos_angle[large])[:, None, None]
+    rows = np.argmax(np.diagonal(outer, axis1=-2, axis2=-1), axis=-1)
+    axis = outer[np.arange(len(rows)), rows]
+    axis /= np.linalg.norm(axis, axis=-1, keepdims=True)
+    sign = np.where(np.sum(axis * skew[large], axis=-1) < 0.0, -1.0, 1.0)
+    result[large] = (sign * angle[large])[:, None] * axis
+  return result
+
+
+def se3_exp(twists: np.ndarray) -> np.ndarray:
+  """Rigid transforms of twists
+
+  Args:
+      twists (np.ndarray): (...,6) twists [v, w], v in length units and w a
+          rotation vector
+
+  Returns:
+      np.ndarray: (...,4,4) transforms
+  """
+  twists = np.asarray(twists, dtype=float)
+  v, w = twists[..., :3], twists[..., 3:]
+  a, b, c = _rodrigues_coefficients(np.linalg.norm(w, axis=-1))
+  K = hat(w)
+  K_2 = K @ K
+  V = np.eye(3) + b[..., None, None] * K + c[..., None, None] * K_2
+
+  result = np.zeros(twists.shape[:-1] + (4, 4))
+  result[..., :3, :3] = np.eye(3) + a[..., None, None] * K + b[..., None, None] * K_2
+  result[..., :3, 3] = (V @ v[..., None])[..., 0]
+  result[..., 3, 3] = 1.0
+  return result
+
+
+def se3_log(frames: np.ndarray) -> np.ndarray:
+  """Twists of rigid transforms, the inverse of se3_exp
+
+  Args:
+      frames (np.ndarray): (...,4,4) rigid transforms
+
+  Returns:
+      np.ndarray: (...,6) twists [v, w]
+  """
+  frames = np.asarray(frames, dtype=float)
+  w = so3_log(frames[..., :3, :3])
+  angle = np.linalg.norm(w, axis=-1)
+  small = angle < SERIES_ANGLE_LOG
+  safe = np.where(small, 1.0, angle)
+  # (1 - a / 2b) / t^2 with the half angle, which avoids the cancelling 1-cos(t)
+  d = np.where(small, 1.0 / 12.0 + angle * angle / 720.0,
+               (1.0 - 0.5 * safe / np.tan(0.5 * safe)) / safe**2)
+  K = hat(w)
+  V_inv = np.eye(3) - 0.5 * K + d[..., None, None] * (K @ K)
+  v = (V_inv @ frames[..., :3, 3, None])[..., 0]
+  return np.concatenate([v, w], axis=-1)
+
+
+def slerp(start: np.ndarray, end: np.ndarray, fractions: np.ndarray) -> np.ndarray:
+  """Spherical linear interpolation of rotations
+
+  Args:
+      start (np.ndarray): (...,3,3) rotations at fraction 0
+      end (np.ndarray): (...,3,3) rotations at fraction 1
+      fractions (np.ndarray): (N,) interpolation fractions in [0, 1]
+
+  Returns:
+      np.ndarray: (N,...,3,3) interpolated rotations
+  """
+  start = np.asarray(start, dtype=float)
+  fractions = np.asarray(fractions, dtype=float).reshape((-1,) + (1,) * (start.ndim - 1))
+  relative = so3_log(np.swapaxes(start, -1, -2) @ np.asarray(end, dtype=float))
+  return start @ so3_exp(fractions * relative)
+
+
+def interpolate(start: np.ndarray, end: np.ndarray, fractions: np.ndarray,
+                screw: bool = False) -> np.ndarray:
+  """Interpolate rigid transforms
+
+  Args:
+      start (np.ndarray): (...,4,4) transforms at fraction 0
+      end (np.ndarray): (...,4,4) transforms at fraction 1
+      fractions (np.ndarray): (N,) interpolation fractions in [0, 1]
+      screw (bool, optional): follow the constant twist between the frames
+          (a screw motion) instead of moving the position in a straight line
+          while the rotation is SLERPed. Defaults to False.
+
+  Returns:
+      np.ndarray: (N,...,4,4) interpolated transforms
+  """
+  start = np.asarray(start, dtype=float)
+  end = np.asarray(end, dtype=float)
+  fractions = np.asarray(fractions, dtype=float).reshape((-1,) + (1,) * (start.ndim - 1))
+  if screw:
+    return start @ se3_exp(fractions * se3_log(inverse(start) @ end))
+
+  result = np.zeros((len(fractions),) + np.broadcast_shapes(start.shape, end.shape))
+  result[..., :3, :3] = slerp(start[..., :3, :3], end[..., :3, :3], fractions[..., 0])
+  result[..., :3, 3] = (1.0 - fractions) * start[..., :3, 3] + fractions * end[..., :3, 3]
+  result[..., 3, 3] = 1.0
+  return result
+
+
+def pose_distance(frames_a: np.ndarray, frames_b: np.ndarray):
+  """Position and rotation distance between rigid transforms
+
+  Args:
+      frames_a (np.ndarray): (...,4,4) transforms
+      frames_b (np.ndarray): (...,4,4) transforms
+
+  Returns:
+      Tuple[np.ndarray, np.ndarray]: (...) distances between the origins and
+          (...) angles in [0, pi] of the relative rotations
+  """
+  frames_a = np.asarray(frames_a, dtype=float)
+  frames_b = np.asarray(frames_b, dtype=float)
+  position = np.linalg.norm(frames_a[..., :3, 3] - frames_b[..., :3, 3], axis=-1)
+  R = np.swapaxes(frames_a[..., :3, :3], -1, -2) @ frames_b[..., :3, :3]
+  sin_angle = 0.5 * np.linalg.norm(np.stack([R[..., 2, 1] - R[..., 1, 2],
+                                             R[..., 0, 2] - R[..., 2, 0],
+                                             R[..., 1, 0] - R[..., 0, 1]], axis=-1), axis=-1)
+  cos_angle = 0.5 * (np.trace(R, axis1=-2, axis2=-1) - 1.0)
+  return position, np.arctan2(sin_angle, cos_angle)
+
+
+if __name__ == "__main__":
+  # Round trip check across small, medium and near 180 deg angles: python se3.py
+  rng = np.random.default_rng(0)
+  for angle in [0.0, 1e-9, 1e-7, 1e-6, 2e-6, 1e-5, 1e-4, 1e-3, 1e-2, 0.1, 1.0, 3.0, np.pi - 1e-6]:
+    axes = rng.normal(size=(100, 3))
+    axes /= np.linalg.norm(axes, axis=1, keepdims=True)
+    twists = np.concatenate([rng.normal(0.0, 100.0, (100, 3)), angle * axes], axis=1)
+    frames = se3_exp(twists)
+    frame_error = np.abs(se3_exp(se3_log(frames)) - frames).max()
+    twist_error = np.abs(se3_log(frames) - twists).max()
+    print(f"angle {angle:8.1e}  exp(log(T)) {frame_error:.1e}  log(exp(xi)) {twist_error:.1e}")
+    assert frame_error < 1e-9 and twist_error < 1e-6, f"round trip failed at angle {angle}"